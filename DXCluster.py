@@ -20,6 +20,8 @@
 #   11-07-2025  :   1.0.6   - Band Combobox changed for band buttons.
 #   10-08-2025  :   1.0.7   - Changed filepath structure
 #   29-08-2025  :   1.0.8   - Send Spot handling changed
+#   19-10-2026  :           - Spot country from the shared DXCC resolver (dxcc_resolver.py)
+#                           - MiniBook hands over its resolver, cty.dat is only parsed here when run standalone
 #**********************************************************************************************************************************
 
 import asyncio
@@ -34,7 +36,7 @@ import os
 import socket
 from pathlib import Path
 from datetime import datetime
-from cty_parser import parse_cty_file
+from dxcc_resolver import DxccResolver, load_resolver
 import requests
 
 VERSION_NUMBER = ("v1.0.8")
@@ -167,7 +169,8 @@ class DXClusterApp:
     def __init__(self, root, rigctl_host="127.0.0.1", rigctl_port=4532,
                  tracking_var=None, on_callsign_selected=None,
                  get_worked_calls=None, get_worked_calls_today=None,
-                 get_last_qso_callsign=None, get_current_frequency=None):
+                 get_last_qso_callsign=None, get_current_frequency=None,
+                 dxcc_resolver=None):
         self.root = root
         self.root.title(f"DX Cluster Telnet Client - {VERSION_NUMBER}")
 
@@ -180,6 +183,7 @@ class DXClusterApp:
         self.get_worked_calls_today = get_worked_calls_today
         self.get_last_qso_callsign = get_last_qso_callsign
         self.get_current_frequency = get_current_frequency
+        self.dxcc_resolver = dxcc_resolver
 
  
         self.custom_filters = self.load_custom_filters()
@@ -209,8 +213,9 @@ class DXClusterApp:
         self.spots = []
         self.load_host_file(default=CLUSTER_FILE)
 
-        # Checks if cty.dat is present, if not download. and parse it
-        self.check_ctydat_file()
+        # Checks if cty.dat is present, if not download. and parse it (MiniBook already did)
+        if self.dxcc_resolver is None:
+            self.check_ctydat_file()
 
         # Tracking status label
         #self.update_tracking_status()
@@ -561,12 +566,12 @@ class DXClusterApp:
                                     message="The file cty.dat was not found. It will now be downloaded.",
                                     parent=self.root)
                 self.download_ctydat_file()
-            self.dxcc_data = parse_cty_file(DXCC_FILE)
+            self.dxcc_resolver = load_resolver(DXCC_FILE)
         except Exception as e:
             messagebox.showerror(title="Error",
                                 message=f"Error loading data: {e}",
                                 parent=self.root)
-            self.dxcc_data = {}
+            self.dxcc_resolver = DxccResolver()
 
     # Function to download cty.dat file
     def download_ctydat_file(self):
@@ -1142,18 +1147,8 @@ class DXClusterApp:
         if not call:
             return ("", "")
 
-        call = call.strip().upper()
-        best_match = None
-        best_prefix_len = 0
-
-        for entry in self.dxcc_data:
-            for raw_prefix in entry.prefixes:
-                # Strip formatting marks: ; = ( ) * [ ]
-                prefix = re.sub(r'[=;()\[\]*]', '', raw_prefix).strip().upper()
-
-                if call.startswith(prefix) and len(prefix) > best_prefix_len:
-                    best_match = entry
-                    best_prefix_len = len(prefix)
+        # Spots are parsed in the telnet thread, the resolver is safe there and shared with MiniBook
+        best_match = self.dxcc_resolver.resolve(call)
 
         if best_match:
             return (best_match.name, best_match.continent)  # Or flag, cq_zone, etc.
@@ -1730,6 +1725,7 @@ def launch_dx_spot_viewer(
     get_last_qso_callsign=None,
     get_current_frequency=None,
     parent_window=None,
+    dxcc_resolver=None,
 ):
 
 
@@ -1747,7 +1743,8 @@ def launch_dx_spot_viewer(
         get_worked_calls,
         get_worked_calls_today,
         get_last_qso_callsign,
-        get_current_frequency
+        get_current_frequency,
+        dxcc_resolver
     )
 
     # Save the instance in the parent window so MiniBook can access it
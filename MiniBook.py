@@ -126,8 +126,41 @@
 #                           -   When callsign entered, and TAB, callsign + freq is sent to DXCluster app if opened.
 # 31-08-2025    :   1.4.8   -   Fix in update_frequency_and_mode_thread() where enter cleared callsign
 #                           -   Backup folder now default .\backup user can alsways change it.
+# 19-10-2026    :           -   ADIF import and WSJT-X UDP records now parsed with single pass tokenizer (adif_parser.py)
+#                           -   ADIF import now streams the file in chunks and adds QSOs in batches, memory stays flat
+#                           -   Large ADIF files are parsed in a process pool, import window shows QSOs/s
+#                           -   Import preview: new, near-duplicate, duplicate and changed QSOs before anything is saved
+#                           -   Import, export and QRZ upload progress now thread safe, with rate, ETA, phase and Cancel button
+#                           -   One ADIF writer (adif_writer.py) for full export, selected export and QRZ upload
+#                           -   Export changes since last export, per destination watermark on a QSO modification sequence
+#                           -   ADX (XML ADIF) import and export, streamed, same field mapping as .adi
+#                           -   Import several ADIF files or a whole folder at once, parsed in parallel, one dedup and one save
+#                           -   Watch ADIF files / folders of other programs, new records only (byte offset per file), logged like UDP QSOs
+#                           -   Export to gzip / zip while writing, optionally split per year or per N QSOs
+#                           -   Command line tool minibook_cli.py for import, export, dedup, validate, stats and convert
+#                           -   Recover QSOs from WSJT-X ALL.TXT that are missing in the logbook
+#                           -   CSV / JSON Lines export with column selection and typed Datetime / Frequency, and import of both
+#                           -   Merge QSL / LoTW / eQSL confirmations from report files, matched on call, band, mode and time
+#                           -   Source of a confirmation report (LoTW, eQSL, paper QSL) detected or chosen, merged into its own fields
+#                           -   WSJT-X / JTDX binary UDP protocol (wsjtx_protocol.py), messages dispatched by type
+#                           -   CQ calls in WSJT-X highlighted as new, new band, new mode or dupe (Highlight Callsign)
+#                           -   One selector based UDP listener for several endpoints (JTDX, JS8Call, LAN, multicast), counters per source
+#                           -   Logged QSOs from UDP go through a bounded queue, added in batches with one save and one refresh
+#                           -   UDP relay: received WSJT-X datagrams forwarded unchanged to GridTracker etc., never blocking
+#                           -   N1MM Logger+ contacts over UDP (n1mm/ endpoint), contactreplace / contactdelete matched on N1MM ID
+#                           -   Country of logged / imported QSOs from a thread safe DXCC resolver (dxcc_resolver.py), no shared globals
+#                           -   Recompute countries of the whole logbook from cty.dat
+#                           -   QRZ XML lookups reuse one keep-alive connection and the session key, login again only when expired
+#                           -   ADIF import worker processes are spawned, never forked from the running GUI
+#                           -   QRZ lookups cached on disk (data/qrz_cache.sqlite) with TTL and "not found" caching, stale ones refreshed in background
 #**********************************************************************************************************************************
 
+import multiprocessing
+
+# Worker processes of the ADIF import start here in a frozen exe, before any GUI is built
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
 from datetime import datetime, timedelta, date
 from pathlib import Path
 from tkcalendar import DateEntry
@@ -142,6 +175,7 @@ import math
 import logging
 import os
 import platform
+import queue
 import re
 import requests
 import socket
@@ -151,11 +185,30 @@ import tempfile
 import threading
 import time
 import tkinter as tk
-import urllib.parse
 import webbrowser
-import xml.etree.ElementTree as ET
 from DXCluster import launch_dx_spot_viewer
-from cty_parser import parse_cty_file
+from adif_parser import scan_adif, iter_adif_records, is_valid_adif_record, import_format_date, import_format_time
+from adif_writer import adif_record, write_adif
+from adx_format import is_adx_file, write_adx
+from export_archive import export_archive
+from import_files import find_log_files
+from logbook_ops import load_logbook, classify_import, rebase_import, apply_import, duplicate_groups, remove_duplicates_keep_best, is_valid_locator
+from export_watermarks import ChangeIndex, touch, stamp_changes, get_watermark, set_watermark, destinations, SEQ_FIELD
+from logbook_index import LogbookIndex, NEAR_DUPLICATE_SECONDS, qso_key
+from adif_watcher import AdifWatcher
+from wsjtx_recovery import recover_qsos, find_missing
+from table_format import TABLE_COLUMNS, table_format, export_table
+from qsl_merge import QSL_MATCH_SECONDS, QSL_SOURCE_NAMES, iter_qsl_reports, merge_qsl_reports
+from wsjtx_protocol import WsjtxDispatcher, LOGGED_ADIF, STATUS, DECODE, CLEAR
+from wsjtx_annotator import DecodeAnnotator
+from udp_listener import UdpListener, parse_endpoints
+from ingest_queue import IngestQueue, INGEST_POLL_MS
+from udp_relay import UdpRelay, parse_targets
+from dxcc_resolver import DxccResolver, load_resolver, recompute_countries, resolve_callsigns
+from qrz_xml import QrzXmlSession
+from qrz_cache import LookupCache, CACHE_DAYS
+from n1mm_contacts import ContactIdIndex, parse_contact_packet, apply_contact_changes, N1MM_ID_FIELD
+from progress_channel import ProgressChannel, ProgressCancelled
 
 import traceback
 
@@ -170,10 +223,13 @@ DATA_FOLDER         = Path.cwd() / "data"
 BACKUP_FOLDER       = Path.cwd() / "backup"
 
 CONFIG_FILE         = SETTINGS_FOLDER / "minibook.ini"
+WATCH_OFFSETS_FILE  = SETTINGS_FOLDER / "watch_offsets.json"
 
 DXCC_FILE           = DATA_FOLDER / "cty.dat"
+QRZ_CACHE_FILE      = DATA_FOLDER / "qrz_cache.sqlite"
 ctydat_url          = "https://www.country-files.com/bigcty/cty.dat"
 dxcc_data = []
+dxcc_resolver = DxccResolver()  # Shared with DXCluster, callsign -> DXCC entity from any thread
 
 WWFF_FILE           = DATA_FOLDER / "wwff_directory.csv"
 wwff_references = {}
@@ -408,7 +464,8 @@ def open_dxspotviewer():
         get_worked_calls_today=get_worked_calls_today,
         get_last_qso_callsign=get_last_qso_callsign,
         get_current_frequency=get_current_frequency,        
-        parent_window=dxspotviewer_window
+        parent_window=dxspotviewer_window,
+        dxcc_resolver=dxcc_resolver
     )
 
 
@@ -524,22 +581,6 @@ def clear_station_labels():
 
 
 
-#Checks if a given maidenhead locator is valid for example JO22LO49
-def is_valid_locator(locator):
-    if locator == "":
-        return True
-    if len(locator) < 4 or len(locator) % 2 != 0:
-        return False
-    # Regex pattern:
-    # - [A-R]{2} : veld
-    # - \d{2} : vierkant
-    # - ([A-X]{2})? : optioneel subsquare
-    # - (\d{2})? : optioneel extended vierkant (cijfers)
-    pattern = r'^[A-R]{2}\d{2}([A-X]{2})?(\d{2})?$'
-    return bool(re.match(pattern, locator, re.IGNORECASE))
-
-
-
 #Converts Maidenhead locator to Latttitude and Longitude coordinates
 def maidenhead_to_latlon(locator):
     """
@@ -1094,7 +1135,7 @@ def load_json(file_to_load=None):
 
 
 def load_json_content():
-    global tree, qso_count_label, qso_lines
+    global tree, qso_count_label, qso_lines, change_index
 
     # Always read JSON file
     try:
@@ -1104,8 +1145,15 @@ def load_json_content():
     except Exception as e:
         print(f"Error reading MiniBook file: {e}")
         qso_lines = []
+        change_index = ChangeIndex()
         return
 
+    # Index QSOs by modification sequence, older logbooks are numbered in file order
+    change_index = ChangeIndex(qso_lines)
+    stamp_changes(data, change_index)
+    decode_annotator.rebuild(qso_lines)
+    contact_index.rebuild(qso_lines)
+
     # Stop here if tree doesn't exist or is already destroyed
     if tree is None or not tree.winfo_exists():
         return
@@ -1199,12 +1247,13 @@ def load_json_content():
 
 # Global variables for Logbook Viewer
 qso_lines = []  # This will hold QSO entries
+change_index = ChangeIndex()  # QSOs ordered by modification sequence, for export since last time
 sort_column = None  # Column currently being sorted
 sort_reverse = False  # Flag for sort order
 
 # Function to open and display the logbook in a new window
 def view_logbook():
-    global tree, qso_count_label, search_entry, qso_lines, column_checkboxes, Logbook_Window
+    global tree, qso_count_label, search_entry, column_checkboxes, Logbook_Window
 
     if not current_json_file:
         messagebox.showwarning("Warning", "Please first load logbook!")
@@ -1243,7 +1292,14 @@ def view_logbook():
     menu_bar = tk.Menu(Logbook_Window)
     file_menu = tk.Menu(menu_bar, tearoff=0)
     file_menu.add_command(label="Import ADIF", command=import_adif)
+    file_menu.add_command(label="Import ADIF folder...", command=import_adif_folder)
+    file_menu.add_command(label="Merge QSL confirmations...", command=merge_qsl_confirmations)
     file_menu.add_command(label="Export to ADIF", command=export_to_adif)
+    file_menu.add_command(label="Export changes since last export...", command=export_changes_to_adif)
+    file_menu.add_command(label="Export to CSV / JSON Lines...", command=export_to_table)
+    file_menu.add_separator()
+    file_menu.add_command(label="Recover QSOs from WSJT-X ALL.TXT...", command=recover_from_wsjtx_all_txt)
+    file_menu.add_command(label="Recompute countries from cty.dat", command=recompute_logbook_countries)
     file_menu.add_separator()
     file_menu.add_command(label="Exit", command=close_logbook)
     menu_bar.add_cascade(label="File", menu=file_menu)
@@ -1361,35 +1417,11 @@ def view_logbook():
         if not confirm:
             return
 
-        # Create a new window for the progress bar
-        progress_win = tk.Toplevel(Logbook_Window)
-        progress_win.title("Uploading to QRZ")
-
-        # Get the position and size of Logbook_Window
-        logbook_x = Logbook_Window.winfo_rootx()
-        logbook_y = Logbook_Window.winfo_rooty()
-        logbook_width = Logbook_Window.winfo_width()
-        logbook_height = Logbook_Window.winfo_height()
-
-        # Calculate the center position of Logbook_Window
-        center_x = logbook_x + logbook_width // 2
-        center_y = logbook_y + logbook_height // 2
-
-        # Set the position of progress_win relative to Logbook_Window
-        progress_win.geometry(f"+{center_x - 100}+{center_y - 50}")  # Adjust position as needed
-
-
-        progress_label = tk.Label(progress_win, text="Uploading QSOs...")
-        progress_label.pack(pady=5)
-
-        progress_bar = ttk.Progressbar(progress_win, length=250, mode='determinate', maximum=len(selected_items))
-        progress_bar.pack(pady=5)
-
-        # Counter
-        progress_counter = tk.Label(progress_win, text=f"0 / {len(selected_items)} QSOs geüpload")
-        progress_counter.pack(pady=5)
-
-        progress_win.update()
+        # Read the selected rows here in the Tk thread, the upload thread never touches widgets
+        selected_values = [tree.item(item)['values'] for item in selected_items]
+        api_key = station_qrzapi_var.get()
+        total = len(selected_values)
+        channel = ProgressChannel(Logbook_Window, "Uploading to QRZ")
 
         # Initialize result counts
         result_counts = {
@@ -1405,15 +1437,17 @@ def view_logbook():
         def upload_thread():
             nonlocal result_counts, results
 
-            for idx, item in enumerate(selected_items, start=1):
-                values = tree.item(item)['values']
+            channel.set_phase("upload", total)
+            for idx, values in enumerate(selected_values, start=1):
+                if channel.cancelled:
+                    break
                 matched_qso = next((qso for qso in qso_lines if 
                                     qso.get("Date") == values[0] and 
                                     qso.get("Time") == values[1] and 
                                     qso.get("Callsign") == values[2]), None)
                                     
                 if matched_qso:
-                    response = upload_to_qrz(matched_qso, True)
+                    response = upload_to_qrz(matched_qso, True, api_key)
                     if response and hasattr(response, "text"):
                         text = response.text.strip()
                         if "RESULT=OK" in text:
@@ -1451,17 +1485,16 @@ def view_logbook():
 
 
                 # Update progress bar
-                progress_bar['value'] = idx
-                progress_counter.config(text=f"{idx} / {len(selected_items)} QSOs uploaded")
-                progress_win.update()
-
-            # After upload process is done, close the progress window and show the summary
-            progress_win.destroy()
+                channel.update(idx, total)
 
             # Show the summary message
             summary_lines = [f"{k}: {v}" for k, v in result_counts.items() if v > 0]
+            if channel.cancelled:
+                summary_lines.append("Upload cancelled.")
             summary = "\n".join(summary_lines)
-            messagebox.showinfo("QRZ Upload Result", summary)
+
+            # After upload process is done, close the progress window and show the summary
+            channel.finish(messagebox.showinfo, "QRZ Upload Result", summary)
 
             # Log the result with timestamp
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -1474,7 +1507,7 @@ def view_logbook():
                 log_upload_result(f"Callsign {call} @ {date} {time}: {status}")
 
         # Start the upload process in a separate thread
-        upload_thread_instance = threading.Thread(target=upload_thread)
+        upload_thread_instance = threading.Thread(target=upload_thread, daemon=True)
         upload_thread_instance.start()
 
 
@@ -1748,21 +1781,7 @@ def find_duplicates():
         messagebox.showinfo("Duplicates", "No logbook loaded or empty.")
         return
 
-    seen = {}
-    duplicate_index_map = {}
-
-    for idx, qso in enumerate(qso_lines):
-        key = (
-            qso.get("Callsign", "").strip().upper(),
-            qso.get("Date", "").strip(),
-            qso.get("Time", "").strip()
-        )
-        if key in seen:
-            if key not in duplicate_index_map:
-                duplicate_index_map[key] = [seen[key]]
-            duplicate_index_map[key].append(idx)
-        else:
-            seen[key] = idx
+    duplicate_index_map = duplicate_groups(qso_lines)
 
     all_duplicate_indices = []
     for indices in duplicate_index_map.values():
@@ -1826,26 +1845,13 @@ def find_duplicates():
         messagebox.showinfo("Done", f"{len(indices_to_delete)} duplicates removed and saved.")
 
     def delete_all_duplicates_keep_best():
-        fields_to_consider = ["Callsign", "Date", "Time", "Mode", "Frequency", "Name", "My Locator", "My Location"]
-        to_delete_all = []
-
-        for key, indices in duplicate_index_map.items():
-            # Find record with most filled in fields in the given fields
-            best_idx = max(indices, key=lambda i: sum(1 for f in fields_to_consider if qso_lines[i].get(f)))
-            # Add all other indexes to the delete list
-            to_delete_all.extend(i for i in indices if i != best_idx)
-
-        # Remove all at once, from high to low
-        for i in sorted(to_delete_all, reverse=True):
-            try:
-                del qso_lines[i]
-            except IndexError:
-                continue
+        # Keep the record with most fields filled in of every group
+        removed = remove_duplicates_keep_best(qso_lines, duplicate_index_map)
 
         save_to_json()
         load_json_content()
         dup_window.destroy()
-        messagebox.showinfo("Done", f"{len(to_delete_all)} duplicate QSOs removed, best entries kept.")
+        messagebox.showinfo("Done", f"{removed} duplicate QSOs removed, best entries kept.")
 
 
     # Buttons
@@ -1958,6 +1964,7 @@ def open_bulk_edit_window():
                     str(values[2]).strip().upper()
                 ):
                     qso[field] = new_value
+                    touch(qso)
                     updated_count += 1
                     break
 
@@ -1989,85 +1996,34 @@ def export_selected_to_adif():
         messagebox.showinfo("Export to ADIF", "No QSOs selected.")
         return
 
-    adif_lines = []
+    export_lines = []
     for item in selected_items:
         values = tree.item(item)['values']
         qso = next((q for q in qso_lines if 
                     q.get("Date") == values[0] and 
                     q.get("Time") == values[1] and 
                     q.get("Callsign") == values[2]), None)
-        if not qso:
-            continue
-
-        adif_line_list = []
-        def add_field(tag, value):
-            if value:
-                val = str(value).strip()
-                adif_line_list.append(f"<{tag}:{len(val)}>{val}")
-
-        add_field("qso_date", qso.get("Date", "").replace("-", ""))
-        add_field("time_on", qso.get("Time", "").replace(":", ""))
-        add_field("call", qso.get("Callsign", ""))
-        add_field("name", qso.get("Name", ""))
-        add_field("rst_sent", qso.get("Sent", ""))
-        add_field("rst_rcvd", qso.get("Received", ""))
-        add_field("stx", qso.get("Sent Exchange", ""))
-        add_field("srx", qso.get("Receive Exchange", ""))
-        add_field("mode", qso.get("Mode", ""))
-        add_field("submode", qso.get("Submode", ""))
-        add_field("band", qso.get("Band", ""))
-        add_field("freq", qso.get("Frequency", ""))
-        add_field("gridsquare", qso.get("Locator", ""))
-        add_field("comment", qso.get("Comment", ""))
-        add_field("station_callsign", qso.get("My Callsign", ""))
-        add_field("operator", qso.get("My Operator", ""))
-        add_field("country", qso.get("Country", ""))
-        add_field("cont", qso.get("Continent", ""))
-        add_field("sat_name", qso.get("Satellite", ""))
-
-        if qso.get("WWFF"):
-            add_field("sig", "WWFF")
-            add_field("sig_info", qso.get("WWFF", ""))
-        if qso.get("POTA"):
-            add_field("sig", "POTA")
-            add_field("sig_info", qso.get("POTA", ""))
-        if qso.get("BOTA"):
-            add_field("sig", "BOTA")
-            add_field("sig_info", qso.get("BOTA", ""))
-        if qso.get("COTA"):
-            add_field("sig", "COTA")
-            add_field("sig_info", qso.get("COTA", ""))            
-        if qso.get("SOTA"):
-            add_field("sig", "SOTA")
-            add_field("sig_info", qso.get("SOTA", ""))   
-        if qso.get("IOTA"):
-            add_field("sig", "IOTA")
-            add_field("sig_info", qso.get("IOTA", ""))   
-        if qso.get("WLOTA"):
-            add_field("sig", "WLOTA")
-            add_field("sig_info", qso.get("WLOTA", ""))                                                
-
-        adif_lines.append(" ".join(adif_line_list) + " <EOR>\n")
-
-    if not adif_lines:
+        if qso:
+            export_lines.append(qso)
+
+    if not export_lines:
         messagebox.showinfo("Export to ADIF", "No valid QSOs found for export.")
         return
 
-    export_file = filedialog.asksaveasfilename(defaultextension=".adi", filetypes=[("ADIF files", "*.adi")])
+    export_file = filedialog.asksaveasfilename(defaultextension=".adi", filetypes=[("ADIF files", "*.adi"), ("ADX files", "*.adx")])
     if export_file:
         try:
-            with open(export_file, "w", encoding="utf-8") as f:
-                f.write("Generated by MiniBook\n")
-                f.write("<ADIF_VER:5>3.1.0 <PROGRAMID:8>MiniBook <EOH>\n")
-                f.writelines(adif_lines)
-            messagebox.showinfo("Export to ADIF", f"{len(adif_lines)} QSOs exported successfully.")
+            with open(export_file, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+                write_log = write_adx if is_adx_file(export_file) else write_adif
+                exported = write_log(f, export_lines)
+            messagebox.showinfo("Export to ADIF", f"{exported} QSOs exported successfully.")
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to save ADIF file:\n{e}")
 
 
 
 # Function to save the QSO lines back to the JSON file
-def save_to_json():
+def save_to_json(export_watermark=None):
     # Load existing data
     try:
         with open(current_json_file, 'r', encoding='utf-8') as file:
@@ -2084,11 +2040,14 @@ def save_to_json():
             qso['Time'] = qso['DateTime'].strftime('%H:%M:%S')
             del qso['DateTime']  # Remove the DateTime key before saving
 
-    # Update the JSON structure and save
-    data = {
-        "Station": station_info,  # Keep the Station information intact
-        "Logbook": qso_lines      # Save the updated QSO entries
-    }
+    # Update the JSON structure and save, other top level keys (sequence, export watermarks) are kept
+    data["Station"] = station_info  # Keep the Station information intact
+    data["Logbook"] = qso_lines     # Save the updated QSO entries
+
+    # New and edited QSOs get the next modification sequence number
+    stamp_changes(data, change_index)
+    if export_watermark:
+        set_watermark(data, *export_watermark)
 
     try:
         with open(current_json_file, 'w', encoding='utf-8') as file:
@@ -2097,6 +2056,10 @@ def save_to_json():
     except Exception as e:
         print(f"Error saving to MiniBook file: {e}")
 
+    # Added, edited or deleted QSOs change what is worked before in WSJT-X
+    decode_annotator.rebuild(qso_lines)
+    contact_index.rebuild(qso_lines)
+
 
 
 
@@ -2260,7 +2223,7 @@ def edit_qso(event):
             elif field not in ['Date', 'Time', 'Callsign', 'Locator', 'My Locator', 'My Callsign', 'My Operator', 'Mode', 'Submode', 'Band']:
                 original_qso[field] = entries[field].get().strip()
 
-
+        touch(original_qso)
         save_to_json()
         load_json_content()
         update_worked_before_tree()
@@ -2329,64 +2292,73 @@ def custom_duplicate_dialog(parent, total_count, duplicate_count, added_count):
 # /_/ \_\___/___|_|   |___|_|  |_|_|  \___/|_|_\ |_|  
 #                                                     
 #########################################################################################
-def extract_field(record, field_name):
-    """
-    Extract a field's value from the ADIF record in the format <FIELD_NAME:length>value.
-    """
-    # Search for the field in a case-insensitive manner with an optional length attribute
-    pattern = rf"<{field_name}:(\d+)>([^<]*)"
-    match = re.search(pattern, record, re.IGNORECASE)
-    if match:
-        return match.group(2).strip()  # Extract the value and remove any surrounding whitespace
-    return ""  # Return an empty string if the field is not found
-
-def import_format_date(date_str):
-    # Convert date from ADIF format (yyyymmdd) to yyyy-mm-dd
-    if date_str and len(date_str) == 8:
-        return datetime.strptime(date_str, "%Y%m%d").strftime("%Y-%m-%d")
-    return None
-
-def import_format_time(time_str):
-    # Convert time from ADIF format (HHMMSS) to HH:MM:SS
-    if time_str and len(time_str) >= 4:
-        try:
-            return datetime.strptime(time_str[:6], "%H%M%S").strftime("%H:%M:%S")
-        except ValueError:
-            pass  # Ignore formatting if time is invalid
-    return None
 
-
-def import_adif():
+def import_adif(adif_files=None):
     global current_json_file
     if not current_json_file:
         messagebox.showerror("Error", "No logbook file loaded. Please load a logbook before importing.")
         return
 
-    adif_file = filedialog.askopenfilename(title="Select ADIF File", filetypes=[("ADIF files", "*.adi"), ("All files", "*.*")])
-    if not adif_file:
+    # One or more files, e.g. one per operator or position after a DXpedition
+    if not adif_files:
+        adif_files = filedialog.askopenfilenames(title="Select ADIF File(s)", filetypes=[("ADIF files", "*.adi *.adif"), ("ADX files", "*.adx"), ("CSV / JSON Lines", "*.csv *.jsonl *.csv.gz *.jsonl.gz"), ("All files", "*.*")])
+    adif_files = list(adif_files)
+    if not adif_files:
         return
 
-    progress_window = tk.Toplevel(root)
-    progress_window.title("Importing ADIF")
-    progress_window.geometry("400x100")
-    progress_label = tk.Label(progress_window, text="Importing QSOs...")
-    progress_label.pack(pady=5)
-    progress_counter = tk.Label(progress_window, text="")
-    progress_counter.pack()
-    progress = ttk.Progressbar(progress_window, orient="horizontal", length=300, mode="determinate")
-    progress.pack(pady=5)
-
-    def ask_duplicates_action(count):
-        
+    # The worker thread only talks to the window through this channel
+    channel = ProgressChannel(root, "Importing ADIF")
+
+    def ask_import_action(preview):
+        """
+        Dry run preview of the import, returns "add", "overwrite", "ignore" or "" when cancelled.
+        """
         action_var = tk.StringVar(value="")
 
         dlg = tk.Toplevel(root)
-        dlg.title("Duplicates found")
+        dlg.title("Import preview")
         dlg.grab_set()
         dlg.transient(root)
 
-        label = tk.Label(dlg, text=f"{count} duplicates found.\nWhat do you want to do?")
-        label.pack(padx=20, pady=10)
+        counts = preview.counts
+        summary = (
+            f"{preview.total} QSO(s) in ADIF file\n\n"
+            f"New: {counts['new']}\n"
+            f"Near-duplicates (same call/date/band/mode within {NEAR_DUPLICATE_SECONDS // 60} min): {counts['near']}\n"
+            f"Exact duplicates: {counts['exact']}\n"
+            f"Duplicates with different field values: {counts['conflict']}\n\n"
+            "New QSOs and near-duplicates are always added.\n"
+            "What do you want to do with the duplicates?"
+        )
+        tk.Label(dlg, text=summary, justify="left").pack(padx=20, pady=10)
+
+        # Sample of each category
+        sample_frame = tk.Frame(dlg)
+        sample_frame.pack(fill="both", expand=True, padx=10)
+
+        sample_columns = ("Result", "Callsign", "Date", "Time", "Band", "Mode", "Changed fields")
+        sample_tree = ttk.Treeview(sample_frame, columns=sample_columns, show="headings", height=12)
+        for col in sample_columns:
+            sample_tree.heading(col, text=col)
+            sample_tree.column(col, anchor="center", width=250 if col == "Changed fields" else 80)
+
+        sample_scroll = ttk.Scrollbar(sample_frame, orient="vertical", command=sample_tree.yview)
+        sample_tree.configure(yscrollcommand=sample_scroll.set)
+        sample_scroll.pack(side="right", fill="y")
+        sample_tree.pack(side="left", fill="both", expand=True)
+
+        category_labels = {"new": "New", "near": "Near-duplicate", "exact": "Exact duplicate", "conflict": "Different values"}
+        for category in ("conflict", "near", "exact", "new"):
+            for entry, changes in preview.samples[category]:
+                sample_tree.insert("", "end", values=(
+                    category_labels[category],
+                    entry.get("Callsign", ""),
+                    entry.get("Date", ""),
+                    entry.get("Time", ""),
+                    entry.get("Band", ""),
+                    entry.get("Mode", ""),
+                    ", ".join(changes)
+                ))
 
         def set_action(value):
             action_var.set(value)
@@ -2397,146 +2369,398 @@ def import_adif():
         tk.Button(btn_frame, text="Add", width=10, command=lambda: set_action("add")).pack(side="left", padx=5)
         tk.Button(btn_frame, text="Overwrite", width=10, command=lambda: set_action("overwrite")).pack(side="left", padx=5)
         tk.Button(btn_frame, text="Ignore", width=10, command=lambda: set_action("ignore")).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Cancel", width=10, command=lambda: set_action("")).pack(side="left", padx=5)
 
+        dlg.protocol("WM_DELETE_WINDOW", lambda: set_action(""))
         dlg.wait_window()
         return action_var.get()
 
     def do_import():
         try:
-            with open(current_json_file, "r", encoding="utf-8") as json_file:
-                logbook_data = json.load(json_file)
+            channel.set_phase("read")
+            logbook_data = load_logbook(current_json_file)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load logbook: {e}")
-            progress_window.destroy()
+            channel.finish(messagebox.showerror, "Error", f"Failed to load logbook: {e}")
             return
 
         try:
-            try:
-                with open(adif_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                with open(adif_file, "r", encoding="latin-1") as f:
-                    content = f.read()
+            total_bytes = sum(os.path.getsize(adif_file) for adif_file in adif_files) or 1
+        except OSError as e:
+            channel.finish(messagebox.showerror, "Error", f"Failed to load ADIF file: {e}")
+            return
+
+        logbook = logbook_data["Logbook"]
+        logbook_size = len(logbook)
+
+        def progress(bytes_read, count):
+            channel.check_cancelled()
+            channel.update(bytes_read, count=count)
+
+        # A single file is streamed in chunks, large files are parsed in a process pool.
+        # Several files are parsed side by side, one per process.
+        # Entries arrive in file order and are deduplicated against the logbook and each other as they arrive.
+        channel.set_phase("parse", total_bytes)
+        try:
+            preview, added_count = classify_import(logbook, adif_files, progress, dxcc_resolver)
+        except ProgressCancelled:
+            channel.finish(messagebox.showinfo, "Import ADIF", "Import cancelled, logbook not changed.")
+            return
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load ADIF file: {e}")
-            progress_window.destroy()
+            channel.finish(messagebox.showerror, "Error", f"Failed to load ADIF file: {e}")
             return
 
-        qso_records = [r for r in re.split(r'<eor>', content, flags=re.IGNORECASE) if r.strip()]
-        total_qso_count = len(qso_records)
-        progress["maximum"] = total_qso_count
+        channel.update(total_bytes, count=preview.total)
 
-        added_entries = []
-        duplicates = []
+        # Show what the import will do, nothing is written when cancelled
+        action = channel.call(ask_import_action, preview)
+        if not action or channel.cancelled:
+            channel.finish(messagebox.showinfo, "Import ADIF", "Import cancelled, logbook not changed.")
+            return
 
-        logbook_index = {
-            f"{entry['Callsign']}_{entry['Date']}_{entry['Time']}": entry
-            for entry in logbook_data["Logbook"]
-        }
+        # QSOs may have been logged or edited while the preview was open: the import is applied in the
+        # Tk thread to the logbook in memory and saved from there, like every other change
+        imported = logbook[logbook_size:]
 
-        for i, record in enumerate(qso_records, 1):
-            callsign = extract_field(record, "call").upper()
-            if not callsign:
-                continue
+        def apply_to_logbook():
+            added = rebase_import(qso_lines, imported, preview)
+            duplicates_added, updated = apply_import(qso_lines, preview, action, dxcc_resolver)
+            save_to_json()
+            return added + duplicates_added, updated
 
-            entry = {
-                "Date": import_format_date(extract_field(record, "qso_date")) or "",
-                "Time": import_format_time(extract_field(record, "time_on")) or "",
-                "Callsign": callsign,
-                "Name": extract_field(record, "name") or "",
-                "My Callsign": extract_field(record, "station_callsign").upper() or "",
-                "My Operator": extract_field(record, "operator").upper() or "",
-                "My Locator": "",
-                "My Location": "",
-                "My WWFF": extract_field(record, "station_wwff_ref").upper() or "",
-                "My POTA": extract_field(record, "station_pota_ref").upper() or "",
-                "My BOTA": "",
-                "My COTA": "",
-                "My IOTA": extract_field(record, "station_iota").upper() or "",
-                "My SOTA": extract_field(record, "station_sota_ref").upper() or "",
-                "My WLOTA": "",
-                "Country": extract_field(record, "country") or "",
-                "Continent": extract_field(record, "cont").upper() or "",
-                "Sent": extract_field(record, "rst_sent") or "",
-                "Received": extract_field(record, "rst_rcvd") or "",
-                "Sent Exchange": extract_field(record, "stx") or "",
-                "Receive Exchange": extract_field(record, "srx") or "",
-                "Mode": extract_field(record, "mode") or "",
-                "Submode": extract_field(record, "submode") or "",
-                "Band": extract_field(record, "band").lower() or "",
-                "Frequency": extract_field(record, "freq") or "",
-                "Locator": extract_field(record, "gridsquare").upper() or "",
-                "Comment": extract_field(record, "comment") or "",
-                "WWFF": extract_field(record, "wwff_ref").upper() or "",
-                "POTA": extract_field(record, "pota_ref").upper() or "",
-                "BOTA": "",
-                "SOTA": extract_field(record, "sota_ref").upper() or "",
-                "IOTA": extract_field(record, "iota").upper() or "",
-                "WLOTA": "",
-                "Satellite": extract_field(record, "sat_name") or ""
-            }
-
-            station_sig = extract_field(record, "station_sig")
-            station_sig_info = extract_field(record, "station_sig_info")
-            if station_sig == "BOTA":
-                entry["My BOTA"] = station_sig_info
-            elif station_sig == "COTA":
-                entry["My COTA"] = station_sig_info                
-            elif station_sig == "WLOTA":
-                entry["My WLOTA"] = station_sig_info
-
-            key = f"{entry['Callsign']}_{entry['Date']}_{entry['Time']}"
-            if key in logbook_index:
-                duplicates.append((key, entry))
-            else:
-                added_entries.append(entry)
+        channel.set_phase("write")
+        added_count, updated_count = channel.call(apply_to_logbook)
 
-            if i % 50 == 0 or i == total_qso_count:
-                progress["value"] = i
-                progress_counter.config(text=f"{i} / {total_qso_count} QSOs")
-                progress_window.update_idletasks()
+        def import_done():
+            for window in root.winfo_children():
+                if isinstance(window, tk.Toplevel) and hasattr(window, 'update_logbook'):
+                    window.update_logbook()
+            messagebox.showinfo("Import ADIF", f"{len(adif_files)} file(s) imported.\n{added_count} new QSO(s) added.\n{updated_count} existing QSO(s) updated.")
 
-        # What to do with duplicates
-        if duplicates:
-            action = ask_duplicates_action(len(duplicates))
-        else:
-            action = "add"
+        channel.finish(import_done)
 
-        added_count = len(added_entries)
-        updated_count = 0
+    threading.Thread(target=do_import, daemon=True).start()
 
-        if action == "overwrite":
-            for key, entry in duplicates:
-                logbook_index[key].update(entry)
-                updated_count += 1
-        elif action == "ignore":
-            pass  # duplicates ignore
-        else:  # add
-            for key, entry in duplicates:
-                logbook_data["Logbook"].append(entry)
-                added_count += 1
 
-        logbook_data["Logbook"].extend(added_entries)
+# Function to import all ADIF / ADX files in a folder in one go
+def import_adif_folder():
+    if not current_json_file:
+        messagebox.showerror("Error", "No logbook file loaded. Please load a logbook before importing.")
+        return
+
+    folder = filedialog.askdirectory(title="Select folder with ADIF files")
+    if not folder:
+        return
+
+    adif_files = find_log_files(folder)
+    if not adif_files:
+        messagebox.showinfo("Import ADIF", "No ADIF or ADX files found in this folder.")
+        return
+
+    import_adif(adif_files)
+
+
+# Function to merge QSL / LoTW / eQSL confirmations from downloaded reports into existing QSOs
+def merge_qsl_confirmations():
+    if not current_json_file:
+        messagebox.showerror("Error", "No logbook file loaded. Please load a logbook before merging confirmations.")
+        return
+
+    report_files = filedialog.askopenfilenames(title="Select confirmation report(s)", filetypes=[("ADIF files", "*.adi *.adif"), ("ADX files", "*.adx"), ("All files", "*.*")])
+    report_files = list(report_files)
+    if not report_files:
+        return
+
+    source = ask_qsl_source()
+    if source is None:
+        return
+
+    channel = ProgressChannel(root, "Merging confirmations", unit="records")
 
+    def do_merge():
         try:
-            with open(current_json_file, "w", encoding="utf-8") as json_file:
-                json.dump(logbook_data, json_file, indent=4)
+            total_bytes = sum(os.path.getsize(report_file) for report_file in report_files) or 1
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to save logbook: {e}")
-            progress_window.destroy()
+            channel.finish(messagebox.showerror, "Error", f"Failed to load: {e}")
             return
 
-        def refresh_logbooks():
-            for window in root.winfo_children():
-                if isinstance(window, tk.Toplevel) and hasattr(window, 'update_logbook'):
-                    window.update_logbook()
+        def progress(bytes_read, count):
+            channel.check_cancelled()
+            channel.update(bytes_read, count=count)
+
+        # Nothing is merged until every report is read, a cancel leaves the logbook as it was
+        channel.set_phase("parse", total_bytes)
+        reports = []
+        batches = iter_qsl_reports(report_files, source or None)
+        try:
+            count = 0
+            for entries, bytes_read in batches:
+                reports.extend(entries)
+                count += len(entries)
+                progress(bytes_read, count)
+        except ProgressCancelled:
+            channel.finish(messagebox.showinfo, "Merge confirmations", "Merge cancelled, logbook not changed.")
+            return
+        except Exception as e:
+            channel.finish(messagebox.showerror, "Error", f"Failed to read report: {e}")
+            return
+        finally:
+            batches.close()
 
-        root.after(0, refresh_logbooks)
+        # Merged into the logbook in memory in the Tk thread, so QSOs logged meanwhile are kept
+        # The QSOs are listed as they were when merged, the result refers to them by index
+        def merge_into_logbook():
+            result = merge_qsl_reports(qso_lines, [(reports, total_bytes)])
+            if result.updated:
+                save_to_json()
+            return result, list(qso_lines)
 
-        progress_window.destroy()
-        messagebox.showinfo("Import ADIF", f"{added_count} new QSO(s) added.\n{updated_count} existing QSO(s) updated.")
+        channel.set_phase("write")
+        result, logbook = channel.call(merge_into_logbook)
 
-    threading.Thread(target=do_import, daemon=True).start()
+        def merge_done():
+            if result.updated:
+                for window in root.winfo_children():
+                    if isinstance(window, tk.Toplevel) and hasattr(window, 'update_logbook'):
+                        window.update_logbook()
+            show_qsl_merge_result(result, logbook)
+
+        channel.finish(merge_done)
+
+    threading.Thread(target=do_merge, daemon=True).start()
+
+
+def ask_qsl_source():
+    """
+    Where the reports come from: "lotw", "eqsl", "qsl", "" to detect it per file, None when cancelled.
+    """
+    source_var = tk.StringVar(value="")
+    chosen = []
+
+    dlg = tk.Toplevel(root)
+    dlg.title("Merge confirmations")
+    dlg.grab_set()
+    dlg.transient(root)
+
+    tk.Label(dlg, text="Where do the confirmation reports come from?", justify="left").pack(padx=20, pady=10)
+    tk.Radiobutton(dlg, text="Detect from the file (LoTW / eQSL header)", variable=source_var, value="").pack(anchor="w", padx=20)
+    for source, name in QSL_SOURCE_NAMES.items():
+        tk.Radiobutton(dlg, text=name, variable=source_var, value=source).pack(anchor="w", padx=20)
+
+    def choose():
+        chosen.append(source_var.get())
+        dlg.destroy()
+
+    btn_frame = tk.Frame(dlg)
+    btn_frame.pack(pady=10)
+    tk.Button(btn_frame, text="Merge", width=10, command=choose).pack(side="left", padx=5)
+    tk.Button(btn_frame, text="Cancel", width=10, command=dlg.destroy).pack(side="left", padx=5)
+
+    dlg.wait_window()
+    return chosen[0] if chosen else None
+
+
+def show_qsl_merge_result(result, logbook):
+    summary = (
+        f"{result.total} confirmation(s) in the report(s)\n\n"
+        f"Matched: {result.matched} ({result.updated} QSO(s) updated)\n"
+        f"Unmatched: {len(result.unmatched)}\n"
+        f"Ambiguous (more than one QSO within {QSL_MATCH_SECONDS // 60} min): {len(result.ambiguous)}"
+    )
+    if not result.unmatched and not result.ambiguous:
+        messagebox.showinfo("Merge confirmations", summary)
+        return
+
+    dlg = tk.Toplevel(root)
+    dlg.title("Merge confirmations")
+    dlg.transient(root)
+
+    tk.Label(dlg, text=summary, justify="left").pack(padx=20, pady=10)
+
+    tree_frame = tk.Frame(dlg)
+    tree_frame.pack(fill="both", expand=True, padx=10)
+
+    columns = ("Result", "Callsign", "Date", "Time", "Band", "Mode", "Logged at")
+    tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=15)
+    for col in columns:
+        tree.heading(col, text=col)
+        tree.column(col, anchor="center", width=160 if col == "Logged at" else 90)
+
+    scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=scroll.set)
+    scroll.pack(side="right", fill="y")
+    tree.pack(side="left", fill="both", expand=True)
+
+    def report_values(label, report, logged_at=""):
+        return (label, report.get("Callsign", ""), report.get("Date", ""), report.get("Time", ""),
+                report.get("Band", ""), report.get("Mode", ""), logged_at)
+
+    for report, found in result.ambiguous:
+        tree.insert("", "end", values=report_values("Ambiguous", report, ", ".join(logbook[i].get("Time", "") for i in found)))
+    for report in result.unmatched:
+        tree.insert("", "end", values=report_values("Unmatched", report))
+
+    tk.Button(dlg, text="Close", width=10, command=dlg.destroy).pack(pady=10)
+
+
+# Function to set Country / Continent of every QSO again, e.g. after a cty.dat update
+def recompute_logbook_countries():
+    if not current_json_file:
+        messagebox.showerror("Error", "No logbook file loaded. Please load a logbook first.")
+        return
+    if not len(dxcc_resolver):
+        messagebox.showerror("Error", "No cty.dat loaded.")
+        return
+    if not messagebox.askyesno("Recompute countries", "Set the country and continent of all QSOs from cty.dat?"):
+        return
+
+    channel = ProgressChannel(root, "Recomputing countries")
+    resolver = dxcc_resolver
+
+    def do_recompute():
+        # Only the callsigns are taken here, QSOs keep being logged while this runs
+        callsigns = channel.call(lambda: {qso.get("Callsign", "") for qso in qso_lines})
+
+        def progress(done):
+            channel.check_cancelled()
+            channel.update(done)
+
+        channel.set_phase("resolve", len(callsigns))
+        try:
+            resolved = resolve_callsigns(resolver, callsigns, progress=progress)
+        except ProgressCancelled:
+            channel.finish(messagebox.showinfo, "Recompute countries", "Cancelled, logbook not changed.")
+            return
+
+        # Applied to the logbook in memory in the Tk thread, QSOs logged meanwhile are kept (and already have their country)
+        def apply_countries():
+            changed = recompute_countries(qso_lines, resolved)
+            if changed:
+                save_to_json()
+            return changed, len(qso_lines)
+
+        channel.set_phase("write")
+        changed, checked = channel.call(apply_countries)
+
+        def recompute_done():
+            if changed:
+                for window in root.winfo_children():
+                    if isinstance(window, tk.Toplevel) and hasattr(window, 'update_logbook'):
+                        window.update_logbook()
+            messagebox.showinfo("Recompute countries", f"{checked} QSO(s) checked.\n{changed} QSO(s) changed.")
+
+        channel.finish(recompute_done)
+
+    threading.Thread(target=do_recompute, daemon=True).start()
+
+
+# Band name for a frequency in MHz, "OOB" when outside the known bands
+def band_for_frequency(frequency):
+    for band, (low, high) in band_ranges.items():
+        if low <= frequency <= high:
+            return band
+    return "OOB"
+
+
+# Function to find QSOs in WSJT-X ALL.TXT that never made it into the logbook
+def recover_from_wsjtx_all_txt():
+    if not current_json_file:
+        messagebox.showerror("Error", "No logbook file loaded. Please load a logbook before recovering QSOs.")
+        return
+
+    all_txt = filedialog.askopenfilename(title="Select WSJT-X ALL.TXT", filetypes=[("WSJT-X log", "ALL.TXT *.txt"), ("All files", "*.*")])
+    if not all_txt:
+        return
+
+    my_call = station_callsign_var.get().strip().upper()
+    if not my_call:
+        messagebox.showerror("Error", "No station callsign set in Station Setup.")
+        return
+
+    channel = ProgressChannel(root, "Scanning ALL.TXT", unit="MB")
+
+    def do_scan():
+        try:
+            total_bytes = os.path.getsize(all_txt) or 1
+        except OSError as e:
+            channel.finish(messagebox.showerror, "Error", f"Failed to read ALL.TXT: {e}")
+            return
+
+        def progress(bytes_read):
+            channel.check_cancelled()
+            channel.update(bytes_read, count=bytes_read // (1024 * 1024))
+
+        # Only lines with the station callsign are decoded, the rest of the file is skipped in bulk
+        channel.set_phase("parse", total_bytes)
+        try:
+            recovered = recover_qsos(all_txt, my_call, band_for_frequency, progress)
+        except ProgressCancelled:
+            channel.finish()
+            return
+        except Exception as e:
+            channel.finish(messagebox.showerror, "Error", f"Failed to read ALL.TXT: {e}")
+            return
+
+        channel.set_phase("dedup", len(recovered))
+        missing = find_missing(recovered, list(qso_lines))
+        channel.update(len(recovered))
+        channel.finish(show_recovered_qsos, recovered, missing)
+
+    threading.Thread(target=do_scan, daemon=True).start()
+
+
+def show_recovered_qsos(recovered, missing):
+    if not missing:
+        messagebox.showinfo("Recover QSOs", f"{len(recovered)} completed QSO(s) found in ALL.TXT, all of them are already logged.")
+        return
+
+    dlg = tk.Toplevel(root)
+    dlg.title("Recover QSOs from ALL.TXT")
+    dlg.transient(root)
+
+    tk.Label(dlg, text=f"{len(recovered)} completed QSO(s) found in ALL.TXT, {len(missing)} of them are not in the logbook.", justify="left").pack(padx=20, pady=10)
+
+    tree_frame = tk.Frame(dlg)
+    tree_frame.pack(fill="both", expand=True, padx=10)
+
+    columns = ("Date", "Time", "Callsign", "Band", "Mode", "Frequency", "Sent", "Received", "Locator")
+    tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=15)
+    for col in columns:
+        tree.heading(col, text=col)
+        tree.column(col, anchor="center", width=90)
+
+    scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=scroll.set)
+    scroll.pack(side="right", fill="y")
+    tree.pack(side="left", fill="both", expand=True)
+
+    for idx, entry in enumerate(missing):
+        tree.insert("", "end", iid=str(idx), values=tuple(entry.get(col, "") for col in columns))
+
+    def import_entries(entries):
+        if not entries:
+            return
+        my_locator = station_locator_var.get().strip().upper()
+        for entry in entries:
+            set_country_from_callsign(entry)
+            if not entry.get("My Locator"):
+                entry["My Locator"] = my_locator
+
+        qso_lines.extend(entries)
+        save_to_json()
+        update_worked_before_tree()
+
+        for window in root.winfo_children():
+            if isinstance(window, tk.Toplevel) and hasattr(window, 'update_logbook'):
+                window.update_logbook()
+
+        dlg.destroy()
+        messagebox.showinfo("Recover QSOs", f"{len(entries)} QSO(s) added to the logbook.")
+
+    btn_frame = tk.Frame(dlg)
+    btn_frame.pack(pady=10)
+    tk.Button(btn_frame, text="Import selected", width=14, command=lambda: import_entries([missing[int(i)] for i in tree.selection()])).pack(side="left", padx=5)
+    tk.Button(btn_frame, text="Import all", width=14, command=lambda: import_entries(missing)).pack(side="left", padx=5)
+    tk.Button(btn_frame, text="Cancel", width=14, command=dlg.destroy).pack(side="left", padx=5)
 
 
 
@@ -2556,17 +2780,6 @@ def import_adif():
 #                                                   
 #########################################################################################
 
-# Function to escape invalid characters
-def escape_invalid_characters(text):
-    # Remove or replace problematic characters (non-ASCII)
-    # Here we replace Unicode characters outside the typical ASCII range with a placeholder or remove them.
-    # For example, replace \ub250 (and others like it) with an empty string or another character.
-    
-    # Replace specific unwanted Unicode characters (e.g., \ub250) with a placeholder like "?"
-    text = re.sub(r'[\u0080-\uFFFF]', '?', text)  # Replace non-ASCII characters with '?'
-    
-    return text
-
 # Function to ask the user to select the log type (POTA, WWFF, General)
 def get_log_type():
     # Create a new window for log type selection
@@ -2614,7 +2827,7 @@ def get_log_type():
 
 # Function to export JSON log file to ADIF format
 def export_to_adif():
-    global current_json_file, qso_lines
+    global current_json_file
 
     if not current_json_file or not qso_lines:
         messagebox.showwarning("Warning", "No logbook file loaded or no QSO entries to export!")
@@ -2634,127 +2847,266 @@ def export_to_adif():
         messagebox.showerror("Error", f"Failed to read Station info from JSON: {e}")
         return
 
-    # Only the needed fields from Station
-    owner_name       = escape_invalid_characters(station_info.get('Name', ''))
-    owner_street     = escape_invalid_characters(station_info.get('Street', ''))
-    owner_postalcode = escape_invalid_characters(station_info.get('Postalcode', ''))
-    owner_city       = escape_invalid_characters(station_info.get('City', ''))
-    owner_county     = escape_invalid_characters(station_info.get('County', ''))
-    owner_country    = escape_invalid_characters(station_info.get('Country', ''))
-    contest          = escape_invalid_characters(station_info.get('Contest', ''))
-
-    # Ask the user for the output ADIF file location
-    adif_file = filedialog.asksaveasfilename(defaultextension=".adi", filetypes=[("ADIF files", "*.adi")])
+    # Ask the user for the output ADIF file location, .gz / .zip are compressed while writing
+    adif_file = filedialog.asksaveasfilename(defaultextension=".adi", filetypes=[
+        ("ADIF files", "*.adi"), ("ADX files", "*.adx"),
+        ("ADIF gzip", "*.adi.gz"), ("ADX gzip", "*.adx.gz"), ("Zip archive", "*.zip")])
     if not adif_file:
         return  # User canceled the save dialog    
 
+    # One file, a file per year or a file per N QSOs
+    split = get_split_option()
+    if split == "":
+        return
+
+    # Write in a worker thread, progress goes through the channel
+    export_lines = list(qso_lines)
+    total = len(export_lines)
+    channel = ProgressChannel(root, "Exporting ADIF")
+
+    def progress(exported):
+        channel.check_cancelled()
+        channel.update(exported, total)
+
+    def do_export():
+        channel.set_phase("write", total)
+        try:
+            # Write the ADIF file(s), one pass over the log
+            written = export_archive(adif_file, export_lines, station_info, log_type, split, progress, ascii_only=True)
+
+            channel.finish(messagebox.showinfo, "Success", f"Exported to ADIF format successfully!\n{len(written)} file(s) written.")
+        except ProgressCancelled:
+            channel.finish(messagebox.showinfo, "Export ADIF", "Export cancelled.")
+        except Exception as e:
+            channel.finish(messagebox.showerror, "Error", f"Failed to export to ADIF: {e}")
+
+    threading.Thread(target=do_export, daemon=True).start()
+
+
+
+# Function to ask how a large export is split over files, returns None, "year", a number of QSOs or "" when cancelled
+def get_split_option():
+    split_window = tk.Toplevel(Logbook_Window)
+    split_window.title("Split export")
+    split_window.resizable(False, False)
+
+    mode_var = tk.StringVar(value="none")
+    size_var = tk.StringVar(value="50000")
+    result = {"split": ""}
+
+    tk.Label(split_window, text="Write the export to:").pack(padx=10, pady=(10, 5), anchor="w")
+    tk.Radiobutton(split_window, text="One file", variable=mode_var, value="none").pack(padx=20, anchor="w")
+    tk.Radiobutton(split_window, text="One file per year", variable=mode_var, value="year").pack(padx=20, anchor="w")
+    size_frame = tk.Frame(split_window)
+    size_frame.pack(padx=20, anchor="w")
+    tk.Radiobutton(size_frame, text="A new file every", variable=mode_var, value="size").pack(side="left")
+    tk.Entry(size_frame, textvariable=size_var, width=8).pack(side="left")
+    tk.Label(size_frame, text="QSOs").pack(side="left")
+
+    def confirm():
+        mode = mode_var.get()
+        if mode == "size":
+            try:
+                size = int(size_var.get())
+                if size < 1:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Invalid number", "Enter the number of QSOs per file.", parent=split_window)
+                return
+            result["split"] = size
+        else:
+            result["split"] = None if mode == "none" else mode
+        split_window.destroy()
+
+    btn_frame = tk.Frame(split_window)
+    btn_frame.pack(pady=10)
+    tk.Button(btn_frame, text="OK", width=10, command=confirm).pack(side="left", padx=10)
+    tk.Button(btn_frame, text="Cancel", width=10, command=split_window.destroy).pack(side="right", padx=10)
+
+    split_window.transient(Logbook_Window)
+    split_window.grab_set()
+    split_window.wait_window()
+
+    return result["split"]
+
+
+# Function to export the logbook to CSV or JSON Lines for spreadsheets and analysis tools
+def export_to_table():
+    if not current_json_file or not qso_lines:
+        messagebox.showwarning("Warning", "No logbook file loaded or no QSO entries to export!")
+        return
+
+    table_file = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[
+        ("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"),
+        ("CSV gzip", "*.csv.gz"), ("JSON Lines gzip", "*.jsonl.gz")])
+    if not table_file:
+        return
+    if not table_format(table_file):
+        messagebox.showerror("Error", "Choose a .csv or .jsonl file name.")
+        return
+
+    columns = get_table_columns()
+    if not columns:
+        return
+
+    export_lines = list(qso_lines)
+    total = len(export_lines)
+    channel = ProgressChannel(root, "Exporting table")
+
+    def progress(exported):
+        channel.check_cancelled()
+        channel.update(exported, total)
+
+    def do_export():
+        channel.set_phase("write", total)
+        try:
+            count = export_table(table_file, export_lines, columns, progress)
+            channel.finish(messagebox.showinfo, "Success", f"{count} QSO(s) exported to {os.path.basename(table_file)}")
+        except ProgressCancelled:
+            channel.finish(messagebox.showinfo, "Export", "Export cancelled.")
+        except Exception as e:
+            channel.finish(messagebox.showerror, "Error", f"Failed to export: {e}")
+
+    threading.Thread(target=do_export, daemon=True).start()
+
+
+# Function to pick the columns of a CSV / JSON Lines export, returns a list or None when cancelled
+def get_table_columns():
+    column_window = tk.Toplevel(Logbook_Window)
+    column_window.title("Columns")
+    column_window.resizable(False, False)
+
+    result = {"columns": None}
+
+    tk.Label(column_window, text="Columns to export (Datetime is date + time in UTC):").pack(padx=10, pady=(10, 5), anchor="w")
+    listbox = tk.Listbox(column_window, selectmode="multiple", height=18, exportselection=False)
+    for column in TABLE_COLUMNS:
+        listbox.insert("end", column)
+    listbox.select_set(0, "end")
+    listbox.pack(padx=10, fill="both")
+
+    def confirm():
+        selected = [TABLE_COLUMNS[i] for i in listbox.curselection()]
+        if not selected:
+            messagebox.showerror("No columns", "Select at least one column.", parent=column_window)
+            return
+        result["columns"] = selected
+        column_window.destroy()
+
+    btn_frame = tk.Frame(column_window)
+    btn_frame.pack(pady=10)
+    tk.Button(btn_frame, text="All", width=8, command=lambda: listbox.select_set(0, "end")).pack(side="left", padx=5)
+    tk.Button(btn_frame, text="None", width=8, command=lambda: listbox.select_clear(0, "end")).pack(side="left", padx=5)
+    tk.Button(btn_frame, text="OK", width=8, command=confirm).pack(side="left", padx=5)
+    tk.Button(btn_frame, text="Cancel", width=8, command=column_window.destroy).pack(side="left", padx=5)
+
+    column_window.transient(Logbook_Window)
+    column_window.grab_set()
+    column_window.wait_window()
+
+    return result["columns"]
+
+
+# Function to ask for the destination of an incremental export (e.g. LoTW, eQSL, Club Log)
+def get_export_destination(known_destinations):
+    dest_window = tk.Toplevel(Logbook_Window)
+    dest_window.title("Export destination")
+    dest_window.resizable(False, False)
+
+    destination_var = tk.StringVar(value=known_destinations[0] if known_destinations else "")
+    result = tk.StringVar(value="")
+
+    tk.Label(dest_window, text="Export QSOs added or changed since the last export to:").pack(padx=10, pady=(10, 5))
+    combo = ttk.Combobox(dest_window, textvariable=destination_var, values=known_destinations, width=30)
+    combo.pack(padx=10, pady=5)
+    combo.focus_set()
+
+    def confirm():
+        result.set(destination_var.get().strip())
+        dest_window.destroy()
+
+    btn_frame = tk.Frame(dest_window)
+    btn_frame.pack(pady=10)
+    tk.Button(btn_frame, text="OK", width=10, command=confirm).pack(side="left", padx=10)
+    tk.Button(btn_frame, text="Cancel", width=10, command=dest_window.destroy).pack(side="right", padx=10)
+    dest_window.bind("<Return>", lambda e: confirm())
+
+    dest_window.transient(Logbook_Window)
+    dest_window.grab_set()
+    dest_window.wait_window()
+
+    return result.get()
+
+
+# Function to export only the QSOs added or edited since the last export to a destination
+def export_changes_to_adif():
+    global current_json_file
+
+    if not current_json_file or not qso_lines:
+        messagebox.showwarning("Warning", "No logbook file loaded or no QSO entries to export!")
+        return
+
     try:
-        # Write the ADIF file
-        with open(adif_file, 'w', encoding='utf-8') as file:
-            for qso in qso_lines:
-                # Prepare the ADIF record from the JSON data
-                adif_record = []
-                operator = escape_invalid_characters(qso.get('My Operator', ''))
-                station_callsign = escape_invalid_characters(qso.get('My Callsign', ''))
-
-                callsign = escape_invalid_characters(qso.get('Callsign', ''))
-                name = escape_invalid_characters(qso.get('Name', ''))
-
-                date = export_format_date(qso.get('Date', ''))
-                time = export_format_time(qso.get('Time', ''))
-                mode = escape_invalid_characters(qso.get('Mode', ''))
-                submode = escape_invalid_characters(qso.get('Submode', ''))
-                band = escape_invalid_characters(qso.get('Band', ''))
-                frequency = escape_invalid_characters(qso.get('Frequency', ''))
-                sent = escape_invalid_characters(qso.get('Sent', ''))
-                received = escape_invalid_characters(qso.get('Received', ''))
-                stx = escape_invalid_characters(qso.get('Sent Exchange', ''))
-                srx = escape_invalid_characters(qso.get('Receive Exchange', ''))
-                comment = escape_invalid_characters(qso.get('Comment', ''))
-
-                wwff = escape_invalid_characters(qso.get('WWFF', ''))
-                pota = escape_invalid_characters(qso.get('POTA', ''))
-                bota = escape_invalid_characters(qso.get('BOTA', ''))
-                cota = escape_invalid_characters(qso.get('COTA', ''))
-                sota = escape_invalid_characters(qso.get('SOTA', ''))
-                iota = escape_invalid_characters(qso.get('IOTA', ''))
-                wlota = escape_invalid_characters(qso.get('WLOTA', ''))
-
-                station_wwff = escape_invalid_characters(qso.get('My WWFF', ''))
-                station_pota = escape_invalid_characters(qso.get('My POTA', ''))
-                station_bota = escape_invalid_characters(qso.get('My BOTA', ''))
-                station_cota = escape_invalid_characters(qso.get('My COTA', ''))
-                station_sota = escape_invalid_characters(qso.get('My SOTA', ''))
-                station_iota = escape_invalid_characters(qso.get('My IOTA', ''))
-                station_wlota = escape_invalid_characters(qso.get('My WLOTA', ''))
-                
-                locator = escape_invalid_characters(qso.get('Locator', ''))
-                satellite = escape_invalid_characters(qso.get('Satellite', ''))
-
-
-                # Append the formatted fields to the record
-                adif_record.append(f"<band:{len(band)}>{band}")
-                adif_record.append(f"<call:{len(callsign)}>{callsign}")
-                adif_record.append(f"<comment:{len(comment)}>{comment}")
-                adif_record.append(f"<freq:{len(frequency)}>{frequency}")
-                adif_record.append(f"<mode:{len(mode)}>{mode}")
-                adif_record.append(f"<submode:{len(submode)}>{submode}")
-                adif_record.append(f"<rst_rcvd:{len(received)}>{received}")
-                adif_record.append(f"<rst_sent:{len(sent)}>{sent}")
-                adif_record.append(f"<stx:{len(stx)}>{stx}")
-                adif_record.append(f"<srx:{len(srx)}>{srx}")
-                adif_record.append(f"<time_off:{len(time)}>{time}")
-                adif_record.append(f"<time_on:{len(time)}>{time}")
-                adif_record.append(f"<qso_date:{len(date)}>{date}")
-                adif_record.append(f"<operator:{len(operator)}>{operator}")
-                adif_record.append(f"<station_callsign:{len(station_callsign)}>{station_callsign}")
-                adif_record.append(f"<gridsquare:{len(locator)}>{locator}")
-                adif_record.append(f"<sat_name:{len(satellite)}>{satellite}")
-                adif_record.append(f"<name:{len(name)}>{name}")
-
-                adif_record.append(f"<MY_POTA_REF:{len(station_pota)}>{station_pota}")
-                adif_record.append(f"<POTA_REF:{len(pota)}>{pota}")
-                adif_record.append(f"<MY_WWFF_REF:{len(station_wwff)}>{station_wwff}")
-                adif_record.append(f"<WWFF_REF:{len(wwff)}>{wwff}")
-                adif_record.append(f"<MY_IOTA:{len(station_iota)}>{station_iota}")
-                adif_record.append(f"<IOTA:{len(iota)}>{iota}")
-                adif_record.append(f"<MY_SOTA_REF:{len(station_sota)}>{station_sota}")
-                adif_record.append(f"<SOTA_REF:{len(sota)}>{sota}")
-
-                # Add the Station fields (fixed for all QSOs)
-                adif_record.append(f"<station_name:{len(owner_name)}>{owner_name}")
-                adif_record.append(f"<station_street:{len(owner_street)}>{owner_street}")
-                adif_record.append(f"<station_postal_code:{len(owner_postalcode)}>{owner_postalcode}")
-                adif_record.append(f"<station_city:{len(owner_city)}>{owner_city}")
-                adif_record.append(f"<station_cnty:{len(owner_county)}>{owner_county}")
-                adif_record.append(f"<station_country:{len(owner_country)}>{owner_country}")
-                adif_record.append(f"<contest_id:{len(contest)}>{contest}")
-
-                # Determine the log type: BOTA or WLOTA, store info in SIG
-                if log_type == "BOTA" and bota:
-                    activation = "BOTA"
-                    adif_record.append(f"<sig:{len(activation)}>{activation}")
-                    adif_record.append(f"<sig_info:{len(bota)}>{bota}")
-                    adif_record.append(f"<station_sig:{len(activation)}>{activation}")
-                    adif_record.append(f"<station_sig_info:{len(station_bota)}>{station_bota}") 
-                elif log_type == "COTA" and cota:
-                    activation = "COTA"
-                    adif_record.append(f"<sig:{len(activation)}>{activation}")
-                    adif_record.append(f"<sig_info:{len(cota)}>{cota}")
-                    adif_record.append(f"<station_sig:{len(activation)}>{activation}")
-                    adif_record.append(f"<station_sig_info:{len(station_cota)}>{station_cota}")                     
-                elif log_type == "WLOTA" and wlota:
-                    activation = "WLOTA"
-                    adif_record.append(f"<sig:{len(activation)}>{activation}")
-                    adif_record.append(f"<sig_info:{len(wlota)}>{wlota}")
-                    adif_record.append(f"<station_sig:{len(activation)}>{activation}")
-                    adif_record.append(f"<station_sig_info:{len(station_wlota)}>{station_wlota}")                                                           
-                # Join the ADIF record and append EOR
-                file.write(" ".join(adif_record) + " <EOR>\n")
-
-        messagebox.showinfo("Success", "Exported to ADIF format successfully!")
+        with open(current_json_file, "r", encoding="utf-8") as f:
+            json_data = json.load(f)
+            station_info = json_data.get("Station", {})
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to export to ADIF: {e}")
+        messagebox.showerror("Error", f"Failed to read logbook: {e}")
+        return
+
+    destination = get_export_destination(destinations(json_data))
+    if not destination:
+        return
+
+    # Only the QSOs with a sequence number above the watermark, found in the change index
+    watermark = get_watermark(json_data, destination)
+    export_lines = change_index.since(watermark)
+    if not export_lines:
+        messagebox.showinfo("Export to ADIF", f"No new or changed QSOs since the last export to {destination}.")
+        return
+
+    if not messagebox.askyesno("Export to ADIF", f"{len(export_lines)} QSO(s) added or changed since the last export to {destination}.\n\nExport them?"):
+        return
+
+    log_type = get_log_type()
+    if not log_type:
+        return
+
+    adif_file = filedialog.asksaveasfilename(defaultextension=".adi", filetypes=[("ADIF files", "*.adi"), ("ADX files", "*.adx")],
+                                             initialfile=f"{destination}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.adi")
+    if not adif_file:
+        return
+
+    total = len(export_lines)
+    new_watermark = export_lines[-1][SEQ_FIELD]
+    channel = ProgressChannel(root, f"Exporting changes to {destination}")
+
+    def progress(exported):
+        channel.check_cancelled()
+        channel.update(exported, total)
+
+    def export_done():
+        # Only move the watermark once the file is complete
+        save_to_json(export_watermark=(destination, new_watermark))
+        messagebox.showinfo("Success", f"{total} QSO(s) exported for {destination}.")
+
+    def do_export():
+        channel.set_phase("write", total)
+        try:
+            with open(adif_file, 'w', encoding='utf-8', buffering=1024 * 1024) as file:
+                # ASCII only .adi like the full export
+                if is_adx_file(adif_file):
+                    write_adx(file, export_lines, station_info, log_type, progress)
+                else:
+                    write_adif(file, export_lines, station_info, log_type, progress, ascii_only=True)
+            channel.finish(export_done)
+        except ProgressCancelled:
+            os.remove(adif_file)
+            channel.finish(messagebox.showinfo, "Export ADIF", "Export cancelled, watermark not changed.")
+        except Exception as e:
+            channel.finish(messagebox.showerror, "Error", f"Failed to export to ADIF: {e}")
+
+    threading.Thread(target=do_export, daemon=True).start()
 
 
 
@@ -2771,26 +3123,6 @@ def open_export_folder(folder_path):
         messagebox.showerror("Error", f"Failed to open folder: {e}")
 
 
-# Function to convert date and time to ADIF format
-def export_format_date(date_str):
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')  # Adjust format as necessary
-        return date_obj.strftime('%Y%m%d')  # Convert to 'YYYYMMDD'
-    except ValueError:
-        return ''  # Return empty string if parsing fails
-
-def export_format_time(time_str):
-    try:
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')  # Adjust format as necessary
-        return time_obj.strftime('%H%M%S')  # Convert to 'HHMMSS'
-    except ValueError:
-        return ''  # Return empty string if parsing fails
-
-
-
-
-
-
 #########################################################################################
 #   ___  ___  ___    _    ___   ___  ___ ___ _  _  ___ 
 #  / _ \/ __|/ _ \  | |  / _ \ / __|/ __|_ _| \| |/ __|
@@ -2802,7 +3134,6 @@ def export_format_time(time_str):
 
 # Function to log QSO
 def log_qso():
-    global qso_lines
 
     if not current_json_file:
         messagebox.showwarning("Warning", "No logbook file loaded!")
@@ -2957,62 +3288,24 @@ def log_qso():
 
 # Function to build QRZ ADIF Compatible string
 def build_adif(qso):
-    # Use .get() for every key to avoid KeyError and provide default values if any are missing
-    callsign = qso.get('Callsign', '')
-    date = qso.get('Date', '')
-    time = qso.get('Time', '')
-    band = qso.get('Band', '')
-    mode = qso.get('Mode', '')
-    sent = qso.get('Sent', '')
-    received = qso.get('Received', '')
-    stx = qso.get('Sent Exchange', '')
-    srx = qso.get('Receive Exchange', '')
-    station_callsign = qso.get('My Callsign', '')
-    operator = qso.get('My Operator', '')
-    locator = qso.get('Locator', '')
-    name = qso.get('Name', '')
-    comment = qso.get('Comment', '')
-    frequency = qso.get('Frequency', '')
-
-    # Construct the ADIF formatted QSO entry string with required fields
-    adif = (
-        f"<CALL:{len(callsign)}>{callsign}"
-        f"<QSO_DATE:8>{date.replace('-', '')}"  # Date formatted as YYYYMMDD
-        f"<TIME_ON:6>{time.replace(':', '')}"   # Time formatted as HHMMSS
-        f"<BAND:{len(band)}>{band}"
-        f"<MODE:{len(mode)}>{mode}"
-        f"<RST_SENT:{len(sent)}>{sent}"
-        f"<RST_RCVD:{len(received)}>{received}"
-        f"<STX:{len(stx)}>{stx}"
-        f"<SRX:{len(srx)}>{srx}"
-        f"<STATION_CALLSIGN:{len(station_callsign)}>{station_callsign}"
-        f"<OPERATOR:{len(operator)}>{operator}"
-        f"<GRIDSQUARE:{len(locator)}>{locator}"
-        f"<NAME:{len(name)}>{name}"
-        f"<COMMENT:{len(comment)}>{comment}"
-        f"<FREQ:{len(frequency)}>{frequency}"
-    )
-
-    # Append the <EOR> tag at the end of the ADIF string to indicate the end of the QSO record
-    adif += "<EOR>"
-
-    return adif
+    return adif_record(qso)
 
 ## Function to upload QSO to QRZ
-def upload_to_qrz(qso, showstatus):
-    global QRZ_status_label
+# Runs in upload threads: api_key is read in the Tk thread by the caller, the status label is set through root.after
+def upload_to_qrz(qso, showstatus, api_key=None):
     # Prepare POST data
     post_data = {
-        "KEY": station_qrzapi_var.get(),
+        "KEY": api_key if api_key is not None else station_qrzapi_var.get(),
         "ACTION": "INSERT",
         "ADIF": build_adif(qso),
     }
+    callsign = qso.get('CALL', '') or qso.get('Callsign', '')
+    response = None
 
     try:
-        response = requests.post("https://logbook.qrz.com/api", data=post_data)
+        response = requests.post("https://logbook.qrz.com/api", data=post_data, timeout=30)
         if response.status_code == 200:
             if "RESULT=OK" in response.text:
-                callsign = qso.get('CALL', '') or qso.get('Callsign', '')
                 msg = f"✅ QSO {callsign} successfully uploaded to QRZ."
 
                 color = "red"
@@ -3046,15 +3339,20 @@ def upload_to_qrz(qso, showstatus):
         print(msg)
 
     if not showstatus:
-        QRZ_status_label.config(text=msg, fg=color, cursor="hand2" if "successfully uploaded" in msg else "", font=('Arial', 8, 'underline') if "successfully uploaded" in msg else ('Arial', 8))
-        QRZ_status_label.unbind("<Button-1>")
-        if "successfully uploaded" in msg:
-            QRZ_status_label.bind("<Button-1>", lambda e, cs=callsign: open_qrz_link(e, cs))
-
+        root.after(0, show_qrz_upload_status, msg, color, callsign)
 
     return response
 
 
+## Show the result of a QRZ upload, Tk thread only
+def show_qrz_upload_status(msg, color, callsign):
+    uploaded = "successfully uploaded" in msg
+    QRZ_status_label.config(text=msg, fg=color, cursor="hand2" if uploaded else "", font=('Arial', 8, 'underline') if uploaded else ('Arial', 8))
+    QRZ_status_label.unbind("<Button-1>")
+    if uploaded:
+        QRZ_status_label.bind("<Button-1>", lambda e, cs=callsign: open_qrz_link(e, cs))
+
+
 
 #########################################################################################
 # __      _____    _ _____  __  __  _    ___   ___  ___ ___ _  _  ___ 
@@ -3064,108 +3362,200 @@ def upload_to_qrz(qso, showstatus):
 #
 #########################################################################################                                                                     
 
-listener_thread = None
-listening = False
-sock = None
+udp_listener = None
+udp_relay = None
 
 def load_port_from_config(config):
     """Load the port setting from the configuration."""
     return int(config.get('Wsjtx_settings', 'wsjtx_port', fallback="2338"))
 
+def load_endpoints_from_config(config):
+    """
+    The WSJT-X port on 127.0.0.1 plus the extra endpoints from the preferences,
+    e.g. "0.0.0.0:2237; 224.0.0.73:2237@192.168.1.10; n1mm/0.0.0.0:12060".
+    """
+    endpoints = parse_endpoints(f"127.0.0.1:{load_port_from_config(config)}")
+    try:
+        endpoints += parse_endpoints(config.get('Wsjtx_settings', 'udp_endpoints', fallback=''))
+    except ValueError as e:
+        print(f"{e}, extra UDP endpoints ignored.")
+    return endpoints
+
 def start_listener(config):
     """
-    Start WSJT-X ADIF listener.
+    Start the UDP listener on all configured endpoints.
     """
-    global listening, listener_thread, sock
-    if listening:
+    global udp_listener
+    if udp_listener:
         print("Listener already running.")
         return
 
-    listening = True
-    port = load_port_from_config(config)
-    listener_thread = threading.Thread(target=wsjtx_adif_listener, args=(config, port))
-    listener_thread.daemon = True
-    listener_thread.start()
-    print(f"Listener started on port {port}.")
+    global udp_relay
+    decode_annotator.enabled = config.getboolean('Wsjtx_settings', 'highlight_calls', fallback=True)
+
+    # Everything received from WSJT-X is passed on unchanged to these programs
+    try:
+        targets = parse_targets(config.get('Wsjtx_settings', 'relay_targets', fallback=''))
+    except ValueError as e:
+        print(f"{e}, UDP relay disabled.")
+        targets = []
+    udp_relay = UdpRelay(targets) if targets else None
+
+    udp_listener = UdpListener(load_endpoints_from_config(config), {
+        "wsjtx": handle_wsjtx_datagram,
+        "n1mm": handle_n1mm_datagram,
+    })
+    udp_listener.start()
 
 def stop_listener():
     """
-    Stop WSJT-X ADIF listener.
+    Stop the UDP listener.
     """
-    global listening, sock
-    if not listening:
+    global udp_listener
+    if not udp_listener:
         print("Listener not running.")
         return
 
-    listening = False
-    if sock:
-        sock.close()
-        sock = None
+    global udp_relay
+    udp_listener.stop()
+    udp_listener = None
+    if udp_relay:
+        udp_relay.close()
+        udp_relay = None
     print("Listener stopped.")
 
 def restart_listener(config):
     """
-    Restart the WSJT-X listener upon a port change.
+    Restart the UDP listener upon a port change.
     """
     print("Restart listener...")
     stop_listener()
-    time.sleep(1)  # Small pause to make sure everything closes properly
     start_listener(config)
 
-def wsjtx_adif_listener(config, port):
+def handle_wsjtx_datagram(data, addr, endpoint):
+    """
+    WSJT-X / JTDX endpoint: binary messages go to the handler of their type, plain text to handle_adif_datagram().
+    """
+    relay = udp_relay
+    if relay:
+        relay.forward(data)
+
+    message = wsjtx_dispatcher.dispatch(data, addr)
+    if message is not None:
+        endpoint.add(message.name)
+
+def handle_n1mm_datagram(data, addr, endpoint):
     """
-    Listen to and digest WSJT-X ADIF broadcasts.
+    N1MM Logger+ endpoint (Broadcast Data > Contacts): contacts are queued for the logbook,
+    RadioInfo and other packets are only counted.
     """
-    global listening, sock, current_json_file
+    contact = parse_contact_packet(data, band_for_frequency)
+    if contact is None:
+        endpoint.add("other")
+        return
 
-    host = "127.0.0.1"
+    action, entry = contact
+    endpoint.add(action)
+    if not qso_ingest.put(entry, action):
+        print(f"Ingest queue full, N1MM {action} of {entry['Callsign']} dropped.")
+
+
+def show_udp_statistics():
+    """
+    Datagram counters per endpoint and per sending program, refreshed every second.
+    """
+    stats_window = tk.Toplevel(root)
+    stats_window.title("UDP Statistics")
+
+    columns = ("Endpoint", "Source", "Datagrams", "Bytes", "Errors", "Last seen")
+    stats_tree = ttk.Treeview(stats_window, columns=columns, show="headings", height=10)
+    for col in columns:
+        stats_tree.heading(col, text=col)
+        stats_tree.column(col, anchor="center", width=110)
+    stats_tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+    def refresh():
+        if not stats_window.winfo_exists():
+            return
+        stats_tree.delete(*stats_tree.get_children())
+        if udp_listener:
+            for name, endpoint in udp_listener.stats().items():
+                total = endpoint["total"]
+                stats_tree.insert("", "end", values=(name, f"all ({endpoint['protocol']})", total.get("datagrams", 0),
+                                                     total.get("bytes", 0), total.get("errors", 0), ""))
+                for source, counters in endpoint["sources"].items():
+                    last_seen = datetime.fromtimestamp(counters.get("last_seen", 0)).strftime("%H:%M:%S")
+                    stats_tree.insert("", "end", values=("", source, counters.get("datagrams", 0),
+                                                         counters.get("bytes", 0), counters.get("errors", 0), last_seen))
+        if udp_relay:
+            for name, counters in udp_relay.stats().items():
+                stats_tree.insert("", "end", values=("Relay", name, counters.get("sent", 0), counters.get("bytes", 0),
+                                                     f"{counters.get('dropped', 0)} dropped", ""))
+        ingest = qso_ingest.stats
+        stats_tree.insert("", "end", values=("QSO queue", f"{qso_ingest.qsize()} waiting", ingest["queued"],
+                                             f"{ingest['applied']} logged", f"{ingest['dropped']} dropped", ""))
+        stats_window.after(1000, refresh)
+
+    refresh()
+
+
+def handle_adif_datagram(data, addr):
+    """
+    Plain ADIF datagram (WSJT-X secondary UDP server, older programs).
+    """
+    # Decode the ADIF message
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.bind((host, port))
-        print(f"Listen to WSJT-X ADIF broadcasts on {host}:{port}...")
+        adif_record = data.decode("utf-8").strip()
+    except UnicodeDecodeError:
+        adif_record = data.decode("latin-1").strip()
 
-        while listening:
-            try:
-                data, addr = sock.recvfrom(4096)
-                if not data:
-                    continue
+    log_adif_record(adif_record)
 
-                # Decode the ADIF message
-                try:
-                    adif_record = data.decode("utf-8").strip()
-                except UnicodeDecodeError:
-                    adif_record = data.decode("latin-1").strip()
 
-                if not adif_record:
-                    continue
+def handle_logged_adif(message, addr):
+    """
+    Logged ADIF message of the binary protocol, the same record as the plain ADIF broadcast.
+    QSO Logged (type 5) is sent for the same QSO and is not logged a second time.
+    """
+    log_adif_record(message.fields.get("adif", "").strip())
 
-                # Check if it is a valid ADIF message
-                if not is_valid_adif(adif_record):
-                    print("Invalid ADIF datagram. Message is ignored.")
-                    continue
 
-                # Check if a log is open
-                if not current_json_file:
-                    messagebox.showerror(
-                        "Error",
-                        "WSJT-X log data received, but no log loaded!\n"
-                        "Load a log and try again."
-                    )
-                    continue
+def handle_wsjtx_status(message, addr):
+    if DEBUG:
+        fields = message.fields
+        print(f"WSJT-X status {message.id}: {fields.get('dial_frequency', 0) / 1e6:.6f} MHz {fields.get('mode', '')} DX {fields.get('dx_call', '')}")
 
-                # Process the QSO data
-                process_qso(adif_record)
 
-            except socket.error as e:
-                if not listening:
-                    break
-                print(f"Socket-error: {e}")
-    except Exception as e:
-        print(f"Error starting the listener: {e}")
-    finally:
-        if sock:
-            sock.close()
-        print("Listener terminated.")
+def log_adif_record(adif_record):
+    if not adif_record:
+        return
+
+    # Check if it is a valid ADIF message
+    if not is_valid_adif(adif_record):
+        print("Invalid ADIF datagram. Message is ignored.")
+        return
+
+    # Parse and queue, the Tk thread adds it to the logbook (process_ingest_queue)
+    process_qso(adif_record)
+
+
+# All WSJT-X message types are routed through this dispatcher, it also keeps the last Status per client
+wsjtx_dispatcher = WsjtxDispatcher()
+wsjtx_dispatcher.on_text = handle_adif_datagram
+wsjtx_dispatcher.on(LOGGED_ADIF, handle_logged_adif)
+wsjtx_dispatcher.on(STATUS, handle_wsjtx_status)
+
+
+def send_to_wsjtx(data, addr):
+    # Replies go out through the socket that received from addr
+    if udp_listener:
+        udp_listener.send(data, addr)
+
+
+# CQ calls in the decode stream are classified against the logbook and highlighted in WSJT-X
+decode_annotator = DecodeAnnotator(wsjtx_dispatcher, band_for_frequency, send_to_wsjtx)
+wsjtx_dispatcher.on(DECODE, decode_annotator.on_decode)
+wsjtx_dispatcher.on(CLEAR, decode_annotator.on_clear)
 
 
 
@@ -3175,29 +3565,31 @@ def wsjtx_adif_listener(config, port):
 # Function that processes an received WSJTX ADIF record
 def process_qso(adif_record):
     """
-    Process a valid ADIF record and add it to the log.
+    Convert a valid ADIF record into a QSO entry and queue it for the logbook.
+    Runs in the listener thread, so nothing here touches Tk or the logbook.
     """
-    global current_json_file
+    record = next(iter_adif_records(adif_record), {})
+    field = record.get
 
-    callsign = (extract_field(adif_record, "call") or "").upper()
-    name = (extract_field(adif_record, "name") or "")
+    callsign = field("call", "").upper()
+    name = field("name", "")
     time_field = (
-        import_format_time(extract_field(adif_record, "time_off")) or
-        import_format_time(extract_field(adif_record, "time_on")) or
+        import_format_time(field("time_off", "")) or
+        import_format_time(field("time_on", "")) or
         ""
     )
 
-    sig = (extract_field(adif_record, "sig") or "").upper()
-    sig_info = extract_field(adif_record, "sig_info") or ""
+    sig = field("sig", "").upper()
+    sig_info = field("sig_info", "")
 
     qso_entry = {
-        "Date": import_format_date(extract_field(adif_record, "qso_date")) or "",
+        "Date": import_format_date(field("qso_date", "")) or "",
         "Time": time_field,
         "Callsign": callsign,
         "Name": name,
-        "My Callsign": (extract_field(adif_record, "station_callsign") or "").upper(),
-        "My Operator": (extract_field(adif_record, "operator") or "").upper(),
-        "My Locator": (extract_field(adif_record, "station_gridsquare") or "").upper(),
+        "My Callsign": field("station_callsign", "").upper(),
+        "My Operator": field("operator", "").upper(),
+        "My Locator": field("station_gridsquare", "").upper(),
         "My Location": "",
         "My WWFF": "",
         "My POTA": "",
@@ -3206,18 +3598,18 @@ def process_qso(adif_record):
         "My IOTA": "",
         "My SOTA": "",
         "My WLOTA": "",
-        "Country": (extract_field(adif_record, "country") or "").title(),
-        "Continent": (extract_field(adif_record, "cont") or "").upper(),
-        "Sent": (extract_field(adif_record, "rst_sent") or "").upper(),
-        "Received": (extract_field(adif_record, "rst_rcvd") or "").upper(),
-        "Sent Exchange": (extract_field(adif_record, "stx") or ""),
-        "Receive Exchange": (extract_field(adif_record, "srx") or ""),
-        "Mode": (extract_field(adif_record, "mode") or "").upper(),
-        "Submode": (extract_field(adif_record, "submode") or "").upper(),
-        "Band": (extract_field(adif_record, "band") or "").lower(),
-        "Frequency": extract_field(adif_record, "freq") or "",
-        "Locator": (extract_field(adif_record, "gridsquare") or "").upper(),
-        "Comment": extract_field(adif_record, "comment") or "",
+        "Country": field("country", "").title(),
+        "Continent": field("cont", "").upper(),
+        "Sent": field("rst_sent", "").upper(),
+        "Received": field("rst_rcvd", "").upper(),
+        "Sent Exchange": field("stx", ""),
+        "Receive Exchange": field("srx", ""),
+        "Mode": field("mode", "").upper(),
+        "Submode": field("submode", "").upper(),
+        "Band": field("band", "").lower(),
+        "Frequency": field("freq", ""),
+        "Locator": field("gridsquare", "").upper(),
+        "Comment": field("comment", ""),
         "WWFF_POTA": sig,
         "WWFF": sig_info if "WWFF" in sig else "",
         "POTA": sig_info if "POTA" in sig else "",
@@ -3226,61 +3618,139 @@ def process_qso(adif_record):
         "IOTA": sig_info if "IOTA" in sig else "",
         "SOTA": sig_info if "SOTA" in sig else "",
         "WLOTA": sig_info if "WLOTA" in sig else "",
-        "Satellite": extract_field(adif_record, "sat_name") or ""
+        "Satellite": field("sat_name", "")
     }
 
     # Debug: Show the processed QSO input
     if DEBUG:
         print(f"QSO-input processed {qso_entry}")
 
-    # Update the country field based on the callsign
-    check_callsign_prefix(callsign, update_ui=False)  # Disable UI update to prevent excessive updates
-    qso_entry["Country"] = qso_country_var  # Set the updated country
-    
-    # Upload to QRZ after logging the QSO
-    if upload_qrz_var.get():
-        upload_to_qrz(qso_entry,False)    
-    
-    # Add the QSO entry to the logbook
-    add_qso_to_logbook(qso_entry)
+    if not qso_ingest.put(qso_entry):
+        print(f"Ingest queue full, QSO with {callsign} dropped.")
 
 
-           
+# QSOs from the listener wait here until the Tk thread adds them in batches
+qso_ingest = IngestQueue()
 
-# Function to add a Processed WSJTX ADIF record to the current loaded logbook
-def add_qso_to_logbook(qso_entry):
+# N1MM contact ID -> QSO, for the contactreplace / contactdelete of N1MM+
+contact_index = ContactIdIndex()
+
+def process_ingest_queue():
     """
-    Add a QSO entry directly to the loaded logbook and update the logbook window if open.
+    Runs in the Tk thread: add the queued QSOs, one save and one refresh per batch.
+    """
+    batch = qso_ingest.get_batch()
+    if batch:
+        if not current_json_file:
+            qso_ingest.count("no_logbook", len(batch))
+            messagebox.showerror(
+                "Error",
+                f"Log data received over UDP ({len(batch)} QSO(s)), but no log loaded!\n"
+                "Load a log and try again."
+            )
+        else:
+            # A contactinfo of a contact ID already logged (N1MM+ sends again on a network resync) replaces it
+            new_entries, changes = [], []
+            for action, entry, _ in batch:
+                if action == "add" and contact_index.get(entry.get(N1MM_ID_FIELD)) is None:
+                    new_entries.append(entry)
+                else:
+                    changes.append(("replace" if action == "add" else action, entry))
+            add_qsos_to_logbook(new_entries, changes)
+            qso_ingest.applied([received_at for _, _, received_at in batch])
+
+    # Come back right away while a burst is being worked off
+    root.after(10 if qso_ingest.qsize() else INGEST_POLL_MS, process_ingest_queue)
+
+
+# Function to add processed WSJTX ADIF records to the current loaded logbook
+def add_qsos_to_logbook(qso_entries, changes=()):
+    """
+    Add QSO entries to the loaded logbook and update the logbook window if open.
+    QSOs already in the logbook (same call, date and time, e.g. sent again by WSJT-X) are skipped.
+    changes are ("replace" | "delete", entry) pairs of N1MM+, applied through the contact ID index.
     """
-    global qso_lines
 
     try:
-        # Add to cache
-        qso_lines.append(qso_entry)
+        index = LogbookIndex(qso_lines)
+        new_entries = []
 
-        # Write cache to disk
+        def add_entries(entries):
+            for qso_entry in entries:
+                if qso_key(qso_entry) in index:
+                    qso_ingest.count("duplicates")
+                    continue
+                index.add(qso_entry)
+
+                # Update the country field based on the callsign
+                set_country_from_callsign(qso_entry)
+                new_entries.append(qso_entry)
+                if qso_entry.get(N1MM_ID_FIELD):
+                    contact_index.add(qso_entry)
+
+        add_entries(qso_entries)
+        qso_lines.extend(new_entries)
+
+        changed = 0
+        if changes:
+            result = apply_contact_changes(qso_lines, contact_index, changes)
+            for qso_entry in result["changed"]:
+                set_country_from_callsign(qso_entry)
+            qso_ingest.count("replaced", result["replaced"])
+            qso_ingest.count("deleted", result["deleted"])
+            qso_ingest.count("unknown", result["unknown"])
+            changed = result["replaced"] + result["deleted"]
+            if result["unknown"]:
+                print(f"N1MM delete of {result['unknown']} unknown contact(s) ignored.")
+
+            # Replace of a contact that was never received (MiniBook started later), add it
+            added = len(new_entries)
+            add_entries(result["missing"])
+            qso_lines.extend(new_entries[added:])
+
+        if not new_entries and not changed:
+            return
+
+        # Write cache to disk, once for the whole batch
         save_to_json()
 
+        if not new_entries:
+            update_worked_before_tree()
+            for window in root.winfo_children():
+                if isinstance(window, tk.Toplevel) and hasattr(window, 'update_logbook'):
+                    window.update_logbook()
+            return
+
         # Update "Worked Before" tree
         update_worked_before_tree()
 
         # Update the last QSO label
+        qso_entry = new_entries[-1]
+        try:
+            frequency = f"{float(qso_entry['Frequency']):.3f}MHz"
+        except ValueError:
+            frequency = qso_entry['Band']
         last_qso_label.config(
             text=f"Last QSO with {qso_entry['Callsign']} at {qso_entry['Time']} "
-                 f"on {float(qso_entry['Frequency']):.3f}MHz in {qso_entry['Mode']}"
+                 f"on {frequency} in {qso_entry['Mode']}"
         )
 
-        # Update logbook window if open (via main thread)
+        # Update logbook window if open
         for window in root.winfo_children():
             if isinstance(window, tk.Toplevel) and hasattr(window, 'update_logbook'):
-                root.after(0, window.update_logbook)
+                window.update_logbook()
+
+        # Upload to QRZ in the background, never holds up logging
+        if upload_qrz_var.get():
+            api_key = station_qrzapi_var.get()
+            threading.Thread(target=lambda: [upload_to_qrz(q, False, api_key) for q in new_entries], daemon=True).start()
 
         # Show success message
-        show_auto_close_messagebox(
-            "MiniBook",
-            f"Success!\n\nQSO with {qso_entry['Callsign']} at {qso_entry['Time']}\nsuccessfully added!",
-            duration=3000
-        )
+        if len(new_entries) == 1:
+            message = f"Success!\n\nQSO with {qso_entry['Callsign']} at {qso_entry['Time']}\nsuccessfully added!"
+        else:
+            message = f"Success!\n\n{len(new_entries)} QSOs successfully added!"
+        show_auto_close_messagebox("MiniBook", message, duration=3000)
 
         # --------------------------------------
         # New: send spot to DXCluster
@@ -3352,37 +3822,75 @@ def show_auto_close_messagebox(title, message, duration=2000):
 def is_valid_adif(adif_record):
     """
     Validate if the ADIF record is a valid datagram.
-    Checks for the presence of key tags and general structure.
+    The record must be closed with <EOR> and carry the minimal QSO fields.
     """
-    # Required tags for a minimal valid ADIF record
-    required_tags = ["<call:", "<qso_date:", "<band:", "<mode:"]
+    for record, _ in scan_adif(adif_record, final=False):
+        return is_valid_adif_record(record)
+    return False
 
-    # Check for the presence of required tags
-    for tag in required_tags:
-        if not re.search(re.escape(tag), adif_record, re.IGNORECASE):
-            return False
 
-    # Ensure either <time_on> or <time_off> is present
-    if not (re.search(r"<time_on:", adif_record, re.IGNORECASE) or re.search(r"<time_off:", adif_record, re.IGNORECASE)):
-        return False
 
-    # Check for <EOR> or <eor> to mark the end of the record
-    if not re.search(r"<eor>", adif_record, re.IGNORECASE):
-        return False
+#########################################################################################
+#    _   ___ ___ ___  __      ___ _____ ___ _  _ 
+#   /_\ |   \_ _| __| \ \    / /_\_   _/ __| || |
+#  / _ \| |) | || _|   \ \/\/ / _ \| || (__| __ |
+# /_/ \_\___/___|_|     \_/\_/_/ \_\_| \___|_||_|
+#
+#########################################################################################
+
+adif_watcher = None
 
-    return True
+def start_adif_watcher(config):
+    """
+    Start watching the ADIF files / folders from the preferences, other programs log to these.
+    """
+    global adif_watcher
+    stop_adif_watcher()
 
+    if not config.getboolean('Watch_settings', 'watch_enabled', fallback=False):
+        return
+    paths = [p.strip() for p in config.get('Watch_settings', 'watch_paths', fallback='').split(';') if p.strip()]
+    if not paths:
+        return
 
-def extract_adif_field(record, field_name):
+    interval = config.getint('Watch_settings', 'watch_interval', fallback=5)
+    adif_watcher = AdifWatcher(paths, WATCH_OFFSETS_FILE, interval)
+    adif_watcher.start()
+    root.after(1000, process_watch_queue, adif_watcher)
+    print(f"Watching ADIF: {', '.join(paths)}")
+
+def stop_adif_watcher():
+    global adif_watcher
+    if adif_watcher:
+        adif_watcher.stop()
+        adif_watcher = None
+
+def process_watch_queue(watcher):
     """
-    Extract a field's value from the ADIF record in the format <FIELD_NAME:length>value.
+    Runs in the Tk thread: add the QSOs found by the watcher, one save and one refresh per poll.
+    Without a loaded logbook the batches wait in the queue.
     """
-    # Search for the field in a case-insensitive manner with an optional length attribute
-    pattern = rf"<{field_name}:(\d+)>([^<]*)"
-    match = re.search(pattern, record, re.IGNORECASE)
-    if match:
-        return match.group(2).strip()  # Extract the value and remove any surrounding whitespace
-    return ""  # Return an empty string if the field is not found
+    if watcher is not adif_watcher:
+        return  # Watcher was stopped or replaced
+
+    if current_json_file:
+        entries = []
+        offsets = None
+        while True:
+            try:
+                batch, offsets = watcher.queue.get_nowait()
+            except queue.Empty:
+                break
+            entries.extend(batch)
+
+        if offsets is not None:
+            # Same path as the QSOs logged over UDP: duplicates skipped, country, QRZ upload, one save.
+            # Offsets are stored once the QSOs are saved
+            if entries:
+                add_qsos_to_logbook(entries)
+            watcher.save_offsets(offsets)
+
+    root.after(1000, process_watch_queue, watcher)
 
 
 
@@ -4151,9 +4659,9 @@ def open_preferences():
     Preference_Window.resizable(False, False)
 
     if platform.system() == "Darwin":
-        Preference_Window.geometry("350x490")
+        Preference_Window.geometry("350x695")
     else:
-        Preference_Window.geometry("350x490")
+        Preference_Window.geometry("350x695")
 
     Preference_Window.transient(root)
     Preference_Window.grab_set()
@@ -4218,6 +4726,20 @@ def open_preferences():
     wsjtx_port_entry = tk.Entry(lf_wsjtx, textvariable=wsjtx_port_var, width=10)
     wsjtx_port_entry.grid(row=0, column=1, sticky="w", pady=2)
 
+    highlight_calls_var = tk.BooleanVar(value=config.getboolean('Wsjtx_settings', 'highlight_calls', fallback=True))
+    tk.Label(lf_wsjtx, text="Highlight worked before:").grid(row=1, column=0, sticky="e", pady=2)
+    tk.Checkbutton(lf_wsjtx, variable=highlight_calls_var).grid(row=1, column=1, sticky="w", pady=2)
+
+    # Extra endpoints for JTDX, JS8Call or another machine, host:port separated by ";"
+    udp_endpoints_var = tk.StringVar(value=config.get('Wsjtx_settings', 'udp_endpoints', fallback=''))
+    tk.Label(lf_wsjtx, text="More endpoints:").grid(row=2, column=0, sticky="e", pady=2)
+    tk.Entry(lf_wsjtx, textvariable=udp_endpoints_var, width=30).grid(row=2, column=1, sticky="w", pady=2)
+
+    # Forward everything received to e.g. GridTracker, host:port separated by ";"
+    relay_targets_var = tk.StringVar(value=config.get('Wsjtx_settings', 'relay_targets', fallback=''))
+    tk.Label(lf_wsjtx, text="Relay to:").grid(row=3, column=0, sticky="e", pady=2)
+    tk.Entry(lf_wsjtx, textvariable=relay_targets_var, width=30).grid(row=3, column=1, sticky="w", pady=2)
+
     # === LabelFrame 5: QRZ Lookup Settings ===
     lf_qrz = tk.LabelFrame(Preference_Window, text="QRZ Lookup Settings", font=('Arial', 10, 'bold'))
     lf_qrz.grid(row=4, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
@@ -4238,6 +4760,11 @@ def open_preferences():
     qrz_username_entry.grid(row=1, column=1, sticky="w", pady=2)
     qrz_password_entry.grid(row=2, column=1, sticky="w", pady=2, padx=(0, 100))
 
+    # Days a cached lookup is used before it is refreshed from QRZ
+    qrz_cache_days_var = tk.StringVar(value=config.get("QRZ", "cache_days", fallback=str(CACHE_DAYS)))
+    tk.Label(lf_qrz, text="Cache days:").grid(row=3, column=0, sticky="e", pady=2)
+    tk.Entry(lf_qrz, textvariable=qrz_cache_days_var, width=6).grid(row=3, column=1, sticky="w", pady=2)
+
     def toggle_password_visibility():
         if qrz_password_entry.cget('show') == '*':
             qrz_password_entry.config(show='')
@@ -4272,6 +4799,24 @@ def open_preferences():
 
     tk.Button(lf_backup, text="Browse", command=choose_backup_folder).grid(row=0, column=0, sticky="e", pady=2, padx=(0,5))
 
+    # === LabelFrame 7: ADIF Watch ===
+    lf_watch = tk.LabelFrame(Preference_Window, text="Watch ADIF files / folders", font=('Arial', 10, 'bold'))
+    lf_watch.grid(row=6, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+
+    watch_enabled_var = tk.BooleanVar(value=config.getboolean("Watch_settings", "watch_enabled", fallback=False))
+    watch_paths_var = tk.StringVar(value=config.get("Watch_settings", "watch_paths", fallback=""))
+
+    tk.Checkbutton(lf_watch, text="Add new QSOs from these logs (separate with ;)", variable=watch_enabled_var).grid(row=0, column=0, columnspan=2, sticky="w")
+    tk.Entry(lf_watch, textvariable=watch_paths_var, width=40).grid(row=1, column=1, sticky="w", pady=2)
+
+    def add_watch_folder():
+        folder = filedialog.askdirectory(title="Select folder to watch")
+        if folder:
+            paths = [p for p in watch_paths_var.get().split(";") if p.strip()]
+            watch_paths_var.set(";".join(paths + [folder]))
+
+    tk.Button(lf_watch, text="Add", command=add_watch_folder).grid(row=1, column=0, sticky="e", pady=2, padx=(0,5))
+
     def is_valid_ip(ip):
         try:
             ipaddress.ip_address(ip)
@@ -4290,9 +4835,18 @@ def open_preferences():
         if not is_valid_port(wsjtx_port_var.get()):
             messagebox.showerror("Error", f"{wsjtx_port_var.get()} is an invalid port.")
             return
+        try:
+            parse_endpoints(udp_endpoints_var.get())
+            parse_targets(relay_targets_var.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
         if not is_valid_ip(hamlib_ip_var.get()):
             messagebox.showerror("Error", f"{hamlib_ip_var.get()} is an invalid IP address.")
             return
+        if not qrz_cache_days_var.get().strip().isdigit():
+            messagebox.showerror("Error", f"{qrz_cache_days_var.get()} is an invalid number of cache days.")
+            return
         save_preferences()
 
     def close_window():
@@ -4310,6 +4864,9 @@ def open_preferences():
         config['hamlib_settings']['hamlib_port'] = hamlib_port_var.get()
         config['hamlib_settings']['hamlib_ip'] = hamlib_ip_var.get()
         config["Wsjtx_settings"]['wsjtx_port'] = str(wsjtx_port_var.get())
+        config["Wsjtx_settings"]['highlight_calls'] = str(highlight_calls_var.get())
+        config["Wsjtx_settings"]['udp_endpoints'] = udp_endpoints_var.get().strip()
+        config["Wsjtx_settings"]['relay_targets'] = relay_targets_var.get().strip()
 
         if 'QRZ' not in config:
             config.add_section('QRZ')
@@ -4318,16 +4875,25 @@ def open_preferences():
         if qrz_password_var.get().strip():
             config['QRZ']['password'] = qrz_password_var.get().strip()
         config['QRZ']['use_qrz_lookup'] = str(use_qrz_lookup_var.get())
+        config['QRZ']['cache_days'] = qrz_cache_days_var.get().strip()
+        if qrz_cache:
+            qrz_cache.set_ttl(int(qrz_cache_days_var.get()))
 
         if backup_folder_var.get().strip():
             config['General']['backup_folder'] = backup_folder_var.get().strip()
 
+        if 'Watch_settings' not in config:
+            config.add_section('Watch_settings')
+        config['Watch_settings']['watch_enabled'] = str(watch_enabled_var.get())
+        config['Watch_settings']['watch_paths'] = watch_paths_var.get().strip()
+
         with open(CONFIG_FILE, 'w') as configfile:
             config.write(configfile)
 
         update_datetime()
         disconnect_from_hamlib()
         restart_listener(config)
+        start_adif_watcher(config)
         close_window()
 
     def cancel_preferences():
@@ -4412,6 +4978,18 @@ def load_config():
         config['QRZ']['password'] = ''
     if 'use_qrz_lookup' not in config['QRZ']:
         config['QRZ']['use_qrz_lookup'] = 'False'
+    if 'cache_days' not in config['QRZ']:
+        config['QRZ']['cache_days'] = str(CACHE_DAYS)
+
+    # ------------------ Watch_settings ------------------
+    if 'Watch_settings' not in config:
+        config.add_section('Watch_settings')
+    if 'watch_enabled' not in config['Watch_settings']:
+        config['Watch_settings']['watch_enabled'] = 'False'
+    if 'watch_paths' not in config['Watch_settings']:
+        config['Watch_settings']['watch_paths'] = ''
+    if 'watch_interval' not in config['Watch_settings']:
+        config['Watch_settings']['watch_interval'] = '5'
 
     # ------------------ Save changes ------------------
     with open(file_path, 'w') as configfile:
@@ -4557,23 +5135,8 @@ def extract_core(callsign):
     return callsign
 
 
-def get_session_key(username, password):
-    encoded_username = urllib.parse.quote(username)
-    encoded_password = urllib.parse.quote(password)
-    url = f"https://xmldata.qrz.com/xml/current/?username={encoded_username}&password={encoded_password}"
-
-    try:
-        response = requests.get(url, timeout=5)
-        root_xml = ET.fromstring(response.content)
-        ns = {"qrz": "http://xmldata.qrz.com"}
-
-        key = root_xml.findtext(".//qrz:Key", namespaces=ns)
-        error = root_xml.findtext(".//qrz:Error", namespaces=ns)
-        return key, error
-
-    except requests.exceptions.RequestException as e:
-        print("QRZ login failed:", e)
-        return None, "❌ Connection QRZ XML Failed"
+# One QRZ XML connection and session key for all lookups
+qrz_session = QrzXmlSession()
 
 
 def open_qrz_link(event, callsign):
@@ -4581,36 +5144,36 @@ def open_qrz_link(event, callsign):
     webbrowser.open_new_tab(url)
 
 
-def query_callsign(session_key, callsign):
-    import re
+def query_callsign(username, password, callsign):
+    """
+    Look up a callsign at QRZ, returns (data, error). Runs in a worker thread, no Tk here.
+    (None, None) means QRZ does not know the call, neither the call nor its core (PA/DL1ABC/P -> DL1ABC).
+    When only the core is found, data holds its name and "fallback" is set.
+    """
     ns = {"qrz": "http://xmldata.qrz.com"}
 
     def do_query(cs):
         print(f"[DEBUG] Querying QRZ for callsign: {cs}")
-        url = f"https://xmldata.qrz.com/xml/current/?s={session_key}&callsign={cs}"
-        try:
-            response = requests.get(url, timeout=5)
-            root = ET.fromstring(response.content)
-            return root.find(".//qrz:Callsign", ns)
-        except Exception as e:
-            print(f"Error fetching QRZ XML for {cs}:", e)
-            return None
+        element, error = qrz_session.lookup(username, password, cs)
+        if element is None and error and not error.startswith("Not found"):
+            print(f"QRZ XML for {cs}: {error}")
+            return None, error
+        return element, None
 
     # Stap 1: probeer originele callsign
-    callsign_element = do_query(callsign)
-
-    fallback_name = ""
+    callsign_element, error = do_query(callsign)
+    if error:
+        return None, error
 
     if callsign_element is None:
         base = extract_core(callsign)
         if base != callsign:
-            fallback_element = do_query(base)
+            fallback_element, error = do_query(base)
+            if error:
+                return None, error
             if fallback_element is not None:
                 # Gebruik alleen de naam uit fallback-element
                 full_name = f"{fallback_element.findtext('qrz:fname', '', ns)} {fallback_element.findtext('qrz:name', '', ns)}".strip()
-                QRZ_status_label.config(text=f"ℹ️ Fallback QRZ lookup: name from {base}", fg="red", font=('Arial', 8, 'italic'))
-                QRZ_status_label.unbind("<Button-1>")
-
                 return {
                     "callsign": base,
                     "name": full_name,
@@ -4627,29 +5190,19 @@ def query_callsign(session_key, callsign):
                     "lat": "",
                     "lon": "",
                     "mapslink": "",
-                }
-
+                    "fallback": True,
+                }, None
 
         # Fallback werkte ook niet
-        clear_qrz_fields()
-        QRZ_status_label.config(text="⚠️ No Callsign found in QRZ XML.", fg="red")
-        return None
-
+        return None, None
 
     found_call = callsign_element.findtext("qrz:call", default="Unknown", namespaces=ns)
 
-    QRZ_status_label.config(text=f"🔍 Found {found_call} in QRZ lookup.", fg="blue", cursor="hand2", font=('Arial', 8, 'underline'))
-    QRZ_status_label.unbind("<Button-1>")
-    QRZ_status_label.bind("<Button-1>", lambda e, cs=found_call: open_qrz_link(e, cs))
-
     lat = callsign_element.findtext("qrz:lat", default="", namespaces=ns)
     lon = callsign_element.findtext("qrz:lon", default="", namespaces=ns)
     maps_link = f"https://www.google.com/maps?q={lat},{lon}" if lat and lon else ""
 
-    # Als we een fallback naam hebben, gebruik die (alleen voor naamveld)
     full_name = f"{callsign_element.findtext('qrz:fname', '', ns)} {callsign_element.findtext('qrz:name', '', ns)}".strip()
-    if not full_name and fallback_name:
-        full_name = fallback_name
 
     return {
         "callsign": found_call,
@@ -4667,7 +5220,51 @@ def query_callsign(session_key, callsign):
         "lat": lat,
         "lon": lon,
         "mapslink": maps_link,
-    }
+    }, None
+
+
+# Lookups already done, on disk, so a known call shows up at once (also offline)
+qrz_cache = None
+qrz_cache_lock = threading.Lock()
+
+def get_qrz_cache():
+    global qrz_cache
+    with qrz_cache_lock:
+        if qrz_cache is None:
+            try:
+                DATA_FOLDER.mkdir(parents=True, exist_ok=True)
+                qrz_cache = LookupCache(QRZ_CACHE_FILE, config.getint("QRZ", "cache_days", fallback=CACHE_DAYS))
+            except Exception as e:
+                print(f"QRZ lookup cache not available: {e}")
+        return qrz_cache
+
+def show_qrz_result(callsign, data, cached=False):
+    """
+    Fill the QRZ fields with a lookup result (None = not found). Tk thread only.
+    """
+    if qso_callsign_var.get().strip().upper() != callsign:
+        return  # Another callsign was entered in the meantime
+
+    note = " (cached)" if cached else ""
+    if data is None:
+        clear_qrz_fields()
+        QRZ_status_label.config(text=f"⚠️ No Callsign found in QRZ XML.{note}", fg="red")
+        return
+
+    QRZ_status_label.unbind("<Button-1>")
+    if data.get("fallback"):
+        QRZ_status_label.config(text=f"ℹ️ Fallback QRZ lookup: name from {data['callsign']}{note}", fg="red", cursor="", font=('Arial', 8, 'italic'))
+    else:
+        found_call = data.get("callsign", "")
+        QRZ_status_label.config(text=f"🔍 Found {found_call} in QRZ lookup.{note}", fg="blue", cursor="hand2", font=('Arial', 8, 'underline'))
+        QRZ_status_label.bind("<Button-1>", lambda e, cs=found_call: open_qrz_link(e, cs))
+
+    qso_locator_var.set(data.get("grid", ""))
+    qso_name_var.set(data.get("name", ""))
+    qrz_city_var.set(data.get("city", ""))
+    qrz_address_var.set(data.get("address", ""))
+    qrz_zipcode_var.set(data.get("zipcode", ""))
+    qrz_qsl_info_var.set(data.get("qslmgr", ""))
 
 def threaded_on_query():
     threading.Thread(target=on_query_thread, daemon=True).start()
@@ -4679,7 +5276,7 @@ def on_query_thread():
 
     username = config.get("QRZ", "username", fallback="").strip()
     password = config.get("QRZ", "password", fallback="").strip()
-    callsign = qso_callsign_var.get().strip()
+    callsign = qso_callsign_var.get().strip().upper()
 
     if not username or not password:
         root.after(0, lambda: messagebox.showwarning("Missing Credentials", "QRZ username/password not found in config.ini"))
@@ -4688,9 +5285,21 @@ def on_query_thread():
     if not callsign:
         return
 
-    session_key, error = get_session_key(username, password)
+    # Known call: shown at once, QRZ is only asked again when the cached result is stale
+    cache = get_qrz_cache()
+    cached = cache.get(callsign) if cache else None
+    if cached:
+        root.after(0, lambda: show_qrz_result(callsign, cached.data, cached=True))
+        if not cached.stale:
+            return
+
+    # Only logs in on the first lookup, or when the credentials changed
+    session_key, error = qrz_session.login(username, password)
 
     if not session_key:
+        if cached:
+            print(f"QRZ refresh of {callsign} failed, cached result kept: {error}")
+            return
         if error:
             def show_error():
                 QRZ_status_label.config(text=error, fg="red")
@@ -4703,19 +5312,19 @@ def on_query_thread():
             root.after(0, show_error)
         return
 
-    data = query_callsign(session_key, callsign)
-    if data is None:
-        return  # already handled
+    data, error = query_callsign(username, password, callsign)
+    if error:
+        # Offline or QRZ trouble: a stale result stays on screen, it is better than nothing
+        if not cached:
+            root.after(0, lambda: QRZ_status_label.config(text=error, fg="red"))
+        return
 
-    def update_gui():
-        qso_locator_var.set(data.get("grid", ""))
-        qso_name_var.set(data.get("name", ""))
-        qrz_city_var.set(data.get("city", ""))
-        qrz_address_var.set(data.get("address", ""))
-        qrz_zipcode_var.set(data.get("zipcode", ""))
-        qrz_qsl_info_var.set(data.get("qslmgr", ""))
+    if cache:
+        cache.put(callsign, data)
+    if cached and cached.data == data:
+        return
 
-    root.after(0, update_gui)
+    root.after(0, lambda: show_qrz_result(callsign, data))
 
 def clear_qrz_fields():
     qso_locator_var.set("")
@@ -4822,6 +5431,8 @@ def init():
     no_file_loaded() # Checks if no logbook is loaded
     update_frequency_from_band() # Update Band to Frequency on Startup
     start_listener(config)
+    root.after(INGEST_POLL_MS, process_ingest_queue)
+    start_adif_watcher(config)
     gui_state_control(12) # Shows disconnected Hamlib status
     update_datetime()
     utc_offset_var.set(config.get('Global_settings', 'utc_offset', fallback='0'))
@@ -5688,7 +6299,7 @@ def auto_fill_bota_prefix(bota_var, bota_name_var, bota_lat_var, bota_long_var,
 
 # Function to check if cty.day file exists in root folder
 def ctydat_check():
-    global dxcc_data
+    global dxcc_data, dxcc_resolver
     try:
         if not os.path.exists(DXCC_FILE):
             messagebox.showinfo("File Not Found", "The file cty.dat was not found. It will now be downloaded.")
@@ -5698,8 +6309,9 @@ def ctydat_check():
         messagebox.showerror("Error", f"Error loading data: {e}")
         return {}
     
-    # load and parse cty.dat into dxcc_data with cty_parser.py
-    dxcc_data = parse_cty_file(DXCC_FILE)
+    # load and parse cty.dat once, dxcc_data are the cty_parser.py entries the resolver was built from
+    dxcc_resolver = load_resolver(DXCC_FILE)
+    dxcc_data = dxcc_resolver.entries
 
 
 
@@ -5733,15 +6345,25 @@ continent_map = {
 }
 
 def find_coordinates_by_callsign(callsign):
-    callsign = callsign.strip().upper()
-    for entry in dxcc_data:
-        for raw_prefix in entry.prefixes:
-            prefix = re.sub(r'[=;()\[\]*]', '', raw_prefix).strip().upper()
-            if callsign.startswith(prefix):
-                return entry.latitude, entry.longitude
+    entity = dxcc_resolver.resolve(callsign)
+    if entity:
+        return entity.latitude, entity.longitude
     return None, None
 
 
+def set_country_from_callsign(qso_entry):
+    """
+    Country and Continent of a QSO entry from its callsign. Safe from any thread, the
+    country of the callsign being typed in the main window is not touched.
+    """
+    entity = dxcc_resolver.resolve(qso_entry.get("Callsign", ""))
+    if entity:
+        qso_entry["Country"] = entity.name
+        qso_entry["Continent"] = entity.continent
+    else:
+        qso_entry["Country"] = "[None]"
+
+
 
 
 def haversine(lat1, lon1, lat2, lon2):
@@ -5757,26 +6379,16 @@ def haversine(lat1, lon1, lat2, lon2):
     return R * c
 
 def check_callsign_prefix(callsign, update_ui=True, skip_locator=False):
-    global dxcc_data
+    global qso_country_var, qso_continent_var
 
-    callsign = callsign.strip().upper()
-    best_match = None
-    best_prefix_len = 0
-
-    for entry in dxcc_data:
-        for raw_prefix in entry.prefixes:
-            prefix = re.sub(r'[=;()\[\]*]', '', raw_prefix).strip().upper()
-            if callsign.startswith(prefix) and len(prefix) > best_prefix_len:
-                best_match = entry
-                best_prefix_len = len(prefix)
+    best_match = dxcc_resolver.resolve(callsign)
 
     if best_match:
-        global qso_country_var, qso_continent_var
         continent = best_match.continent
         continent_name = continent_map.get(continent, "Unknown")
         qso_continent_var = continent
         qso_country_var = best_match.name
-        entityCode = prefix
+        entityCode = best_match.prefix
         itu = str(best_match.itu_zone)
         cq = str(best_match.cq_zone)
         lat = best_match.latitude
@@ -5897,7 +6509,6 @@ def normalize_callsign(call):
     return call.upper().split('/')[0]  # Remove any suffix like /P, /M, /QRP, etc.
 
 def update_worked_before_tree(*args):
-    global qso_lines
 
     entered_call = qso_callsign_var.get().strip().upper()
     if not entered_call:
@@ -6251,6 +6862,7 @@ view_menu = tk.Menu(menu_bar, tearoff=0)
 view_menu.add_command(label="Logbook", command=view_logbook)
 
 view_menu.add_command(label="DX Cluster Viewer", command=open_dxspotviewer)
+view_menu.add_command(label="UDP Statistics", command=show_udp_statistics)
 
 menu_bar.add_cascade(label="Window", menu=view_menu)
 
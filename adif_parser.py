@@ -0,0 +1,403 @@
+#**********************************************************************************************************************************
+# File          :   adif_parser.py
+# Project       :   ADIF parsing tool
+# Description   :   Single pass, length driven ADIF tokenizer shared by ADIF import and WSJT-X UDP logging
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#                           - Chunked file streaming with UTF-8 / Latin-1 fallback
+#                           - Multi-process parsing for large files
+#                           - QSL / LoTW / eQSL received status and dates
+#**********************************************************************************************************************************
+
+import codecs
+import multiprocessing
+import os
+import re
+import sys
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from operator import ge
+
+# Bytes read from disk per step when streaming an ADIF file
+ADIF_CHUNK_SIZE = 1024 * 1024
+
+# Files from this size on are parsed in a process pool, in chunks of ADIF_PARALLEL_CHUNK_SIZE
+ADIF_PARALLEL_MIN_SIZE = 16 * 1024 * 1024
+ADIF_PARALLEL_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Number of normalized QSOs handed to the caller at once
+ADIF_QSO_BATCH_SIZE = 1000
+
+# <NAME>, <NAME:length> or <NAME:length:type>
+ADIF_TAG_RE = re.compile(r"<([A-Za-z0-9_]+)(?::(\d+))?(?::[A-Za-z])?>")
+
+# <NAME:length> followed by everything up to the next '<', used for the fast path
+ADIF_FIELD_RE = re.compile(r"<([A-Za-z0-9_]+):(\d+)(?::[A-Za-z])?>([^<]*)")
+ADIF_EOR_RE = re.compile(r"<eor>", re.IGNORECASE)
+
+
+def scan_adif_record(text, pos=0, final=True):
+    """
+    Parse one record starting at pos, strictly by the <TAG:len> lengths.
+    Returns (fields, end_pos), or (None, record_start) when the record is not complete.
+    Header fields (before <EOH>) are dropped.
+    """
+    search = ADIF_TAG_RE.search
+    text_len = len(text)
+    record_start = pos
+    fields = {}
+
+    while True:
+        match = search(text, pos)
+        if not match:
+            break
+
+        name = match.group(1).lower()
+        length = match.group(2)
+
+        if length is None:
+            pos = match.end()
+            if name == "eor":
+                if fields:
+                    return fields, pos
+                record_start = pos
+            elif name == "eoh":
+                fields = {}
+                record_start = pos
+            continue
+
+        start = match.end()
+        end = start + int(length)
+        if end > text_len and not final:
+            break  # Value continues beyond the end of this buffer
+        fields[name] = text[start:end].strip()
+        pos = end
+
+    # Trailing record without <EOR>
+    if final and fields:
+        return fields, text_len
+    return None, record_start
+
+
+def scan_adif(text, pos=0, final=True):
+    """
+    Walk the ADIF text once, starting at pos, and yield (fields, end_pos) per record.
+    fields is a dict with lower case field names, end_pos the offset right after the record.
+    Values are taken by their <TAG:len> length, so a value containing '<' survives.
+    When final is False the scan stops at the first incomplete record, so the caller can
+    append more text and resume from the last end_pos.
+    """
+    findall = ADIF_FIELD_RE.findall
+    eor_search = ADIF_EOR_RE.search
+
+    # The first record may follow a header, parse it strictly
+    fields, pos = scan_adif_record(text, pos, final)
+    if fields is None:
+        return
+    yield fields, pos
+
+    while True:
+        match = eor_search(text, pos)
+        if match:
+            chunk = text[pos:match.start()]
+            tags = findall(chunk)
+            # Every '<' opens a field and no value is shorter than its length,
+            # so no value contains '<' and the plain matches are exact
+            if tags and chunk.count("<") == len(tags):
+                names, lengths, values = zip(*tags)
+                lengths = list(map(int, lengths))
+                if all(map(ge, map(len, values), lengths)):
+                    pos = match.end()
+                    # Text after the declared length (junk before the next tag) is not part of the value
+                    values = [value[:length].strip() for value, length in zip(values, lengths)]
+                    yield dict(zip(map(str.lower, names), values)), pos
+                    continue
+
+        fields, pos = scan_adif_record(text, pos, final)
+        if fields is None:
+            return
+        yield fields, pos
+
+
+def iter_adif_records(text):
+    """
+    Yield a field dict per ADIF record in text.
+    """
+    for fields, _ in scan_adif(text):
+        yield fields
+
+
+def is_valid_adif_record(fields):
+    """
+    Check if a parsed record carries the minimal fields needed to log a QSO.
+    """
+    for tag in ("call", "qso_date", "band", "mode"):
+        if tag not in fields:
+            return False
+    return "time_on" in fields or "time_off" in fields
+
+
+def iter_adif_file(path, chunk_size=ADIF_CHUNK_SIZE):
+    """
+    Stream an ADIF file from disk and yield (fields, bytes_read) per record.
+    Only one chunk plus the unfinished tail record is kept in memory.
+    The file is decoded as UTF-8; from the first invalid byte on decoding continues as Latin-1,
+    the bytes before it (also those earlier in the same chunk) stay decoded as UTF-8.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    bytes_read = 0
+
+    with open(path, "rb") as f:
+        while True:
+            raw = f.read(chunk_size)
+            bytes_read += len(raw)
+            final = not raw
+
+            pending = decoder.getstate()[0]
+            try:
+                buffer += decoder.decode(raw, final)
+            except UnicodeDecodeError:
+                # Only the bytes from the invalid one on are Latin-1
+                data = pending + raw
+                try:
+                    data.decode("utf-8")
+                    bad = len(data)
+                except UnicodeDecodeError as e:
+                    bad = e.start
+                buffer += data[:bad].decode("utf-8")
+                decoder = codecs.getincrementaldecoder("latin-1")()
+                buffer += decoder.decode(data[bad:], final)
+
+            pos = 0
+            for fields, pos in scan_adif(buffer, 0, final):
+                yield fields, bytes_read
+            buffer = buffer[pos:]
+
+            if final:
+                break
+
+
+def import_format_date(date_str):
+    # Convert date from ADIF format (yyyymmdd) to yyyy-mm-dd
+    if date_str and len(date_str) == 8:
+        return datetime.strptime(date_str, "%Y%m%d").strftime("%Y-%m-%d")
+    return None
+
+def import_format_time(time_str):
+    # Convert time from ADIF format (HHMMSS) to HH:MM:SS
+    if time_str and len(time_str) >= 4:
+        if len(time_str) < 6:
+            time_str = time_str[:4] + "00"  # HHMM, without this strptime reads 1002 as 10:00:02
+        try:
+            return datetime.strptime(time_str[:6], "%H%M%S").strftime("%H:%M:%S")
+        except ValueError:
+            pass  # Ignore formatting if time is invalid
+    return None
+
+
+# QSL confirmation ADIF tag and logbook entry key, only stored when the record has them
+QSL_FIELDS = (
+    ("qsl_rcvd",        "QSL Rcvd"),
+    ("qslrdate",        "QSL Rcvd Date"),
+    ("lotw_qsl_rcvd",   "LoTW Rcvd"),
+    ("lotw_qslrdate",   "LoTW Rcvd Date"),
+    ("eqsl_qsl_rcvd",   "eQSL Rcvd"),
+    ("eqsl_qslrdate",   "eQSL Rcvd Date"),
+)
+
+
+def adif_to_qso(record):
+    """
+    Convert a parsed ADIF record into a MiniBook logbook entry.
+    Returns None when the record has no callsign.
+    """
+    field = record.get
+    callsign = field("call", "").upper()
+    if not callsign:
+        return None
+
+    entry = {
+        "Date": import_format_date(field("qso_date", "")) or "",
+        "Time": import_format_time(field("time_on", "")) or "",
+        "Callsign": callsign,
+        "Name": field("name", ""),
+        "My Callsign": field("station_callsign", "").upper(),
+        "My Operator": field("operator", "").upper(),
+        "My Locator": "",
+        "My Location": "",
+        "My WWFF": (field("my_wwff_ref") or field("station_wwff_ref", "")).upper(),
+        "My POTA": (field("my_pota_ref") or field("station_pota_ref", "")).upper(),
+        "My BOTA": "",
+        "My COTA": "",
+        "My IOTA": (field("my_iota") or field("station_iota", "")).upper(),
+        "My SOTA": (field("my_sota_ref") or field("station_sota_ref", "")).upper(),
+        "My WLOTA": "",
+        "Country": field("country", ""),
+        "Continent": field("cont", "").upper(),
+        "Sent": field("rst_sent", ""),
+        "Received": field("rst_rcvd", ""),
+        "Sent Exchange": field("stx", ""),
+        "Receive Exchange": field("srx", ""),
+        "Mode": field("mode", ""),
+        "Submode": field("submode", ""),
+        "Band": field("band", "").lower(),
+        "Frequency": field("freq", ""),
+        "Locator": field("gridsquare", "").upper(),
+        "Comment": field("comment", ""),
+        "WWFF": field("wwff_ref", "").upper(),
+        "POTA": field("pota_ref", "").upper(),
+        "BOTA": "",
+        "SOTA": field("sota_ref", "").upper(),
+        "IOTA": field("iota", "").upper(),
+        "WLOTA": "",
+        "Satellite": field("sat_name", "")
+    }
+
+    station_sig = field("station_sig", "")
+    station_sig_info = field("station_sig_info", "")
+    if station_sig == "BOTA":
+        entry["My BOTA"] = station_sig_info
+    elif station_sig == "COTA":
+        entry["My COTA"] = station_sig_info
+    elif station_sig == "WLOTA":
+        entry["My WLOTA"] = station_sig_info
+
+    # The export writes BOTA/COTA/WLOTA of the worked station as SIG / SIG_INFO
+    sig = field("sig", "")
+    if sig in ("BOTA", "COTA", "WLOTA"):
+        entry[sig] = field("sig_info", "")
+
+    for tag, key in QSL_FIELDS:
+        value = field(tag, "")
+        if value:
+            entry[key] = (import_format_date(value) or "") if tag.endswith("date") else value.upper()
+
+    return entry
+
+
+def iter_adif_chunks(path, chunk_size=ADIF_PARALLEL_CHUNK_SIZE):
+    """
+    Read an ADIF file as raw byte chunks that each end right after an <EOR>.
+    Yields (data, bytes_read). A literal '<EOR>' inside a value would split that record.
+    """
+    tail = b""
+    bytes_read = 0
+
+    with open(path, "rb") as f:
+        while True:
+            raw = f.read(chunk_size)
+            bytes_read += len(raw)
+            if not raw:
+                if tail.strip():
+                    yield tail, bytes_read
+                return
+
+            data = tail + raw
+            cut = data.lower().rfind(b"<eor>")
+            if cut < 0:
+                tail = data
+                continue
+            cut += len(b"<eor>")
+            yield data[:cut], bytes_read
+            tail = data[cut:]
+
+
+def parse_adif_chunk(data):
+    """
+    Decode and parse a chunk from iter_adif_chunks() into a list of MiniBook entries.
+    Runs inside the worker processes of iter_adif_qsos().
+    """
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("latin-1")
+
+    entries = []
+    for record in iter_adif_records(text):
+        entry = adif_to_qso(record)
+        if entry:
+            entries.append(entry)
+    return entries
+
+
+@contextmanager
+def without_main_file():
+    """
+    Spawned worker processes re-run the __main__ script before they start.
+    MiniBook.py builds its GUI at module level, so hide its path while the pool starts.
+    """
+    main = sys.modules["__main__"]
+    main_file = main.__dict__.pop("__file__", None)
+    try:
+        yield
+    finally:
+        if main_file is not None:
+            main.__file__ = main_file
+
+
+def pool_processes(processes=None):
+    """
+    Number of worker processes to parse with. A frozen exe cannot hide its main script
+    from the workers (each one would start the GUI again), so it parses in this process.
+    """
+    if getattr(sys, "frozen", False):
+        return 1
+    return processes or os.cpu_count() or 1
+
+
+def start_pool(processes):
+    """
+    Process pool for parsing. Always spawned: a fork would copy the running Tk process
+    with its listener, cluster and watcher threads.
+    """
+    with without_main_file():
+        return multiprocessing.get_context("spawn").Pool(processes)
+
+
+def iter_adif_qsos(path, processes=None):
+    """
+    Yield (entries, bytes_read) batches of MiniBook entries from an ADIF file, in file order.
+    Small files, or processes=1, are parsed in this process from the chunked stream.
+    Large files are split on <EOR> boundaries and parsed in a process pool.
+    """
+    processes = pool_processes(processes)
+    file_size = os.path.getsize(path)
+
+    if processes < 2 or file_size < ADIF_PARALLEL_MIN_SIZE:
+        batch = []
+        bytes_read = 0
+        for record, bytes_read in iter_adif_file(path):
+            entry = adif_to_qso(record)
+            if entry:
+                batch.append(entry)
+                if len(batch) >= ADIF_QSO_BATCH_SIZE:
+                    yield batch, bytes_read
+                    batch = []
+        yield batch, file_size
+        return
+
+    pool = start_pool(processes)
+
+    try:
+        # Keep a few chunks per worker in flight, results are collected in submit order
+        pending = deque()
+        for data, bytes_read in iter_adif_chunks(path):
+            pending.append((pool.apply_async(parse_adif_chunk, (data,)), bytes_read))
+            if len(pending) >= processes * 2:
+                result, done = pending.popleft()
+                yield result.get(), done
+
+        while pending:
+            result, done = pending.popleft()
+            yield result.get(), done
+
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
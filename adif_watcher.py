@@ -0,0 +1,150 @@
+#**********************************************************************************************************************************
+# File          :   adif_watcher.py
+# Project       :   MiniBook ADIF watch folders
+# Description   :   Tails ADIF logs written by other programs, only new records are read, offsets survive a restart
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import json
+import os
+import queue
+import threading
+
+from adif_parser import scan_adif, adif_to_qso
+
+# Seconds between two looks at the watched files, an idle check is one os.stat() per file
+WATCH_INTERVAL = 5
+
+# QSOs handed to the logbook at once
+WATCH_BATCH_SIZE = 500
+
+# Only .adi files can be tailed, ADX is one XML document
+WATCH_EXTENSIONS = (".adi", ".adif")
+
+
+def _decode(data):
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+class AdifWatcher:
+    """
+    Watch ADIF files and folders, and post the QSOs of newly appended records to a queue.
+
+    Per file the byte offset after the last complete record is kept, so old content is
+    never parsed again. A file that got shorter or was replaced is read from the start.
+    Queue items are (entries, offsets). The consumer adds the entries to the logbook and
+    then calls save_offsets(offsets), so a crash before that point only means the batch
+    is read again (and deduplicated) on the next start.
+    """
+    def __init__(self, paths, offsets_file, interval=WATCH_INTERVAL):
+        self.paths = [os.path.abspath(p) for p in paths if p]
+        self.offsets_file = offsets_file
+        self.interval = interval
+        self.queue = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.offsets = self.load_offsets()
+
+    # ------------------------------------------------------------------ offsets
+
+    def load_offsets(self):
+        try:
+            with open(self.offsets_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_offsets(self, offsets):
+        try:
+            with open(self.offsets_file, "w", encoding="utf-8") as f:
+                json.dump(offsets, f, indent=4)
+        except OSError as e:
+            print(f"Error saving watch offsets: {e}")
+
+    # ------------------------------------------------------------------ thread
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"ADIF watcher error: {e}")
+            self.stop_event.wait(self.interval)
+
+    # ------------------------------------------------------------------ scanning
+
+    def watched_files(self):
+        for path in self.paths:
+            if os.path.isdir(path):
+                try:
+                    names = sorted(os.listdir(path))
+                except OSError:
+                    continue
+                for name in names:
+                    if name.lower().endswith(WATCH_EXTENSIONS):
+                        yield os.path.join(path, name)
+            elif os.path.isfile(path):
+                yield path
+
+    def poll(self):
+        """
+        Look at every watched file once and queue the QSOs of the new records.
+        """
+        for path in self.watched_files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            state = self.offsets.get(path, {})
+            offset = state.get("offset", 0)
+            if st.st_size < offset or state.get("ino", st.st_ino) != st.st_ino:
+                offset = 0  # Truncated or replaced, start over
+            if st.st_size == offset:
+                continue
+
+            entries, new_offset = self.read_new_records(path, offset, st.st_size)
+            if new_offset == state.get("offset"):
+                continue  # Only an unfinished record was added
+
+            self.offsets[path] = {"offset": new_offset, "ino": st.st_ino}
+            for i in range(0, len(entries), WATCH_BATCH_SIZE):
+                self.queue.put((entries[i:i + WATCH_BATCH_SIZE], dict(self.offsets)))
+            if not entries:
+                self.queue.put(([], dict(self.offsets)))
+
+    def read_new_records(self, path, offset, size):
+        """
+        Read from offset up to the last complete record (<EOR>).
+        Returns (entries, new_offset); a record still being written stays for the next poll.
+        """
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(size - offset)
+
+        cut = data.lower().rfind(b"<eor>")
+        if cut < 0:
+            return [], offset
+        cut += len(b"<eor>")
+
+        entries = []
+        for fields, _ in scan_adif(_decode(data[:cut])):
+            entry = adif_to_qso(fields)
+            if entry:
+                entries.append(entry)
+        return entries, offset + cut
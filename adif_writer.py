@@ -0,0 +1,196 @@
+#**********************************************************************************************************************************
+# File          :   adif_writer.py
+# Project       :   ADIF export tool
+# Description   :   Single ADIF serializer, driven by a field table, shared by file export and QRZ upload
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import re
+
+# Records joined in memory before they are written to disk in one go
+ADIF_WRITE_BATCH_SIZE = 2000
+
+ADIF_HEADER = "Generated by MiniBook\n<ADIF_VER:5>3.1.0 <PROGRAMID:8>MiniBook <EOH>\n"
+
+NON_ASCII_RE = re.compile(r'[\u0080-\U0010FFFF]')
+
+
+def escape_invalid_characters(text):
+    # ASCII only ADIF (ascii_only=True), replace everything outside it with '?'
+    if text.isascii():
+        return text
+    return NON_ASCII_RE.sub('?', text)
+
+
+def adif_date(value):
+    # yyyy-mm-dd to yyyymmdd, empty when not a date
+    value = value.replace("-", "")
+    return value if len(value) == 8 and value.isdigit() else ""
+
+
+def adif_time(value):
+    # HH:MM:SS or HH:MM to HHMMSS / HHMM, empty when not a time
+    value = value.replace(":", "")
+    return value if len(value) in (4, 6) and value.isdigit() else ""
+
+
+# ADIF tag, logbook entry key, optional converter. Empty values are not written.
+ADIF_FIELDS = (
+    ("call",                "Callsign",         None),
+    ("qso_date",            "Date",             adif_date),
+    ("time_on",             "Time",             adif_time),
+    ("time_off",            "Time",             adif_time),
+    ("band",                "Band",             None),
+    ("freq",                "Frequency",        None),
+    ("mode",                "Mode",             None),
+    ("submode",             "Submode",          None),
+    ("rst_sent",            "Sent",             None),
+    ("rst_rcvd",            "Received",         None),
+    ("stx",                 "Sent Exchange",    None),
+    ("srx",                 "Receive Exchange", None),
+    ("name",                "Name",             None),
+    ("gridsquare",          "Locator",          None),
+    ("country",             "Country",          None),
+    ("cont",                "Continent",        None),
+    ("comment",             "Comment",          None),
+    ("sat_name",            "Satellite",        None),
+    ("station_callsign",    "My Callsign",      None),
+    ("operator",            "My Operator",      None),
+    ("my_pota_ref",         "My POTA",          None),
+    ("pota_ref",            "POTA",             None),
+    ("my_wwff_ref",         "My WWFF",          None),
+    ("wwff_ref",            "WWFF",             None),
+    ("my_iota",             "My IOTA",          None),
+    ("iota",                "IOTA",             None),
+    ("my_sota_ref",         "My SOTA",          None),
+    ("sota_ref",            "SOTA",             None),
+    ("qsl_rcvd",            "QSL Rcvd",         None),
+    ("qslrdate",            "QSL Rcvd Date",    adif_date),
+    ("lotw_qsl_rcvd",       "LoTW Rcvd",        None),
+    ("lotw_qslrdate",       "LoTW Rcvd Date",   adif_date),
+    ("eqsl_qsl_rcvd",       "eQSL Rcvd",        None),
+    ("eqsl_qslrdate",       "eQSL Rcvd Date",   adif_date),
+)
+
+# ADIF tag and key in the "Station" section of the logbook, the same for every QSO
+ADIF_STATION_FIELDS = (
+    ("station_name",        "Name"),
+    ("station_street",      "Street"),
+    ("station_postal_code", "Postalcode"),
+    ("station_city",        "City"),
+    ("station_cnty",        "County"),
+    ("station_country",     "Country"),
+    ("contest_id",          "Contest"),
+)
+
+# Awards without their own ADIF field, exported through SIG / SIG_INFO and STATION_SIG / STATION_SIG_INFO
+ADIF_SIG_AWARDS = ("BOTA", "COTA", "WLOTA")
+
+
+def station_fields(station, ascii_only=False):
+    """
+    Collect the Station fields once, they are added to every record as (tag, value).
+    """
+    fields = []
+    for tag, key in ADIF_STATION_FIELDS:
+        value = str(station.get(key, "") or "").strip()
+        if value:
+            fields.append((tag, escape_invalid_characters(value) if ascii_only else value))
+    return fields
+
+
+def iter_adif_fields(qso, station=(), log_type=None, ascii_only=False):
+    """
+    Yield the (tag, value) pairs of one logbook entry, in ADIF_FIELDS order.
+    Values are converted and stripped. Both the .adi and the ADX writer use this.
+
+    station     -  output of station_fields(), added after the QSO fields
+    log_type    -  "BOTA", "COTA" or "WLOTA" exports that award as SIG, "Normal" exports none,
+                   None picks the first award the QSO has
+    ascii_only  -  replace non-ASCII characters with '?', as the full ADIF export always did.
+                   The selected QSO export and the QRZ upload keep UTF-8
+    """
+    get = qso.get
+    escape = escape_invalid_characters if ascii_only else str
+
+    for tag, key, convert in ADIF_FIELDS:
+        value = get(key)
+        if not value:
+            continue
+        value = str(value).strip()
+        if convert:
+            value = convert(value)
+        if value:
+            yield tag, escape(value)
+
+    awards = (log_type,) if log_type in ADIF_SIG_AWARDS else ADIF_SIG_AWARDS if log_type is None else ()
+    for award in awards:
+        sig_info = escape(str(get(award, "") or "").strip())
+        if sig_info:
+            yield "sig", award
+            yield "sig_info", sig_info
+            my_sig_info = escape(str(get(f"My {award}", "") or "").strip())
+            if my_sig_info:
+                yield "station_sig", award
+                yield "station_sig_info", my_sig_info
+            break
+
+    yield from station
+
+
+def adif_record(qso, station=(), log_type=None, ascii_only=False):
+    """
+    Serialize one logbook entry to an ADIF record, ending with <EOR>.
+    """
+    record = [f"<{tag}:{len(value)}>{value}" for tag, value in iter_adif_fields(qso, station, log_type, ascii_only)]
+    record.append("<EOR>\n")
+    return " ".join(record)
+
+
+def iter_adif(qsos, station=None, log_type=None, ascii_only=False):
+    """
+    Generator of ADIF records, one string per QSO.
+    """
+    fields = station_fields(station, ascii_only) if station else ()
+    for qso in qsos:
+        yield adif_record(qso, fields, log_type, ascii_only)
+
+
+def write_records(file, records, progress=None):
+    """
+    Write record strings to an open text file, ADIF_WRITE_BATCH_SIZE records per write.
+    progress(count) is called after every batch, it may raise to abort the export.
+    Returns the number of records written.
+    """
+    count = 0
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= ADIF_WRITE_BATCH_SIZE:
+            file.write("".join(batch))
+            count += len(batch)
+            batch = []
+            if progress:
+                progress(count)
+
+    if batch:
+        file.write("".join(batch))
+        count += len(batch)
+        if progress:
+            progress(count)
+    return count
+
+
+def write_adif(file, qsos, station=None, log_type=None, progress=None, header=ADIF_HEADER, ascii_only=False):
+    """
+    Write the header and all QSOs to an open text file as .adi.
+    Returns the number of records written.
+    """
+    if header:
+        file.write(header)
+    return write_records(file, iter_adif(qsos, station, log_type, ascii_only), progress)
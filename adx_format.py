@@ -0,0 +1,112 @@
+#**********************************************************************************************************************************
+# File          :   adx_format.py
+# Project       :   ADX (XML ADIF) tool
+# Description   :   Streaming ADX import and export, using the same field mapping as the .adi parser and writer
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+from adif_parser import adif_to_qso, ADIF_QSO_BATCH_SIZE
+from adif_writer import iter_adif_fields, station_fields, write_records
+
+ADX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    "<ADX>\n"
+    "<HEADER><ADIF_VER>3.1.0</ADIF_VER><PROGRAMID>MiniBook</PROGRAMID></HEADER>\n"
+    "<RECORDS>\n"
+)
+ADX_FOOTER = "</RECORDS>\n</ADX>\n"
+
+
+def is_adx_file(path):
+    return path.lower().endswith(".adx")
+
+
+def iter_adx_file(path):
+    """
+    Stream an ADX file and yield (fields, bytes_read) per <RECORD>.
+    fields is a dict with lower case ADIF field names, like the .adi parser returns.
+    Every record is cleared once it is read, so memory stays flat for huge files.
+    APP and USERDEF elements are skipped.
+    """
+    with open(path, "rb") as f:
+        parent = None
+        record_tag = None
+        ns_len = 0
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                # <RECORDS> gives the spelling of <RECORD>, including a namespace if there is one
+                if parent is None and elem.tag.rsplit("}", 1)[-1].upper() == "RECORDS":
+                    parent = elem
+                    record_tag = elem.tag[:-1]
+                    ns_len = elem.tag.find("}") + 1
+                continue
+
+            if elem.tag != record_tag:
+                continue
+
+            fields = {child.tag[ns_len:].lower(): (child.text or "").strip() for child in elem}
+            fields.pop("app", None)
+            fields.pop("userdef", None)
+
+            # Drop the parsed record from the tree
+            elem.clear()
+            parent.clear()
+
+            if fields:
+                yield fields, f.tell()
+
+
+def iter_adx_qsos(path, processes=None):
+    """
+    Yield (entries, bytes_read) batches of MiniBook entries from an ADX file, in file order.
+    Same interface as adif_parser.iter_adif_qsos(), processes is accepted but XML is parsed in this process.
+    """
+    batch = []
+    bytes_read = 0
+    for record, bytes_read in iter_adx_file(path):
+        entry = adif_to_qso(record)
+        if entry:
+            batch.append(entry)
+            if len(batch) >= ADIF_QSO_BATCH_SIZE:
+                yield batch, bytes_read
+                batch = []
+    yield batch, bytes_read
+
+
+def adx_record(qso, station=(), log_type=None):
+    """
+    Serialize one logbook entry to an ADX <RECORD> element.
+    """
+    fields = "".join(
+        f"<{tag.upper()}>{escape(value)}</{tag.upper()}>"
+        for tag, value in iter_adif_fields(qso, station, log_type)
+    )
+    return f"<RECORD>{fields}</RECORD>\n"
+
+
+def iter_adx(qsos, station=None, log_type=None):
+    """
+    Generator of ADX records, one string per QSO.
+    """
+    fields = station_fields(station) if station else ()
+    for qso in qsos:
+        yield adx_record(qso, fields, log_type)
+
+
+def write_adx(file, qsos, station=None, log_type=None, progress=None):
+    """
+    Write an ADX document with all QSOs to an open UTF-8 text file, in batches like write_adif().
+    Returns the number of records written.
+    """
+    file.write(ADX_HEADER)
+    count = write_records(file, iter_adx(qsos, station, log_type), progress)
+    file.write(ADX_FOOTER)
+    return count
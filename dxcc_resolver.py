@@ -0,0 +1,205 @@
+#**********************************************************************************************************************************
+# File          :   dxcc_resolver.py
+# Project       :   MiniBook DXCC lookup
+# Description   :   Callsign -> DXCC entity (name, continent, zones, lat/lon) from cty.dat, without side effects.
+#                   One resolver per cty.dat is shared by MiniBook and DXCluster, safe to call from any thread.
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import os
+import re
+import threading
+from collections import namedtuple
+
+from cty_parser import parse_cty_file
+from export_watermarks import touch
+
+# Callsigns remembered by a resolver, the cache is cleared when it grows past this
+RESOLVE_CACHE_SIZE = 50000
+
+# Suffixes that say nothing about the DXCC entity: /P, /M, /QRP, /7 ...
+IGNORED_SUFFIXES = {"P", "M", "A", "QRP", "QRPP", "LH", "J", "R", "B", "N", "AM", "MM"}
+
+# cty.dat prefix / exact call, with optional (CQ zone) [ITU zone] <lat/lon> {continent} ~time offset~ overrides
+_CTY_ITEM_RE = re.compile(r"^(=?)([^\s(\[<{~]+)(.*)$")
+_CQ_RE = re.compile(r"\((\d+)\)")
+_ITU_RE = re.compile(r"\[(\d+)\]")
+_CONTINENT_RE = re.compile(r"\{(\w+)\}")
+
+DxccEntity = namedtuple("DxccEntity", "name continent cq_zone itu_zone latitude longitude prefix")
+
+
+def parse_cty_item(item):
+    """
+    One prefix of a cty.dat entry: (prefix, exact, cq_zone, itu_zone, continent), None when empty.
+    Zones and continent are None when the item has no override.
+    """
+    match = _CTY_ITEM_RE.match(item.strip().rstrip(";").strip().upper())
+    if not match:
+        return None
+    exact, prefix, overrides = match.groups()
+    cq = _CQ_RE.search(overrides)
+    itu = _ITU_RE.search(overrides)
+    continent = _CONTINENT_RE.search(overrides)
+    return (
+        prefix,
+        bool(exact),
+        int(cq.group(1)) if cq else None,
+        int(itu.group(1)) if itu else None,
+        continent.group(1) if continent else None,
+    )
+
+
+class DxccResolver:
+    """
+    Longest prefix match of a callsign against cty.dat, exact calls (=CALL) first.
+    resolve() only reads the tables built here and a locked cache, it never touches Tk or globals.
+    """
+    def __init__(self, entries=()):
+        self.entries = list(entries)   # the cty.dat entries as parsed, for callers that list them
+        self.prefixes = {}
+        self.exact = {}
+        for entry in self.entries:
+            main_prefix = entry.prefixes[0] if entry.prefixes else ""
+            for item in entry.prefixes:
+                parsed = parse_cty_item(item)
+                if not parsed:
+                    continue
+                prefix, exact, cq, itu, continent = parsed
+                table = self.exact if exact else self.prefixes
+                # An earlier entry wins a prefix listed twice, as before
+                if prefix in table:
+                    continue
+                table[prefix] = DxccEntity(
+                    entry.name,
+                    continent or entry.continent,
+                    cq if cq is not None else entry.cq_zone,
+                    itu if itu is not None else entry.itu_zone,
+                    entry.latitude,
+                    entry.longitude,
+                    main_prefix,
+                )
+        self.max_prefix = max((len(p) for p in self.prefixes), default=0)
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.prefixes) + len(self.exact)
+
+    def resolve(self, callsign):
+        """
+        DxccEntity of a callsign, None when no prefix matches.
+        """
+        callsign = (callsign or "").strip().upper()
+        if not callsign:
+            return None
+        with self.lock:
+            if callsign in self.cache:
+                return self.cache[callsign]
+
+        entity = self._lookup(callsign)
+
+        with self.lock:
+            if len(self.cache) >= RESOLVE_CACHE_SIZE:
+                self.cache.clear()
+            self.cache[callsign] = entity
+        return entity
+
+    def _lookup(self, callsign):
+        entity = self.exact.get(callsign)
+        if entity:
+            return entity
+
+        if "/" in callsign:
+            parts = [p for p in callsign.split("/") if p]
+            # PA/DL1ABC, DL1ABC/PA: the shorter part is the prefix, DL1ABC/P and DL1ABC/7 keep the base call
+            parts = [p for p in parts if p not in IGNORED_SUFFIXES and not p.isdigit()] or parts
+            if len(parts) > 1:
+                base = max(parts, key=len)
+                callsign = min(parts, key=len)
+            else:
+                base = callsign = parts[0] if parts else callsign
+            entity = self.exact.get(base)
+            if entity:
+                return entity
+
+        for length in range(min(len(callsign), self.max_prefix), 0, -1):
+            entity = self.prefixes.get(callsign[:length])
+            if entity:
+                return entity
+        return None
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def load_resolver(path):
+    """
+    The shared resolver of a cty.dat file, parsed again only when the file changed.
+    Raises OSError / ValueError when the file cannot be read.
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    with _shared_lock:
+        cached = _shared.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        resolver = DxccResolver(parse_cty_file(path))
+        _shared[path] = (mtime, resolver)
+        return resolver
+
+
+class ResolvedCallsigns(dict):
+    """
+    callsign -> DxccEntity (or None) resolved beforehand, used in place of a resolver by recompute_countries().
+    """
+    def resolve(self, callsign):
+        return self.get(callsign)
+
+
+def resolve_callsigns(resolver, callsigns, progress=None):
+    """
+    Resolve callsigns ahead of recompute_countries(), e.g. in a worker thread while the logbook
+    itself is only touched afterwards in the Tk thread. progress(done) is called every 1000 callsigns,
+    it may raise to abort. Returns a ResolvedCallsigns.
+    """
+    resolved = ResolvedCallsigns()
+    for done, callsign in enumerate(callsigns, 1):
+        if progress and done % 1000 == 0:
+            progress(done)
+        resolved[callsign] = resolver.resolve(callsign)
+    if progress:
+        progress(len(resolved))
+    return resolved
+
+
+def recompute_countries(logbook, resolver, only_missing=False, progress=None):
+    """
+    Set Country and Continent of logbook entries from their callsign.
+    only_missing leaves entries that already have a country alone. Entries that change are touched.
+    progress(done) is called every 1000 entries, it may raise to abort.
+    Returns the number of entries changed.
+    """
+    changed = 0
+    for done, qso in enumerate(logbook, 1):
+        if progress and done % 1000 == 0:
+            progress(done)
+        if only_missing and qso.get("Country"):
+            continue
+        entity = resolver.resolve(qso.get("Callsign", ""))
+        if entity is None:
+            continue
+        if qso.get("Country") != entity.name or qso.get("Continent") != entity.continent:
+            qso["Country"] = entity.name
+            qso["Continent"] = entity.continent
+            touch(qso)
+            changed += 1
+    if progress:
+        progress(len(logbook))
+    return changed
@@ -0,0 +1,156 @@
+#**********************************************************************************************************************************
+# File          :   export_archive.py
+# Project       :   MiniBook archive export
+# Description   :   Streaming gzip / zip compressed ADIF and ADX export, optionally split by year or by number of QSOs
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import gzip
+import io
+import os
+import zipfile
+
+from adif_writer import ADIF_HEADER, ADIF_WRITE_BATCH_SIZE, adif_record, station_fields
+from adx_format import ADX_HEADER, ADX_FOOTER, adx_record
+
+
+def split_export_path(path):
+    """
+    Split an export path into (base, log extension, compression extension).
+    "log.adi.gz" -> ("log", ".adi", ".gz"), "log.zip" -> ("log", ".adi", ".zip"), "log.adx" -> ("log", ".adx", "")
+    """
+    base, ext = os.path.splitext(path)
+    compression = ""
+    if ext.lower() in (".gz", ".zip"):
+        compression = ext.lower()
+        base, ext = os.path.splitext(base)
+    if ext.lower() not in (".adi", ".adif", ".adx"):
+        base, ext = base + ext, ".adi"
+    return base, ext, compression
+
+
+class ExportPart:
+    """
+    One output file. Records are joined and written ADIF_WRITE_BATCH_SIZE at a time,
+    through gzip or a zip member when the file is compressed.
+    """
+    def __init__(self, path, log_ext, compression):
+        self.path = path
+        self.count = 0
+        self.batch = []
+        self.zip_file = None
+        self.closed = False
+
+        if compression == ".gz":
+            self.file = gzip.open(path, "wt", encoding="utf-8")
+        elif compression == ".zip":
+            self.zip_file = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+            member = os.path.basename(path)[:-len(compression)]
+            if not member.lower().endswith(log_ext):
+                member += log_ext
+            # force_zip64, the size of the member is not known up front
+            self.file = io.TextIOWrapper(self.zip_file.open(member, "w", force_zip64=True), encoding="utf-8")
+        else:
+            self.file = open(path, "w", encoding="utf-8", buffering=1024 * 1024)
+
+        self.is_adx = log_ext == ".adx"
+        self.file.write(ADX_HEADER if self.is_adx else ADIF_HEADER)
+
+    def write(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= ADIF_WRITE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.file.write("".join(self.batch))
+            self.count += len(self.batch)
+            self.batch = []
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.flush()
+        if self.is_adx:
+            self.file.write(ADX_FOOTER)
+        self.file.close()
+        if self.zip_file:
+            self.zip_file.close()
+
+
+def export_archive(path, qsos, station=None, log_type=None, split=None, progress=None, ascii_only=False):
+    """
+    Export QSOs in one pass over qsos, memory does not grow with the size of the log.
+
+    path      -  .adi / .adx, optionally with .gz, or .zip; the extension decides format and compression
+    split     -  None for one file, "year" for a file per QSO year, or a number of QSOs per file
+    progress  -  progress(count) after every ADIF_WRITE_BATCH_SIZE QSOs, it may raise to abort
+    ascii_only - .adi values without non-ASCII characters (see iter_adif_fields), ADX stays UTF-8
+
+    Split parts are named <base>_<year> or <base>_part<n>, each compressed on its own.
+    Returns the list of files written. Files of an aborted export are removed.
+    """
+    base, log_ext, compression = split_export_path(path)
+    ascii_only = ascii_only and log_ext != ".adx"
+    fields = station_fields(station, ascii_only) if station else ()
+    if log_ext == ".adx":
+        record = adx_record
+    else:
+        def record(qso, fields, log_type):
+            return adif_record(qso, fields, log_type, ascii_only)
+
+    by_year = {}
+    opened = []
+
+    def open_part(suffix):
+        part = ExportPart(f"{base}{suffix}{log_ext}{compression}" if split else path, log_ext, compression)
+        opened.append(part)
+        return part
+
+    try:
+        count = 0
+        part = None
+        for qso in qsos:
+            if split == "year":
+                year = (qso.get("Date") or "")[:4] or "unknown"
+                part = by_year.get(year)
+                if part is None:
+                    part = by_year[year] = open_part(f"_{year}")
+            elif split:
+                if count % split == 0:
+                    if part:
+                        part.close()
+                    part = open_part(f"_part{count // split + 1:03d}")
+            elif part is None:
+                part = open_part("")
+
+            part.write(record(qso, fields, log_type))
+            count += 1
+            if progress and count % ADIF_WRITE_BATCH_SIZE == 0:
+                progress(count)
+
+        if not opened:
+            open_part("")  # Nothing to export, still write a valid empty file
+        for part in opened:
+            part.close()
+        if progress:
+            progress(count)
+    except BaseException:
+        for part in opened:
+            try:
+                part.close()
+            except Exception:
+                pass
+            try:
+                os.remove(part.path)
+            except OSError:
+                pass
+        raise
+
+    return [part.path for part in opened]
@@ -0,0 +1,89 @@
+#**********************************************************************************************************************************
+# File          :   export_watermarks.py
+# Project       :   MiniBook change tracking
+# Description   :   Modification sequence per QSO and per destination export watermarks, for "changes since last export"
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+from bisect import bisect_right
+
+# Key in a logbook entry holding its modification sequence number
+SEQ_FIELD = "Seq"
+
+# Top level keys in the .mbk file
+SEQUENCE_KEY = "Sequence"       # Last sequence number handed out
+EXPORTS_KEY = "Exports"         # {destination: last exported sequence number}
+
+
+def touch(entry):
+    """
+    Mark an entry as edited, it gets a new sequence number on the next save.
+    """
+    entry.pop(SEQ_FIELD, None)
+
+
+class ChangeIndex:
+    """
+    Logbook entries ordered by sequence number, so the entries changed after a
+    watermark are found with a binary search instead of a scan over the whole log.
+    Sequence numbers only grow, new stamps are appended and the order holds.
+    """
+    def __init__(self, logbook=()):
+        stamped = sorted(
+            ((entry[SEQ_FIELD], entry) for entry in logbook if isinstance(entry.get(SEQ_FIELD), int)),
+            key=lambda item: item[0],
+        )
+        self.seqs = [seq for seq, _ in stamped]
+        self.entries = [entry for _, entry in stamped]
+
+    @property
+    def last(self):
+        return self.seqs[-1] if self.seqs else 0
+
+    def add(self, entry):
+        self.seqs.append(entry[SEQ_FIELD])
+        self.entries.append(entry)
+
+    def since(self, watermark):
+        """
+        Entries with a sequence number above watermark, oldest change first.
+        Entries that were edited again since they were indexed only show up once, at their newest number.
+        """
+        start = bisect_right(self.seqs, watermark)
+        return [entry for seq, entry in zip(self.seqs[start:], self.entries[start:]) if entry.get(SEQ_FIELD) == seq]
+
+
+def stamp_changes(data, index=None):
+    """
+    Give every new or edited entry (no sequence number) in the logbook data the next
+    sequence number. Called right before the logbook is written, and on load so a log
+    from before change tracking is numbered in file order. Returns the number stamped.
+    """
+    sequence = max(data.get(SEQUENCE_KEY, 0), index.last if index is not None else 0)
+    stamped = 0
+    for entry in data.get("Logbook", []):
+        if SEQ_FIELD not in entry:
+            sequence += 1
+            entry[SEQ_FIELD] = sequence
+            stamped += 1
+            if index is not None:
+                index.add(entry)
+    data[SEQUENCE_KEY] = sequence
+    return stamped
+
+
+def get_watermark(data, destination):
+    return data.get(EXPORTS_KEY, {}).get(destination, 0)
+
+
+def set_watermark(data, destination, sequence):
+    data.setdefault(EXPORTS_KEY, {})[destination] = sequence
+
+
+def destinations(data):
+    return sorted(data.get(EXPORTS_KEY, {}))
@@ -0,0 +1,95 @@
+#**********************************************************************************************************************************
+# File          :   import_files.py
+# Project       :   MiniBook multi file import
+# Description   :   Parse several ADIF / ADX files concurrently and hand the QSOs over in one ordered stream
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#                           - CSV and JSON Lines files are read through table_format.py
+#**********************************************************************************************************************************
+
+import os
+from collections import deque
+
+from adif_parser import iter_adif_qsos, pool_processes, start_pool
+from adx_format import is_adx_file, iter_adx_qsos
+from table_format import table_format, iter_table_qsos
+
+# Extensions picked up when a folder is imported
+LOG_FILE_EXTENSIONS = (".adi", ".adif", ".adx")
+
+
+def find_log_files(folder):
+    """
+    All ADIF / ADX files in folder and its subfolders, sorted by path.
+    """
+    found = []
+    for dirpath, _, filenames in os.walk(folder):
+        for filename in filenames:
+            if filename.lower().endswith(LOG_FILE_EXTENSIONS):
+                found.append(os.path.join(dirpath, filename))
+    return sorted(found)
+
+
+def iter_log_qsos(path, processes=None):
+    """
+    Yield (entries, bytes_read) batches from one ADIF, ADX, CSV or JSON Lines file.
+    """
+    if table_format(path):
+        return iter_table_qsos(path)
+    if is_adx_file(path):
+        return iter_adx_qsos(path)
+    return iter_adif_qsos(path, processes)
+
+
+def parse_log_file(path):
+    """
+    Parse a whole file into a list of MiniBook entries. Runs inside the worker processes of iter_qso_files().
+    """
+    try:
+        return [entry for entries, _ in iter_log_qsos(path, processes=1) for entry in entries]
+    except Exception as e:
+        raise ValueError(f"{os.path.basename(path)}: {e}") from None
+
+
+def iter_qso_files(paths, processes=None):
+    """
+    Yield (entries, bytes_read) for a list of files, file after file in the given order.
+    bytes_read counts over all files, so it can drive one progress bar.
+    A single file is streamed as before; several files are parsed at the same time in a
+    process pool, one file per worker, with a few files in flight.
+    """
+    processes = pool_processes(processes)
+
+    if len(paths) == 1 or processes < 2:
+        done = 0
+        for path in paths:
+            for entries, bytes_read in iter_log_qsos(path, processes):
+                yield entries, done + bytes_read
+            done += os.path.getsize(path)
+        return
+
+    pool = start_pool(min(processes, len(paths)))
+
+    try:
+        done = 0
+        pending = deque()
+        for path in paths:
+            pending.append((pool.apply_async(parse_log_file, (path,)), os.path.getsize(path)))
+            if len(pending) >= processes * 2:
+                result, size = pending.popleft()
+                done += size
+                yield result.get(), done
+
+        while pending:
+            result, size = pending.popleft()
+            done += size
+            yield result.get(), done
+
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
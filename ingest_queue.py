@@ -0,0 +1,79 @@
+#**********************************************************************************************************************************
+# File          :   ingest_queue.py
+# Project       :   MiniBook QSO ingest
+# Description   :   Bounded queue between the UDP listener and the logbook; the listener only parses and queues,
+#                   the Tk thread takes the QSOs off in batches
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#                           -   Replace and delete actions, for N1MM+ contacts
+#**********************************************************************************************************************************
+
+import queue
+import threading
+import time
+from collections import Counter
+
+# QSOs waiting for the logbook, when full new QSOs are dropped (and counted) instead of blocking the socket
+INGEST_QUEUE_SIZE = 10000
+
+# QSOs applied to the logbook in one go, one save and one refresh per batch
+INGEST_BATCH_SIZE = 500
+
+# Milliseconds between two looks at the queue from the Tk thread
+INGEST_POLL_MS = 250
+
+
+class IngestQueue:
+    """
+    put() never blocks: it returns False and counts a drop when the queue is full.
+    get_batch() returns up to max_items (action, entry, received_at) tuples without waiting.
+    action is "add" for a new QSO, "replace" or "delete" for a change of one logged earlier (N1MM+).
+    """
+    def __init__(self, maxsize=INGEST_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+
+    def put(self, entry, action="add"):
+        try:
+            self.queue.put_nowait((action, entry, time.time()))
+        except queue.Full:
+            with self.lock:
+                self.stats["dropped"] += 1
+            return False
+        with self.lock:
+            self.stats["queued"] += 1
+        return True
+
+    def get_batch(self, max_items=INGEST_BATCH_SIZE):
+        batch = []
+        while len(batch) < max_items:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def applied(self, received_times):
+        """
+        Record that QSOs received at received_times are saved, for the latency counters.
+        """
+        now = time.time()
+        with self.lock:
+            for received_at in received_times:
+                latency = now - received_at
+                self.stats["applied"] += 1
+                self.stats["latency_total"] += latency
+                if latency > self.stats["latency_max"]:
+                    self.stats["latency_max"] = latency
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.stats[name] += value
+
+    def qsize(self):
+        return self.queue.qsize()
@@ -0,0 +1,147 @@
+#**********************************************************************************************************************************
+# File          :   logbook_index.py
+# Project       :   MiniBook logbook index
+# Description   :   In memory lookup of logbook QSOs, used to deduplicate and preview imports
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+# Two QSOs with the same callsign, date, band and mode this close together are near-duplicates
+NEAR_DUPLICATE_SECONDS = 120
+
+# Number of records per category kept as sample for the import preview
+PREVIEW_SAMPLE_SIZE = 50
+
+
+def qso_key(entry):
+    """
+    Key used throughout MiniBook to identify a QSO: Callsign_Date_Time
+    """
+    return f"{entry.get('Callsign', '')}_{entry.get('Date', '')}_{entry.get('Time', '')}"
+
+
+def time_to_seconds(time_str):
+    # HH:MM:SS or HH:MM to seconds since midnight, None when invalid
+    try:
+        parts = [int(p) for p in time_str.split(":")]
+    except (AttributeError, ValueError):
+        return None
+    if len(parts) == 2:
+        parts.append(0)
+    if len(parts) != 3:
+        return None
+    return parts[0] * 3600 + parts[1] * 60 + parts[2]
+
+
+class LogbookIndex:
+    """
+    Index over logbook entries: exact lookup by qso_key() and near lookup by
+    callsign, date, band and mode.
+    """
+    def __init__(self, logbook=()):
+        self.by_key = {}
+        self.by_contact = {}
+        for entry in logbook:
+            self.add(entry)
+
+    @staticmethod
+    def contact_key(entry):
+        return (
+            entry.get("Callsign", "").upper(),
+            entry.get("Date", ""),
+            entry.get("Band", "").lower(),
+            entry.get("Mode", "").upper(),
+        )
+
+    def add(self, entry):
+        self.by_key[qso_key(entry)] = entry
+        seconds = time_to_seconds(entry.get("Time", ""))
+        if seconds is not None:
+            self.by_contact.setdefault(self.contact_key(entry), []).append((seconds, entry))
+
+    def get(self, key):
+        return self.by_key.get(key)
+
+    def __contains__(self, key):
+        return key in self.by_key
+
+    def __len__(self):
+        return len(self.by_key)
+
+    def find_near(self, entry, window=NEAR_DUPLICATE_SECONDS):
+        """
+        Return an indexed entry with the same callsign, date, band and mode
+        within window seconds, or None.
+        """
+        seconds = time_to_seconds(entry.get("Time", ""))
+        if seconds is None:
+            return None
+        for other_seconds, other in self.by_contact.get(self.contact_key(entry), ()):
+            if abs(other_seconds - seconds) <= window:
+                return other
+        return None
+
+
+def filled_fields(entry):
+    """
+    The fields of an incoming entry that have a value. An empty field says nothing: the ADIF
+    import always sets e.g. "My Locator", also when the file has no such field.
+    """
+    return {field: value for field, value in entry.items() if value not in ("", None)}
+
+
+def changed_fields(entry, existing):
+    """
+    Names of the fields in entry that would change existing when it is overwritten, empty fields left out.
+    """
+    return [field for field, value in filled_fields(entry).items() if existing.get(field, "") != value]
+
+
+class ImportPreview:
+    """
+    Dry run of an import: every incoming entry is classified against the index in one pass.
+
+    new        - not in the logbook
+    near       - not in the logbook, but a QSO with the same callsign/date/band/mode is within NEAR_DUPLICATE_SECONDS
+    exact      - same Callsign/Date/Time and identical field values
+    conflict   - same Callsign/Date/Time but overwriting would change field values
+
+    New and near entries are added to the index, so repeats inside the import are found as well.
+    """
+    CATEGORIES = ("new", "near", "exact", "conflict")
+
+    def __init__(self, index, sample_size=PREVIEW_SAMPLE_SIZE):
+        self.index = index
+        self.sample_size = sample_size
+        self.counts = dict.fromkeys(self.CATEGORIES, 0)
+        self.samples = {category: [] for category in self.CATEGORIES}
+        self.duplicates = []    # (key, entry, changed fields) for exact and conflict
+
+    def classify(self, entry):
+        """
+        Classify one entry and return its category.
+        """
+        key = qso_key(entry)
+        existing = self.index.get(key)
+
+        if existing is not None:
+            changes = changed_fields(entry, existing)
+            category = "conflict" if changes else "exact"
+            self.duplicates.append((key, entry, changes))
+        else:
+            changes = []
+            category = "near" if self.index.find_near(entry) is not None else "new"
+            self.index.add(entry)
+
+        self.counts[category] += 1
+        if len(self.samples[category]) < self.sample_size:
+            self.samples[category].append((entry, changes))
+        return category
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
@@ -0,0 +1,269 @@
+#**********************************************************************************************************************************
+# File          :   logbook_ops.py
+# Project       :   MiniBook logbook operations
+# Description   :   GUI free logbook engine: load/save .mbk, import, dedup, validate and statistics.
+#                   Used by MiniBook.py and by the command line tool minibook_cli.py
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import json
+import re
+from collections import Counter
+from datetime import datetime
+
+from dxcc_resolver import recompute_countries
+from export_watermarks import stamp_changes, touch
+from import_files import iter_qso_files
+from logbook_index import LogbookIndex, ImportPreview, filled_fields, qso_key
+
+# New QSOs are added to the logbook in batches of this size while an import is classified
+IMPORT_BATCH_SIZE = 1000
+
+# Of a group of duplicates, the entry with most of these fields filled in is kept
+DUPLICATE_BEST_FIELDS = ["Callsign", "Date", "Time", "Mode", "Frequency", "Name", "My Locator", "My Location"]
+
+IMPORT_ACTIONS = ("add", "overwrite", "ignore")
+
+
+def load_logbook(path):
+    """
+    Read a .mbk file, returns the JSON data with at least "Station" and "Logbook".
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data.setdefault("Station", {})
+    data.setdefault("Logbook", [])
+    return data
+
+
+def save_logbook(path, data):
+    """
+    Write a .mbk file, new and edited QSOs get their modification sequence number first.
+    """
+    stamp_changes(data)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+# ------------------------------------------------------------------ import
+
+def classify_import(logbook, paths, progress=None, resolver=None):
+    """
+    Parse ADIF / ADX files and classify every QSO against the logbook in one pass (see ImportPreview).
+    New and near-duplicate QSOs are added to logbook right away, duplicates wait in preview.duplicates
+    for apply_import(). Nothing is written to disk.
+    progress(bytes_read, count) is called per parsed batch and may raise to abort.
+    With a DXCC resolver, added QSOs without a country get it from cty.dat.
+    Returns (preview, added).
+    """
+    logbook_size = len(logbook)
+    preview = ImportPreview(LogbookIndex(logbook))
+    batch = []
+    added = 0
+    count = 0
+
+    batches = iter_qso_files(list(paths))
+    try:
+        for entries, bytes_read in batches:
+            for entry in entries:
+                if preview.classify(entry) in ("new", "near"):
+                    batch.append(entry)
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        logbook.extend(batch)
+                        added += len(batch)
+                        batch = []
+            count += len(entries)
+            if progress:
+                progress(bytes_read, count)
+    finally:
+        batches.close()
+
+    logbook.extend(batch)
+    added += len(batch)
+    if resolver is not None:
+        recompute_countries(logbook[logbook_size:], resolver, only_missing=True)
+    return preview, added
+
+
+def rebase_import(logbook, imported, preview):
+    """
+    Carry an import classified against an earlier copy of the logbook over to logbook as it is now,
+    e.g. re-loaded after QSOs were logged while the preview was shown. imported are the entries
+    classify_import() added to that copy; those now already in logbook are left out.
+    preview.index is rebuilt on logbook for apply_import(). Returns the number of entries added.
+    """
+    index = LogbookIndex(logbook)
+    added = 0
+    for entry in imported:
+        if qso_key(entry) not in index:
+            logbook.append(entry)
+            index.add(entry)
+            added += 1
+    preview.index = index
+    return added
+
+
+def apply_import(logbook, preview, action, resolver=None):
+    """
+    Handle the duplicates of an import: "overwrite" updates QSOs whose fields differ (empty
+    incoming fields keep the logbook value), "add" adds them as extra QSOs, "ignore" leaves them out.
+    With a DXCC resolver, added QSOs without a country get it, as in classify_import().
+    Returns (added, updated).
+    """
+    logbook_size = len(logbook)
+    added = updated = 0
+    if action == "overwrite":
+        for key, entry, changes in preview.duplicates:
+            existing = preview.index.get(key)
+            # None when the QSO was deleted after the import was classified
+            if changes and existing is not None:
+                existing.update(filled_fields(entry))
+                touch(existing)
+                updated += 1
+    elif action == "add":
+        for key, entry, changes in preview.duplicates:
+            logbook.append(entry)
+            added += 1
+        if resolver is not None:
+            recompute_countries(logbook[logbook_size:], resolver, only_missing=True)
+    return added, updated
+
+
+# ------------------------------------------------------------------ duplicates
+
+def duplicate_groups(logbook):
+    """
+    Groups of QSOs with the same callsign, date and time: {key: [logbook indices]}.
+    """
+    seen = {}
+    groups = {}
+    for idx, qso in enumerate(logbook):
+        key = (
+            qso.get("Callsign", "").strip().upper(),
+            qso.get("Date", "").strip(),
+            qso.get("Time", "").strip()
+        )
+        if key in seen:
+            groups.setdefault(key, [seen[key]]).append(idx)
+        else:
+            seen[key] = idx
+    return groups
+
+
+def remove_duplicates_keep_best(logbook, groups=None):
+    """
+    Remove all duplicates, keeping the most complete QSO of every group. Returns the number removed.
+    """
+    if groups is None:
+        groups = duplicate_groups(logbook)
+
+    to_delete = []
+    for indices in groups.values():
+        best_idx = max(indices, key=lambda i: sum(1 for f in DUPLICATE_BEST_FIELDS if logbook[i].get(f)))
+        to_delete.extend(i for i in indices if i != best_idx)
+
+    for i in sorted(to_delete, reverse=True):
+        del logbook[i]
+    return len(to_delete)
+
+
+# ------------------------------------------------------------------ validation
+
+# Checks if a given maidenhead locator is valid for example JO22LO49
+def is_valid_locator(locator):
+    if locator == "":
+        return True
+    if len(locator) < 4 or len(locator) % 2 != 0:
+        return False
+    # Regex pattern:
+    # - [A-R]{2} : veld
+    # - \d{2} : vierkant
+    # - ([A-X]{2})? : optioneel subsquare
+    # - (\d{2})? : optioneel extended vierkant (cijfers)
+    pattern = r'^[A-R]{2}\d{2}([A-X]{2})?(\d{2})?$'
+    return bool(re.match(pattern, locator, re.IGNORECASE))
+
+
+def validate_qso(qso):
+    """
+    Problems found in one logbook entry, an empty list when it is fine.
+    """
+    problems = []
+    if not qso.get("Callsign", "").strip():
+        problems.append("missing callsign")
+    try:
+        datetime.strptime(qso.get("Date", ""), "%Y-%m-%d")
+    except ValueError:
+        problems.append(f"invalid date '{qso.get('Date', '')}'")
+    try:
+        datetime.strptime(qso.get("Time", ""), "%H:%M:%S")
+    except ValueError:
+        problems.append(f"invalid time '{qso.get('Time', '')}'")
+    if not qso.get("Band", "").strip():
+        problems.append("missing band")
+    if not qso.get("Mode", "").strip():
+        problems.append("missing mode")
+    for field in ("Locator", "My Locator"):
+        if not is_valid_locator(qso.get(field, "")):
+            problems.append(f"invalid {field.lower()} '{qso.get(field, '')}'")
+    frequency = qso.get("Frequency", "")
+    if frequency:
+        try:
+            float(frequency)
+        except ValueError:
+            problems.append(f"invalid frequency '{frequency}'")
+    return problems
+
+
+def validate_logbook(logbook):
+    """
+    Yield (index, qso, problems) for every entry with problems.
+    """
+    for idx, qso in enumerate(logbook):
+        problems = validate_qso(qso)
+        if problems:
+            yield idx, qso, problems
+
+
+# ------------------------------------------------------------------ statistics
+
+def logbook_stats(logbook):
+    """
+    Summary of a logbook: totals and QSOs per band, mode, year and continent.
+    """
+    bands = Counter()
+    modes = Counter()
+    years = Counter()
+    continents = Counter()
+    calls = set()
+    countries = set()
+    dates = []
+
+    for qso in logbook:
+        bands[qso.get("Band", "").lower() or "?"] += 1
+        modes[qso.get("Mode", "").upper() or "?"] += 1
+        date = qso.get("Date", "")
+        years[date[:4] or "?"] += 1
+        continents[qso.get("Continent", "").upper() or "?"] += 1
+        calls.add(qso.get("Callsign", "").upper())
+        if qso.get("Country"):
+            countries.add(qso["Country"])
+        if date:
+            dates.append(date)
+
+    return {
+        "qsos": len(logbook),
+        "unique_calls": len(calls - {""}),
+        "countries": len(countries),
+        "first_date": min(dates) if dates else "",
+        "last_date": max(dates) if dates else "",
+        "bands": dict(bands.most_common()),
+        "modes": dict(modes.most_common()),
+        "years": dict(sorted(years.items())),
+        "continents": dict(continents.most_common()),
+    }
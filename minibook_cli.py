@@ -0,0 +1,286 @@
+#**********************************************************************************************************************************
+# File          :   minibook_cli.py
+# Project       :   MiniBook command line
+# Description   :   Headless batch operations on .mbk logbooks, no GUI is started.
+#                   python minibook_cli.py {import,qsl,export,dedup,validate,stats,convert} ...
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#                           - CSV and JSON Lines export / import, --columns
+#                           - qsl: merge confirmation reports
+#                           - qsl --source lotw|eqsl|qsl, detected per file by default
+#                           - import fills in missing countries from cty.dat (--cty) like the GUI
+#**********************************************************************************************************************************
+
+import argparse
+import json
+import os
+import sys
+
+from dxcc_resolver import load_resolver
+from export_archive import export_archive
+from export_watermarks import ChangeIndex, get_watermark, set_watermark, stamp_changes, SEQ_FIELD
+from import_files import find_log_files, iter_qso_files
+from qsl_merge import QSL_MATCH_SECONDS, QSL_SOURCES, QSL_SOURCE_NAMES, detect_report_source, iter_qsl_reports, merge_qsl_reports
+from table_format import TABLE_COLUMNS, table_format, export_table
+from logbook_ops import (load_logbook, save_logbook, classify_import, apply_import, duplicate_groups,
+                         remove_duplicates_keep_best, validate_logbook, logbook_stats, IMPORT_ACTIONS)
+
+LOG_TYPES = ("Normal", "BOTA", "COTA", "WLOTA")
+
+# cty.dat of MiniBook, relative to the folder it runs in
+CTY_FILE = os.path.join("data", "cty.dat")
+
+
+def expand_paths(paths):
+    # Folders are replaced by the ADIF / ADX files they contain
+    files = []
+    for path in paths:
+        files.extend(find_log_files(path) if os.path.isdir(path) else [path])
+    return files
+
+
+def parse_split(value):
+    if value is None or value == "year":
+        return value
+    try:
+        size = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("split must be 'year' or a number of QSOs")
+    if size < 1:
+        raise argparse.ArgumentTypeError("split must be at least 1")
+    return size
+
+
+def parse_columns(value):
+    columns = [c.strip() for c in value.split(",") if c.strip()]
+    unknown = [c for c in columns if c not in TABLE_COLUMNS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown column(s): {', '.join(unknown)}")
+    return columns
+
+
+def write_output(args, qsos, station):
+    """
+    Export to args.output, CSV / JSON Lines or ADIF / ADX depending on the extension.
+    Returns the list of files written.
+    """
+    if table_format(args.output):
+        if args.split:
+            raise ValueError("--split is not supported for CSV / JSON Lines")
+        export_table(args.output, qsos, args.columns)
+        return [args.output]
+    if args.columns:
+        raise ValueError("--columns is only supported for CSV / JSON Lines")
+    return export_archive(args.output, qsos, station, args.log_type, args.split)
+
+
+def cmd_import(args):
+    files = expand_paths(args.files)
+    if not files:
+        print("No ADIF or ADX files found.", file=sys.stderr)
+        return 1
+
+    resolver = None
+    if os.path.exists(args.cty):
+        resolver = load_resolver(args.cty)
+    else:
+        print(f"{args.cty} not found, imported QSOs without a country are left without one.", file=sys.stderr)
+
+    data = load_logbook(args.logbook)
+    logbook = data["Logbook"]
+    preview, added = classify_import(logbook, files, resolver=resolver)
+    duplicates_added, updated = apply_import(logbook, preview, args.duplicates, resolver)
+
+    counts = preview.counts
+    print(f"{len(files)} file(s), {preview.total} QSO(s): {counts['new']} new, {counts['near']} near-duplicate, "
+          f"{counts['exact']} duplicate, {counts['conflict']} duplicate with changes")
+
+    if args.dry_run:
+        print("Dry run, logbook not changed.")
+        return 0
+
+    save_logbook(args.logbook, data)
+    print(f"{added + duplicates_added} QSO(s) added, {updated} QSO(s) updated.")
+    return 0
+
+
+def cmd_qsl(args):
+    files = expand_paths(args.files)
+    if not files:
+        print("No ADIF or ADX files found.", file=sys.stderr)
+        return 1
+
+    for path in files:
+        print(f"{os.path.basename(path)}: {QSL_SOURCE_NAMES[args.source or detect_report_source(path)]} report")
+
+    data = load_logbook(args.logbook)
+    logbook = data["Logbook"]
+    result = merge_qsl_reports(logbook, iter_qsl_reports(files, args.source), args.window * 60)
+
+    print(f"{result.total} confirmation(s): {result.matched} matched ({result.updated} QSO(s) updated), "
+          f"{len(result.unmatched)} unmatched, {len(result.ambiguous)} ambiguous")
+    for report in result.unmatched[:args.limit]:
+        print(f"  unmatched : {report.get('Callsign', '')} {report.get('Date', '')} {report.get('Time', '')} {report.get('Band', '')} {report.get('Mode', '')}")
+    for report, found in result.ambiguous[:args.limit]:
+        times = ", ".join(logbook[i].get("Time", "") for i in found)
+        print(f"  ambiguous : {report.get('Callsign', '')} {report.get('Date', '')} {report.get('Time', '')} {report.get('Band', '')} {report.get('Mode', '')} -> {times}")
+
+    if args.dry_run or not result.updated:
+        return 0
+    save_logbook(args.logbook, data)
+    return 0
+
+
+def cmd_export(args):
+    data = load_logbook(args.logbook)
+    qsos = data["Logbook"]
+
+    if args.since:
+        # Only what changed since the last export to this destination
+        stamp_changes(data)
+        qsos = ChangeIndex(qsos).since(get_watermark(data, args.since))
+        if not qsos:
+            print(f"No new or changed QSOs since the last export to {args.since}.")
+            return 0
+
+    written = write_output(args, qsos, data["Station"])
+
+    if args.since:
+        set_watermark(data, args.since, qsos[-1][SEQ_FIELD])
+        save_logbook(args.logbook, data)
+
+    print(f"{len(qsos)} QSO(s) exported to {', '.join(written)}")
+    return 0
+
+
+def cmd_dedup(args):
+    data = load_logbook(args.logbook)
+    logbook = data["Logbook"]
+    groups = duplicate_groups(logbook)
+    duplicates = sum(len(indices) - 1 for indices in groups.values())
+    print(f"{len(groups)} group(s) of duplicates, {duplicates} QSO(s) to remove.")
+
+    if args.dry_run or not duplicates:
+        return 0
+
+    removed = remove_duplicates_keep_best(logbook, groups)
+    save_logbook(args.logbook, data)
+    print(f"{removed} duplicate QSO(s) removed, best entries kept.")
+    return 0
+
+
+def cmd_validate(args):
+    data = load_logbook(args.logbook)
+    invalid = 0
+    for idx, qso, problems in validate_logbook(data["Logbook"]):
+        invalid += 1
+        if invalid <= args.limit:
+            print(f"#{idx} {qso.get('Callsign', '?')} {qso.get('Date', '')} {qso.get('Time', '')}: {', '.join(problems)}")
+    if invalid > args.limit:
+        print(f"... {invalid - args.limit} more")
+    print(f"{len(data['Logbook'])} QSO(s) checked, {invalid} with problems.")
+    return 1 if invalid else 0
+
+
+def cmd_stats(args):
+    stats = logbook_stats(load_logbook(args.logbook)["Logbook"])
+    if args.json:
+        print(json.dumps(stats, indent=4))
+        return 0
+
+    print(f"QSOs         : {stats['qsos']}")
+    print(f"Unique calls : {stats['unique_calls']}")
+    print(f"Countries    : {stats['countries']}")
+    print(f"First / last : {stats['first_date']} / {stats['last_date']}")
+    for title in ("bands", "modes", "years", "continents"):
+        print(f"\n{title.capitalize()}:")
+        for name, count in stats[title].items():
+            print(f"  {name:<10} {count}")
+    return 0
+
+
+def cmd_convert(args):
+    # .mbk, .adi, .adx, .csv or .jsonl in, .adi / .adx (optionally .gz / .zip), .csv or .jsonl out
+    if args.input.lower().endswith(".mbk"):
+        data = load_logbook(args.input)
+        qsos, station = data["Logbook"], data["Station"]
+    else:
+        qsos = (entry for entries, _ in iter_qso_files(expand_paths([args.input])) for entry in entries)
+        station = None
+
+    written = write_output(args, qsos, station)
+    print(f"Converted to {', '.join(written)}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="minibook_cli.py", description="MiniBook logbook operations without the GUI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="import ADIF / ADX files or folders into a logbook")
+    p.add_argument("logbook", help=".mbk logbook")
+    p.add_argument("files", nargs="+", help="ADIF / ADX / CSV / JSON Lines files, or folders with ADIF / ADX files")
+    p.add_argument("--duplicates", choices=IMPORT_ACTIONS, default="ignore", help="what to do with QSOs already in the logbook (default: ignore)")
+    p.add_argument("--cty", default=CTY_FILE, help=f"cty.dat for the country of QSOs without one (default: {CTY_FILE})")
+    p.add_argument("--dry-run", action="store_true", help="only report what the import would do")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("qsl", help="merge QSL / LoTW / eQSL confirmations from downloaded reports")
+    p.add_argument("logbook", help=".mbk logbook")
+    p.add_argument("files", nargs="+", help="ADIF / ADX report files or folders")
+    p.add_argument("--window", type=int, default=QSL_MATCH_SECONDS // 60, help=f"minutes between report and QSO time (default: {QSL_MATCH_SECONDS // 60})")
+    p.add_argument("--source", choices=tuple(QSL_SOURCES), help="where the reports come from (default: detected per file)")
+    p.add_argument("--limit", type=int, default=20, help="number of unmatched / ambiguous reports listed (default: 20)")
+    p.add_argument("--dry-run", action="store_true", help="only report what would be merged")
+    p.set_defaults(func=cmd_qsl)
+
+    p = sub.add_parser("export", help="export a logbook to ADIF / ADX, .gz or .zip, CSV or JSON Lines")
+    p.add_argument("logbook", help=".mbk logbook")
+    p.add_argument("output", help="output file, the extension selects the format")
+    p.add_argument("--log-type", choices=LOG_TYPES, default="Normal", help="award exported as SIG (default: Normal)")
+    p.add_argument("--split", type=parse_split, help="'year' or a number of QSOs per file")
+    p.add_argument("--columns", type=parse_columns, help="comma separated columns for CSV / JSON Lines (default: all)")
+    p.add_argument("--since", metavar="DESTINATION", help="only QSOs added or changed since the last export to DESTINATION")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("dedup", help="remove duplicate QSOs, keeping the most complete one")
+    p.add_argument("logbook", help=".mbk logbook")
+    p.add_argument("--dry-run", action="store_true", help="only report the duplicates")
+    p.set_defaults(func=cmd_dedup)
+
+    p = sub.add_parser("validate", help="check dates, times, locators and required fields")
+    p.add_argument("logbook", help=".mbk logbook")
+    p.add_argument("--limit", type=int, default=50, help="number of problems listed (default: 50)")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("stats", help="QSO totals per band, mode, year and continent")
+    p.add_argument("logbook", help=".mbk logbook")
+    p.add_argument("--json", action="store_true", help="print as JSON")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("convert", help="convert between .mbk, .adi, .adx, .csv and .jsonl")
+    p.add_argument("input", help=".mbk, .adi, .adx, .csv or .jsonl file")
+    p.add_argument("output", help="output file, the extension selects the format")
+    p.add_argument("--log-type", choices=LOG_TYPES, default="Normal", help="award exported as SIG (default: Normal)")
+    p.add_argument("--split", type=parse_split, help="'year' or a number of QSOs per file")
+    p.add_argument("--columns", type=parse_columns, help="comma separated columns for CSV / JSON Lines (default: all)")
+    p.set_defaults(func=cmd_convert)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#**********************************************************************************************************************************
+# File          :   n1mm_contacts.py
+# Project       :   MiniBook N1MM+ contacts
+# Description   :   N1MM Logger+ contactinfo / contactreplace / contactdelete UDP packets to MiniBook QSOs,
+#                   with an index on the N1MM contact ID so replace and delete find the QSO they belong to
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import xml.etree.ElementTree as ET
+
+from export_watermarks import touch
+
+# Logbook key holding the N1MM contact ID (a GUID, the same on every networked computer)
+N1MM_ID_FIELD = "N1MM ID"
+
+CONTACT_ACTIONS = {"contactinfo": "add", "contactreplace": "replace", "contactdelete": "delete"}
+
+# Fields N1MM+ owns, a contactreplace overwrites these and leaves the rest (Country, references, QSL) alone
+CONTACT_FIELDS = (
+    "Date", "Time", "Callsign", "Name", "My Callsign", "My Operator", "Sent", "Received",
+    "Sent Exchange", "Receive Exchange", "Mode", "Band", "Frequency", "Locator", "Comment",
+)
+
+
+def _decode(data):
+    # N1MM+ declares utf-8, older versions sometimes send Windows-1252
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", "replace")
+
+
+def parse_contact_packet(data, band_for_freq):
+    """
+    Parse one UDP packet. Returns (action, entry) with action "add", "replace" or "delete",
+    or None for other N1MM+ packets (RadioInfo, spots, ...) and packets without an ID.
+    band_for_freq(mhz) gives the band name when the packet has a frequency.
+    """
+    # Most N1MM+ traffic is RadioInfo, only contact packets are parsed
+    if b"<contact" not in data[:200]:
+        return None
+    try:
+        root = ET.fromstring(_decode(data).strip())
+    except ET.ParseError as e:
+        raise ValueError(f"Invalid N1MM+ packet: {e}") from None
+    action = CONTACT_ACTIONS.get(root.tag.lower())
+    if not action:
+        return None
+
+    # Tag names differ in case between N1MM+ versions (ID / id, StationName / stationname)
+    values = {child.tag.lower(): (child.text or "").strip() for child in root}
+    get = values.get
+
+    contact_id = get("id", "")
+    if not contact_id:
+        return None
+
+    entry = {N1MM_ID_FIELD: contact_id, "Callsign": get("call", "").upper()}
+    if action == "delete":
+        return action, entry
+
+    date, _, time = get("timestamp", "").partition(" ")
+    frequency = ""
+    try:
+        # rxfreq / txfreq are in units of 10 Hz
+        frequency = f"{int(get('rxfreq') or get('txfreq') or 0) / 100000:.5f}"
+        if float(frequency) == 0:
+            frequency = ""
+    except ValueError:
+        pass
+    try:
+        band = band_for_freq(float(frequency or get("band", "") or 0))
+    except ValueError:
+        band = ""
+
+    receive_exchange = get("rcvnr", "")
+    if receive_exchange in ("", "0"):
+        receive_exchange = get("exchange1", "") or get("section", "") or get("zone", "").strip("0")
+    sent_exchange = get("sntnr", "")
+    if sent_exchange == "0":
+        sent_exchange = ""
+
+    entry.update({
+        "Date": date,
+        "Time": time[:8],
+        "Name": get("name", ""),
+        "My Callsign": get("mycall", "").upper(),
+        "My Operator": get("operator", "").upper(),
+        "My Locator": "",
+        "My Location": "",
+        "My WWFF": "", "My POTA": "", "My BOTA": "", "My COTA": "", "My IOTA": "", "My SOTA": "", "My WLOTA": "",
+        "Country": "",
+        "Continent": get("continent", "").upper(),
+        "Sent": get("snt", ""),
+        "Received": get("rcv", ""),
+        "Sent Exchange": sent_exchange,
+        "Receive Exchange": receive_exchange,
+        "Mode": get("mode", "").upper(),
+        "Submode": "",
+        "Band": band if band != "OOB" else "",
+        "Frequency": frequency,
+        "Locator": get("gridsquare", "").upper(),
+        "Comment": get("comment", ""),
+        "WWFF": "", "POTA": "", "BOTA": "", "SOTA": "", "IOTA": "", "WLOTA": "",
+        "Satellite": "",
+    })
+    return action, entry
+
+
+class ContactIdIndex:
+    """
+    N1MM contact ID -> logbook entry, for the QSOs that came from N1MM+.
+    """
+    def __init__(self, logbook=()):
+        self.by_id = {}
+        self.rebuild(logbook)
+
+    def rebuild(self, logbook):
+        self.by_id = {qso[N1MM_ID_FIELD]: qso for qso in logbook if qso.get(N1MM_ID_FIELD)}
+
+    def get(self, contact_id):
+        return self.by_id.get(contact_id)
+
+    def add(self, entry):
+        self.by_id[entry[N1MM_ID_FIELD]] = entry
+
+
+def apply_contact_changes(logbook, index, events):
+    """
+    Apply ("replace" | "delete", entry) events to logbook in order, through the ID index.
+    A replace of an unknown ID is returned in "missing" so it can be added instead, a replace
+    of a known ID only overwrites CONTACT_FIELDS.
+    Deletes are collected and removed in one pass over the logbook.
+    Returns a dict with the counts, the entries to add ("missing") and the replaced entries ("changed").
+    """
+    result = {"replaced": 0, "deleted": 0, "unknown": 0, "missing": [], "changed": []}
+    deleted = set()
+
+    for action, entry in events:
+        contact_id = entry[N1MM_ID_FIELD]
+        existing = index.get(contact_id)
+        if action == "delete":
+            if existing is None:
+                result["unknown"] += 1
+                continue
+            deleted.add(id(existing))
+            # Without a sequence number it no longer shows up in "export changes since"
+            touch(existing)
+            del index.by_id[contact_id]
+            result["deleted"] += 1
+        elif existing is None:
+            result["missing"].append(entry)
+        else:
+            for key in CONTACT_FIELDS:
+                existing[key] = entry[key]
+            if entry["Continent"]:
+                existing["Continent"] = entry["Continent"]
+            touch(existing)
+            result["replaced"] += 1
+            result["changed"].append(existing)
+
+    if deleted:
+        logbook[:] = [qso for qso in logbook if id(qso) not in deleted]
+    return result
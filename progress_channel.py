@@ -0,0 +1,183 @@
+#**********************************************************************************************************************************
+# File          :   progress_channel.py
+# Project       :   MiniBook progress window
+# Description   :   Thread safe progress window, worker threads post to a queue that the Tk thread drains
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+
+# Refresh rate of the progress window in milliseconds
+FRAME_INTERVAL_MS = 100
+
+
+class ProgressCancelled(Exception):
+    """Raised in the worker by check_cancelled() after Cancel was pressed."""
+
+
+class ProgressChannel:
+    """
+    Progress window for work running in a worker thread.
+
+    The worker never touches Tk widgets. It posts phase, progress and dialog requests to a
+    queue, and the Tk thread drains that queue with root.after() at a fixed frame rate.
+    Only the latest progress message of a frame is drawn, so a fast worker cannot flood the UI.
+
+    Worker side:  set_phase(), update(), call(), check_cancelled(), finish()
+    """
+    def __init__(self, parent, title, unit="QSOs", cancellable=True):
+        self.parent = parent
+        self.unit = unit
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.start_time = time.monotonic()
+        self.phase_start = self.start_time
+        self.closed = False
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.geometry("420x170")
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+
+        self.phase_label = tk.Label(self.window, text="Starting...", font=('Arial', 10, 'bold'))
+        self.phase_label.pack(pady=(8, 2))
+        self.counter_label = tk.Label(self.window, text="")
+        self.counter_label.pack()
+        self.progress = ttk.Progressbar(self.window, orient="horizontal", length=340, mode="determinate")
+        self.progress.pack(pady=5)
+        self.rate_label = tk.Label(self.window, text="")
+        self.rate_label.pack()
+
+        self.cancel_button = tk.Button(self.window, text="Cancel", width=10, command=self.cancel)
+        if cancellable:
+            self.cancel_button.pack(pady=5)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel if cancellable else lambda: None)
+
+        self.window.after(FRAME_INTERVAL_MS, self._poll)
+
+    # ------------------------------------------------------------------ worker side
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise ProgressCancelled()
+
+    def set_phase(self, phase, maximum=None):
+        """Start a new phase, e.g. "read", "parse", "dedup" or "write"."""
+        self.queue.put(("phase", phase, maximum))
+
+    def update(self, value, maximum=None, count=None):
+        """
+        value/maximum drive the progress bar and ETA (records or bytes),
+        count is the number of records handled so far, used for the rate.
+        """
+        self.queue.put(("progress", value, maximum, count if count is not None else value))
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func in the Tk thread, e.g. a dialog, and wait for its result.
+        """
+        done = threading.Event()
+        result = {}
+        self.queue.put(("call", func, args, kwargs, result, done))
+        done.wait()
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+    def finish(self, callback=None, *args):
+        """Close the window; callback runs afterwards in the Tk thread."""
+        self.queue.put(("finish", callback, args))
+
+    # ------------------------------------------------------------------ Tk side
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state="disabled", text="Cancelling...")
+
+    def _poll(self):
+        if self.closed:
+            return
+
+        last_progress = None
+        while True:
+            try:
+                message = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            kind = message[0]
+            if kind == "progress":
+                last_progress = message
+            elif kind == "phase":
+                if last_progress:
+                    self._draw_progress(*last_progress[1:])
+                    last_progress = None
+                self._draw_phase(message[1], message[2])
+            elif kind == "call":
+                _, func, args, kwargs, result, done = message
+                try:
+                    result["value"] = func(*args, **kwargs)
+                except Exception as e:
+                    result["error"] = e
+                done.set()
+            elif kind == "finish":
+                self._close()
+                callback, args = message[1], message[2]
+                if callback:
+                    callback(*args)
+                return
+
+        if last_progress:
+            self._draw_progress(*last_progress[1:])
+
+        self.window.after(FRAME_INTERVAL_MS, self._poll)
+
+    def _draw_phase(self, phase, maximum):
+        self.phase_start = time.monotonic()
+        self.phase_label.config(text=f"{phase.capitalize()}...")
+        # An indeterminate bar of the previous phase keeps stepping until it is stopped
+        self.progress.stop()
+        self.progress["value"] = 0
+        if maximum:
+            self.progress.config(mode="determinate", maximum=maximum)
+        else:
+            self.progress.config(mode="indeterminate")
+            self.progress.start(20)
+
+    def _draw_progress(self, value, maximum, count):
+        if maximum:
+            self.progress.stop()
+            self.progress.config(mode="determinate", maximum=maximum)
+        self.progress["value"] = value
+
+        elapsed = time.monotonic() - self.phase_start
+        rate = count / elapsed if elapsed > 0 else 0
+        self.counter_label.config(text=f"{count} {self.unit}")
+
+        total = self.progress["maximum"]
+        if value and total and value < total:
+            remaining = elapsed * (total - value) / value
+            eta = time.strftime("%M:%S", time.gmtime(remaining)) if remaining < 3600 else time.strftime("%H:%M:%S", time.gmtime(remaining))
+            self.rate_label.config(text=f"{rate:.0f} {self.unit}/s  -  ETA {eta}")
+        else:
+            self.rate_label.config(text=f"{rate:.0f} {self.unit}/s")
+
+    def _close(self):
+        self.closed = True
+        self.progress.stop()
+        if self.window.winfo_exists():
+            self.window.destroy()
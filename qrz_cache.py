@@ -0,0 +1,93 @@
+#**********************************************************************************************************************************
+# File          :   qrz_cache.py
+# Project       :   MiniBook QRZ lookup cache
+# Description   :   Callsign lookups (name, grid, QTH, QSL manager, ...) kept on disk in SQLite with an in-memory LRU
+#                   in front, so a known call is shown instantly, also without internet. "Not found" is cached too.
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Days a lookup is used before it is refreshed in the background (config: [QRZ] cache_days)
+CACHE_DAYS = 30
+
+# Hours a "not found" is believed before QRZ is asked again
+NEGATIVE_CACHE_HOURS = 24
+
+# Lookups kept in memory, the least recently used is dropped first
+MEMORY_CACHE_SIZE = 1000
+
+# data is None for a cached "not found", stale means it should be refreshed
+CachedLookup = namedtuple("CachedLookup", "data fetched stale")
+
+
+class LookupCache:
+    """
+    get(callsign) returns a CachedLookup or None when the call was never looked up.
+    A stale entry is still returned, the caller shows it and refreshes it when online.
+    Safe to use from the lookup threads, one connection guarded by a lock.
+    """
+    def __init__(self, path, cache_days=CACHE_DAYS, negative_hours=NEGATIVE_CACHE_HOURS, memory_size=MEMORY_CACHE_SIZE):
+        self.ttl = cache_days * 86400
+        self.negative_ttl = negative_hours * 3600
+        self.memory_size = memory_size
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS lookups (callsign TEXT PRIMARY KEY, data TEXT, fetched REAL NOT NULL)"
+        )
+        self.db.commit()
+
+    def _remember(self, callsign, data, fetched):
+        self.memory[callsign] = (data, fetched)
+        self.memory.move_to_end(callsign)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def get(self, callsign):
+        callsign = callsign.strip().upper()
+        with self.lock:
+            cached = self.memory.get(callsign)
+            if cached is not None:
+                self.memory.move_to_end(callsign)
+            else:
+                row = self.db.execute("SELECT data, fetched FROM lookups WHERE callsign = ?", (callsign,)).fetchone()
+                if row is None:
+                    return None
+                cached = (json.loads(row[0]) if row[0] is not None else None, row[1])
+                self._remember(callsign, *cached)
+
+        data, fetched = cached
+        age = time.time() - fetched
+        return CachedLookup(data, fetched, age > (self.ttl if data is not None else self.negative_ttl))
+
+    def put(self, callsign, data):
+        """
+        Store a lookup result, data None records that QRZ does not know the call.
+        """
+        callsign = callsign.strip().upper()
+        fetched = time.time()
+        with self.lock:
+            self._remember(callsign, data, fetched)
+            self.db.execute(
+                "INSERT OR REPLACE INTO lookups (callsign, data, fetched) VALUES (?, ?, ?)",
+                (callsign, json.dumps(data, ensure_ascii=False) if data is not None else None, fetched),
+            )
+            self.db.commit()
+
+    def set_ttl(self, cache_days):
+        self.ttl = cache_days * 86400
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,99 @@
+#**********************************************************************************************************************************
+# File          :   qrz_xml.py
+# Project       :   MiniBook QRZ lookup
+# Description   :   QRZ XML data service client: one keep-alive connection, the session key is kept until QRZ
+#                   reports it expired and the login is then repeated without the caller noticing
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import threading
+import xml.etree.ElementTree as ET
+
+import requests
+
+QRZ_XML_URL = "https://xmldata.qrz.com/xml/current/"
+QRZ_NS = {"qrz": "http://xmldata.qrz.com"}
+
+# Seconds per request, a lookup is one request on a live session
+QRZ_TIMEOUT = 5
+
+QRZ_AGENT = "MiniBook"
+
+CONNECTION_ERROR = "❌ Connection QRZ XML Failed"
+
+
+class QrzXmlSession:
+    """
+    login() returns (key, error) like a fresh login, but only goes to QRZ when there is no key
+    yet or the username / password changed. lookup() returns (Callsign element, error) and logs
+    in again once when QRZ answers that the key is no longer valid.
+    Thread safe: requests on the shared connection are made one at a time.
+    """
+    def __init__(self):
+        self.http = requests.Session()
+        self.http.headers["User-Agent"] = QRZ_AGENT
+        self.lock = threading.Lock()
+        self.key = None
+        self.credentials = None
+        self.stats = {"logins": 0, "lookups": 0}
+
+    def _get(self, params):
+        response = self.http.get(QRZ_XML_URL, params=params, timeout=QRZ_TIMEOUT)
+        response.raise_for_status()
+        return ET.fromstring(response.content)
+
+    def _login(self, username, password):
+        self.key = None
+        self.credentials = (username, password)
+        try:
+            root_xml = self._get({"username": username, "password": password, "agent": QRZ_AGENT})
+        except (requests.exceptions.RequestException, ET.ParseError) as e:
+            print("QRZ login failed:", e)
+            self.credentials = None
+            return None, CONNECTION_ERROR
+        self.stats["logins"] += 1
+        self.key = root_xml.findtext(".//qrz:Key", namespaces=QRZ_NS)
+        error = root_xml.findtext(".//qrz:Error", namespaces=QRZ_NS)
+        if not self.key:
+            self.credentials = None
+        return self.key, error
+
+    def login(self, username, password):
+        with self.lock:
+            if self.key and self.credentials == (username, password):
+                return self.key, None
+            return self._login(username, password)
+
+    def lookup(self, username, password, callsign):
+        with self.lock:
+            if not self.key or self.credentials != (username, password):
+                key, error = self._login(username, password)
+                if not key:
+                    return None, error
+
+            for attempt in range(2):
+                try:
+                    root_xml = self._get({"s": self.key, "callsign": callsign})
+                except (requests.exceptions.RequestException, ET.ParseError) as e:
+                    print(f"Error fetching QRZ XML for {callsign}:", e)
+                    return None, CONNECTION_ERROR
+                self.stats["lookups"] += 1
+
+                element = root_xml.find(".//qrz:Callsign", QRZ_NS)
+                error = root_xml.findtext(".//qrz:Error", namespaces=QRZ_NS)
+                # Without a Key in the answer the session expired (or was invalid), log in and ask again
+                if element is None and not root_xml.findtext(".//qrz:Key", namespaces=QRZ_NS) and attempt == 0:
+                    key, login_error = self._login(username, password)
+                    if not key:
+                        return None, login_error
+                    continue
+                return element, error
+            return None, error
+
+    def close(self):
+        self.http.close()
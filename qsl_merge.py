@@ -0,0 +1,225 @@
+#**********************************************************************************************************************************
+# File          :   qsl_merge.py
+# Project       :   MiniBook QSL merge
+# Description   :   Merge QSL / LoTW / eQSL confirmations from downloaded reports into the QSOs of the logbook
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#                           - Report source (LoTW, eQSL, paper QSL) detected per file, QSL_RCVD merged into its own fields
+#**********************************************************************************************************************************
+
+import os
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from adif_parser import QSL_FIELDS
+from export_watermarks import touch
+from import_files import iter_log_qsos
+
+# A report matches a QSO of the same call, band and mode this many seconds apart (LoTW uses 30 minutes)
+QSL_MATCH_SECONDS = 30 * 60
+
+# Logbook keys merged from a report, every status key has a "<status key> Date" next to it
+QSL_KEYS = tuple(key for _, key in QSL_FIELDS)
+QSL_STATUS_KEYS = ("QSL Rcvd", "LoTW Rcvd", "eQSL Rcvd")
+
+# Status values, a confirmation is never downgraded by a later report
+QSL_STATUS_RANK = {"": 0, "N": 1, "I": 1, "R": 2, "Q": 2, "V": 3, "Y": 4}
+
+# Where a report comes from and the status key its QSL_RCVD / QSLRDATE belong in
+QSL_SOURCES = {"lotw": "LoTW Rcvd", "eqsl": "eQSL Rcvd", "qsl": "QSL Rcvd"}
+QSL_SOURCE_NAMES = {"lotw": "LoTW", "eqsl": "eQSL", "qsl": "Paper QSL"}
+
+# Bytes read from the start of a report to find out where it comes from, the header and first records
+REPORT_SNIFF_SIZE = 64 * 1024
+
+# <PROGRAMID:4>LoTW in the header (ADX: <PROGRAMID>LoTW) or APP_LoTW_* / APP_EQSL_* fields in the records
+_REPORT_SOURCE_RES = (
+    ("lotw", re.compile(rb'<programid(?::\d+(?::\w)?)?>\s*lotw|<app_lotw_|programid="lotw"', re.IGNORECASE)),
+    ("eqsl", re.compile(rb'<programid(?::\d+(?::\w)?)?>\s*eqsl|<app_eqsl_|programid="eqsl', re.IGNORECASE)),
+)
+
+
+def qso_timestamp(qso):
+    """
+    Date and Time of an entry as seconds since 1970 (UTC), None when invalid.
+    """
+    date = qso.get("Date", "")
+    time = qso.get("Time", "")
+    if len(time) == 5:
+        time += ":00"
+    try:
+        return int(datetime.fromisoformat(f"{date}T{time}+00:00").timestamp())
+    except ValueError:
+        return None
+
+
+def qso_modes(qso):
+    return {m for m in (qso.get("Mode", "").upper(), qso.get("Submode", "").upper()) if m}
+
+
+class QslIndex:
+    """
+    Logbook QSOs keyed on (callsign, band), each key holding a time sorted list.
+    Mode is checked on the few candidates inside the time window, so a report with
+    MODE=MFSK SUBMODE=FT4 still finds a QSO logged as FT4.
+    """
+    def __init__(self, logbook):
+        self.logbook = logbook
+        groups = {}
+        for idx, qso in enumerate(logbook):
+            ts = qso_timestamp(qso)
+            if ts is None:
+                continue
+            key = (qso.get("Callsign", "").upper(), qso.get("Band", "").lower())
+            groups.setdefault(key, []).append((ts, idx))
+
+        self.times = {}
+        self.indices = {}
+        for key, rows in groups.items():
+            rows.sort()
+            self.times[key] = [ts for ts, _ in rows]
+            self.indices[key] = [idx for _, idx in rows]
+
+    def candidates(self, report, window=QSL_MATCH_SECONDS):
+        """
+        Logbook indices of the QSOs a report can belong to.
+        """
+        ts = qso_timestamp(report)
+        if ts is None:
+            return []
+        key = (report.get("Callsign", "").upper(), report.get("Band", "").lower())
+        times = self.times.get(key)
+        if not times:
+            return []
+
+        lo = bisect_left(times, ts - window)
+        hi = bisect_right(times, ts + window)
+        modes = qso_modes(report)
+        station = report.get("My Callsign", "").upper()
+
+        found = []
+        for idx in self.indices[key][lo:hi]:
+            qso = self.logbook[idx]
+            if modes and not modes & qso_modes(qso):
+                continue
+            qso_station = qso.get("My Callsign", "").upper()
+            if station and qso_station and station != qso_station:
+                continue
+            found.append(idx)
+        return found
+
+
+def detect_report_source(path):
+    """
+    "lotw", "eqsl" or "qsl" (paper QSLs, e.g. a logging program export) for a report file.
+    """
+    with open(path, "rb") as f:
+        head = f.read(REPORT_SNIFF_SIZE)
+    for source, pattern in _REPORT_SOURCE_RES:
+        if pattern.search(head):
+            return source
+    return "qsl"
+
+
+def report_for_source(report, source):
+    """
+    A LoTW or eQSL report confirms in QSL_RCVD / QSLRDATE, which the parser reads as the paper
+    "QSL Rcvd" fields: move them to the fields of the source. The eQSL inbox download has no
+    QSL_RCVD at all, every record in it is a received eQSL.
+    """
+    status_key = QSL_SOURCES[source]
+    if status_key == "QSL Rcvd":
+        return report
+    status = report.pop("QSL Rcvd", "")
+    date = report.pop("QSL Rcvd Date", "")
+    if source == "eqsl" and not status and not report.get(status_key):
+        status = "Y"
+    if status and not report.get(status_key):
+        report[status_key] = status
+        if date:
+            report[status_key + " Date"] = date
+    return report
+
+
+def iter_qsl_reports(paths, source=None):
+    """
+    Yield (entries, bytes_read) from report files like iter_qso_files(), with the confirmations
+    in the fields of their source. source forces one for all files, None detects it per file.
+    """
+    done = 0
+    for path in paths:
+        file_source = source or detect_report_source(path)
+        batches = iter_log_qsos(path)
+        try:
+            for entries, bytes_read in batches:
+                yield [report_for_source(report, file_source) for report in entries], done + bytes_read
+        finally:
+            batches.close()
+        done += os.path.getsize(path)
+
+
+def merge_confirmation(qso, report):
+    """
+    Copy the QSL fields of a report into a QSO. Returns True when the QSO changed.
+    """
+    changed = False
+    for status_key in QSL_STATUS_KEYS:
+        status = report.get(status_key, "")
+        if not status or QSL_STATUS_RANK.get(status, 0) <= QSL_STATUS_RANK.get(qso.get(status_key, ""), 0):
+            continue
+        qso[status_key] = status
+        date_key = status_key + " Date"
+        if report.get(date_key):
+            qso[date_key] = report[date_key]
+        changed = True
+    return changed
+
+
+class QslMergeResult:
+    def __init__(self):
+        self.matched = 0
+        self.updated = 0
+        self.unmatched = []
+        self.ambiguous = []   # (report, [logbook indices])
+
+    @property
+    def total(self):
+        return self.matched + len(self.unmatched) + len(self.ambiguous)
+
+
+def merge_qsl_reports(logbook, batches, window=QSL_MATCH_SECONDS, progress=None):
+    """
+    Merge confirmation reports into logbook in one pass.
+    batches yields (entries, bytes_read) like iter_qso_files(); progress(bytes_read, count)
+    is called per batch and may raise to abort. Reports without any QSL field are skipped.
+    Changed QSOs are touched, so an incremental export picks them up.
+    """
+    index = QslIndex(logbook)
+    result = QslMergeResult()
+    count = 0
+
+    for entries, bytes_read in batches:
+        for report in entries:
+            if not any(report.get(key) for key in QSL_KEYS):
+                continue
+            found = index.candidates(report, window)
+            if not found:
+                result.unmatched.append(report)
+            elif len(found) > 1:
+                result.ambiguous.append((report, found))
+            else:
+                result.matched += 1
+                qso = logbook[found[0]]
+                if merge_confirmation(qso, report):
+                    touch(qso)
+                    result.updated += 1
+        count += len(entries)
+        if progress:
+            progress(bytes_read, count)
+
+    return result
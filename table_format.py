@@ -0,0 +1,260 @@
+#**********************************************************************************************************************************
+# File          :   table_format.py
+# Project       :   MiniBook CSV / JSON Lines
+# Description   :   Streaming CSV and JSON Lines export and import of logbook entries, with typed columns
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#                           - QSL confirmation columns
+#**********************************************************************************************************************************
+
+import csv
+import gzip
+import io
+import json
+import os
+from datetime import datetime, timezone
+
+from adif_parser import QSL_FIELDS
+
+# Rows written per write() call
+TABLE_WRITE_BATCH_SIZE = 2000
+
+# Entries handed over per batch when reading
+TABLE_READ_BATCH_SIZE = 1000
+
+TABLE_EXTENSIONS = (".csv", ".jsonl")
+
+# Extra column with date and time as one UTC timestamp, "2024-01-01T12:00:00Z"
+DATETIME_COLUMN = "Datetime"
+
+# Logbook fields in the order of a .mbk entry
+LOGBOOK_COLUMNS = (
+    "Date", "Time", "Callsign", "Name", "My Callsign", "My Operator", "My Locator", "My Location",
+    "My WWFF", "My POTA", "My BOTA", "My COTA", "My IOTA", "My SOTA", "My WLOTA", "Country", "Continent",
+    "Sent", "Received", "Sent Exchange", "Receive Exchange", "Mode", "Submode", "Band", "Frequency",
+    "Locator", "Comment", "WWFF", "POTA", "BOTA", "SOTA", "IOTA", "WLOTA", "Satellite"
+)
+
+# QSL confirmation fields, only present on QSOs that have them
+QSL_COLUMNS = tuple(key for _, key in QSL_FIELDS)
+
+# Columns that can be exported, default order
+TABLE_COLUMNS = (DATETIME_COLUMN,) + LOGBOOK_COLUMNS + QSL_COLUMNS
+
+UPPERCASE_COLUMNS = ("Callsign", "My Callsign", "My Operator", "Locator", "Continent")
+
+
+def table_format(path):
+    """
+    ".csv" or ".jsonl" for a table file (optionally .gz), None for anything else.
+    """
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    for ext in TABLE_EXTENSIONS:
+        if name.endswith(ext):
+            return ext
+    return None
+
+
+def check_columns(columns):
+    """
+    The list of columns to export, ValueError for unknown names.
+    """
+    if not columns:
+        return list(TABLE_COLUMNS)
+    unknown = [c for c in columns if c not in TABLE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+    return list(columns)
+
+
+# ------------------------------------------------------------------ typed values
+
+def qso_datetime(qso):
+    """
+    Date and Time of an entry as a UTC datetime, None when either is invalid.
+    """
+    date = qso.get("Date", "")
+    time = qso.get("Time", "")
+    if len(date) != 10 or len(time) != 8:
+        return None
+    try:
+        # fromisoformat() is many times faster than strptime() for this fixed layout
+        return datetime.fromisoformat(f"{date}T{time}+00:00")
+    except ValueError:
+        return None
+
+
+def qso_frequency(qso):
+    try:
+        return float(qso.get("Frequency", ""))
+    except ValueError:
+        return None
+
+
+def iter_rows(qsos, columns):
+    """
+    Generator of typed rows: datetime for Datetime, float (or None) for Frequency, str for the rest.
+    """
+    dt_index = columns.index(DATETIME_COLUMN) if DATETIME_COLUMN in columns else None
+    freq_index = columns.index("Frequency") if "Frequency" in columns else None
+
+    for qso in qsos:
+        get = qso.get
+        row = [get(column, "") for column in columns]
+        if dt_index is not None:
+            row[dt_index] = qso_datetime(qso)
+        if freq_index is not None:
+            row[freq_index] = qso_frequency(qso)
+        yield row
+
+
+def format_datetime(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ") if value else None
+
+
+# ------------------------------------------------------------------ export
+
+def open_table(path, mode):
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="", buffering=1024 * 1024)
+
+
+def write_csv(file, rows, columns, progress=None):
+    writer = csv.writer(file)
+    writer.writerow(columns)
+
+    dt_index = columns.index(DATETIME_COLUMN) if DATETIME_COLUMN in columns else None
+    count = 0
+    batch = []
+    for row in rows:
+        if dt_index is not None:
+            row[dt_index] = format_datetime(row[dt_index])
+        batch.append(row)
+        if len(batch) >= TABLE_WRITE_BATCH_SIZE:
+            writer.writerows(batch)  # None is written as an empty field
+            count += len(batch)
+            batch = []
+            if progress:
+                progress(count)
+    writer.writerows(batch)
+    return count + len(batch)
+
+
+def write_jsonl(file, rows, columns, progress=None):
+    dt_index = columns.index(DATETIME_COLUMN) if DATETIME_COLUMN in columns else None
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    count = 0
+    batch = []
+    for row in rows:
+        if dt_index is not None:
+            row[dt_index] = format_datetime(row[dt_index])
+        batch.append(dumps(dict(zip(columns, row))))
+        if len(batch) >= TABLE_WRITE_BATCH_SIZE:
+            file.write("\n".join(batch) + "\n")
+            count += len(batch)
+            batch = []
+            if progress:
+                progress(count)
+    if batch:
+        file.write("\n".join(batch) + "\n")
+    return count + len(batch)
+
+
+def export_table(path, qsos, columns=None, progress=None):
+    """
+    Export QSOs to CSV or JSON Lines (optionally .gz), the extension of path decides.
+    qsos can be any iterable, rows are generated one at a time and written in batches.
+    progress(count) is called per batch and may raise to abort, the file is then removed.
+    Returns the number of QSOs written.
+    """
+    fmt = table_format(path)
+    if fmt is None:
+        raise ValueError(f"{os.path.basename(path)}: not a .csv or .jsonl file")
+    columns = check_columns(columns)
+    write = write_csv if fmt == ".csv" else write_jsonl
+
+    try:
+        with open_table(path, "w") as f:
+            count = write(f, iter_rows(qsos, columns), columns, progress)
+    except BaseException:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+
+    if progress:
+        progress(count)
+    return count
+
+
+# ------------------------------------------------------------------ import
+
+def row_to_qso(row):
+    """
+    Convert a CSV / JSON Lines row (dict) into a MiniBook entry, None without a callsign.
+    Unknown columns are ignored, Datetime fills Date and Time when those are missing.
+    """
+    entry = dict.fromkeys(LOGBOOK_COLUMNS, "")
+    for column in LOGBOOK_COLUMNS:
+        value = row.get(column)
+        if value is not None:
+            entry[column] = str(value).strip()
+
+    for column in QSL_COLUMNS:
+        value = row.get(column)
+        if value:
+            entry[column] = str(value).strip()
+
+    for column in UPPERCASE_COLUMNS:
+        entry[column] = entry[column].upper()
+    entry["Band"] = entry["Band"].lower()
+
+    if not entry["Callsign"]:
+        return None
+
+    stamp = row.get(DATETIME_COLUMN)
+    if stamp and not (entry["Date"] and entry["Time"]):
+        try:
+            dt = datetime.fromisoformat(str(stamp).replace("Z", "+00:00"))
+            if dt.tzinfo:
+                dt = dt.astimezone(timezone.utc)
+            entry["Date"] = entry["Date"] or dt.strftime("%Y-%m-%d")
+            entry["Time"] = entry["Time"] or dt.strftime("%H:%M:%S")
+        except ValueError:
+            pass
+
+    return entry
+
+
+def iter_table_qsos(path, batch_size=TABLE_READ_BATCH_SIZE):
+    """
+    Yield (entries, bytes_read) batches from a CSV or JSON Lines file (optionally .gz).
+    bytes_read is the position in the file on disk, for progress bars.
+    """
+    fmt = table_format(path)
+    with open(path, "rb") as raw:
+        binary = gzip.GzipFile(fileobj=raw) if path.lower().endswith(".gz") else raw
+        text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+        if fmt == ".csv":
+            rows = csv.DictReader(text)
+        else:
+            rows = (json.loads(line) for line in text if line.strip())
+
+        batch = []
+        for row in rows:
+            entry = row_to_qso(row)
+            if entry:
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    yield batch, raw.tell()
+                    batch = []
+        yield batch, raw.tell()
@@ -0,0 +1,16 @@
+#**********************************************************************************************************************************
+# File          :   conftest.py
+# Project       :   MiniBook tests
+# Description   :   Makes the MiniBook modules in the repository root importable from the tests
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
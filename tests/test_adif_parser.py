@@ -0,0 +1,73 @@
+#**********************************************************************************************************************************
+# File          :   test_adif_parser.py
+# Project       :   MiniBook tests
+# Description   :   ADIF tokenizer: fast path and strict path agree, file streaming encodings
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+from adif_parser import import_format_time, iter_adif_file, scan_adif, scan_adif_record
+
+
+def test_fast_path_cuts_values_at_declared_length():
+    record = "<call:5>PA1ABCX <band:3>20m<eor>\n"
+    text = record * 3
+
+    strict, _ = scan_adif_record(record)
+    records = [fields for fields, _ in scan_adif(text)]
+
+    assert strict == {"call": "PA1AB", "band": "20m"}
+    assert records == [strict] * 3
+
+
+def test_fast_path_matches_strict_parser():
+    records = [
+        "<call:6>PD5DJ  <qso_date:8>20261019<time_on:4>1002<mode:3>FT8<eor>",
+        "<CALL:5:S>DL1AB<name:4>José<comment:3>abcdef <eor>",
+        "<call:4>K1AB<comment:0><band:3>40m<eor>",
+    ]
+    text = "header <adif_ver:5>3.1.4<eoh>\n" + "\n".join(records * 2)
+
+    fast = [fields for fields, _ in scan_adif(text)]
+    strict = []
+    pos = 0
+    while True:
+        fields, pos = scan_adif_record(text, pos)
+        if fields is None:
+            break
+        strict.append(fields)
+
+    assert fast == strict
+    assert len(fast) == 6
+
+
+def test_file_with_utf8_then_latin1_keeps_utf8_part(tmp_path):
+    path = tmp_path / "mixed.adi"
+    path.write_bytes(
+        "<call:5>PA1AB<name:4>José<eor>\n".encode("utf-8")
+        + "<call:5>DL1AB<name:4>René<eor>\n".encode("latin-1")
+    )
+
+    records = [fields for fields, _ in iter_adif_file(path)]
+
+    assert [r["name"] for r in records] == ["José", "René"]
+
+
+def test_latin1_byte_in_later_chunk(tmp_path):
+    path = tmp_path / "mixed.adi"
+    utf8_record = "<call:5>PA1AB<name:4>José<eor>\n".encode("utf-8")
+    path.write_bytes(utf8_record * 50 + "<call:5>DL1AB<name:4>René<eor>\n".encode("latin-1"))
+
+    records = [fields for fields, _ in iter_adif_file(path, chunk_size=64)]
+
+    assert [r["name"] for r in records] == ["José"] * 50 + ["René"]
+
+
+def test_import_format_time_reads_hhmm_as_whole_minutes():
+    assert import_format_time("1002") == "10:02:00"
+    assert import_format_time("100215") == "10:02:15"
+    assert import_format_time("10") is None
@@ -0,0 +1,28 @@
+#**********************************************************************************************************************************
+# File          :   test_adif_writer.py
+# Project       :   MiniBook tests
+# Description   :   ADIF writer: UTF-8 by default, non-ASCII replaced only when asked for
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+from adif_writer import adif_record, station_fields
+
+QSO = {"Callsign": "EA1ABC", "Date": "2026-10-19", "Time": "10:00:00", "Name": "José", "BOTA": "B/EA-001"}
+
+
+def test_record_keeps_utf8():
+    record = adif_record(QSO, station_fields({"Name": "Björn"}))
+    assert "<name:4>José" in record
+    assert "<station_name:5>Björn" in record
+
+
+def test_ascii_only_replaces_non_ascii():
+    record = adif_record(QSO, station_fields({"Name": "Björn"}, ascii_only=True), ascii_only=True)
+    assert "<name:4>Jos?" in record
+    assert "<station_name:5>Bj?rn" in record
+    assert "<sig_info:8>B/EA-001" in record
@@ -0,0 +1,59 @@
+#**********************************************************************************************************************************
+# File          :   test_adx_format.py
+# Project       :   MiniBook tests
+# Description   :   ADX import and export: .adi -> .adx -> .adi round trip keeps every QSO field
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+from adif_parser import iter_adif_qsos
+from adif_writer import write_adif
+from adx_format import iter_adx_qsos, write_adx
+
+ADIF = """Exported by another logger
+<ADIF_VER:5>3.1.0 <EOH>
+<CALL:6>DL1ABC <QSO_DATE:8>20261019 <TIME_ON:6>100215 <BAND:3>20m <MODE:3>FT8 <FREQ:6>14.074
+<RST_SENT:3>-10 <RST_RCVD:3>-12 <NAME:4>José <GRIDSQUARE:6>JO62QM <COMMENT:11>Tom & Jerry <EOR>
+<CALL:5>PA1AB <QSO_DATE:8>20261019 <TIME_ON:4>1105 <BAND:3>40m <MODE:3>SSB <FREQ:5>7.150
+<RST_SENT:2>59 <RST_RCVD:2>57 <COMMENT:7><QSL> 1 <EOR>
+"""
+
+
+def read_qsos(reader, path):
+    return [entry for batch, _ in reader(str(path)) for entry in batch]
+
+
+def test_adi_adx_adi_round_trip(tmp_path):
+    source = tmp_path / "source.adi"
+    source.write_text(ADIF, encoding="utf-8")
+    qsos = read_qsos(iter_adif_qsos, source)
+    assert [qso["Callsign"] for qso in qsos] == ["DL1ABC", "PA1AB"]
+
+    adx = tmp_path / "export.adx"
+    with open(adx, "w", encoding="utf-8") as f:
+        assert write_adx(f, qsos) == 2
+    from_adx = read_qsos(iter_adx_qsos, adx)
+    assert from_adx == qsos
+
+    adi = tmp_path / "export.adi"
+    with open(adi, "w", encoding="utf-8") as f:
+        write_adif(f, from_adx)
+    assert read_qsos(iter_adif_qsos, adi) == qsos
+
+
+def test_adx_keeps_station_fields(tmp_path):
+    qsos = [{"Callsign": "DL1ABC", "Date": "2026-10-19", "Time": "10:02:00", "Band": "20m", "Mode": "FT8",
+             "My Callsign": "PD5DJ"}]
+    adx = tmp_path / "export.adx"
+    with open(adx, "w", encoding="utf-8") as f:
+        write_adx(f, qsos, station={"Name": "Bjorn", "City": "Ouddorp"})
+
+    text = adx.read_text(encoding="utf-8")
+    assert "<STATION_CALLSIGN>PD5DJ</STATION_CALLSIGN>" in text
+    assert "<STATION_NAME>Bjorn</STATION_NAME>" in text
+    assert "<STATION_CITY>Ouddorp</STATION_CITY>" in text
+    assert read_qsos(iter_adx_qsos, adx)[0]["My Callsign"] == "PD5DJ"
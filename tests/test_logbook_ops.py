@@ -0,0 +1,108 @@
+#**********************************************************************************************************************************
+# File          :   test_logbook_ops.py
+# Project       :   MiniBook tests
+# Description   :   Logbook engine: import applied to a logbook that changed while the preview was open,
+#                   re-import of an exported logbook, countries of imported QSOs
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import copy
+import json
+
+from dxcc_resolver import load_resolver
+from logbook_ops import apply_import, classify_import, load_logbook, rebase_import
+from minibook_cli import main as cli
+
+
+def qso(call, time, **fields):
+    entry = {"Callsign": call, "Date": "2026-10-19", "Time": time, "Band": "20m", "Mode": "FT8"}
+    entry.update(fields)
+    return entry
+
+
+def write_adif(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<EOH>\n")
+        for entry in entries:
+            time = entry["Time"].replace(":", "")
+            f.write(
+                f"<CALL:{len(entry['Callsign'])}>{entry['Callsign']} <QSO_DATE:8>20261019 <TIME_ON:6>{time} "
+                f"<BAND:3>20m <MODE:3>FT8 <NAME:{len(entry['Name'])}>{entry['Name']} <EOR>\n"
+            )
+
+
+def test_rebase_keeps_qsos_logged_during_preview(tmp_path):
+    on_disk = [qso("PA1AB", "10:00:00", Name="Old")]
+    adif = tmp_path / "import.adi"
+    write_adif(adif, [qso("DL1ABC", "11:00:00", Name="Hans"), qso("PA1AB", "10:00:00", Name="Piet")])
+
+    # Classified against the copy loaded when the import started
+    logbook = copy.deepcopy(on_disk)
+    preview, added = classify_import(logbook, [str(adif)])
+    assert added == 1
+    assert preview.counts["conflict"] == 1
+    imported = logbook[len(on_disk):]
+
+    # Meanwhile a QSO was logged, and DL1ABC was logged by hand as well
+    on_disk.append(qso("G4XYZ", "12:00:00"))
+    on_disk.append(qso("DL1ABC", "11:00:00", Name="Hans"))
+
+    added = rebase_import(on_disk, imported, preview)
+    assert added == 0
+    apply_import(on_disk, preview, "overwrite")
+
+    assert [e["Callsign"] for e in on_disk] == ["PA1AB", "G4XYZ", "DL1ABC"]
+    assert on_disk[0]["Name"] == "Piet"
+
+
+def test_overwrite_skips_qso_deleted_during_preview(tmp_path):
+    adif = tmp_path / "import.adi"
+    write_adif(adif, [qso("PA1AB", "10:00:00", Name="Piet")])
+
+    logbook = [qso("PA1AB", "10:00:00", Name="Old")]
+    preview, _ = classify_import(logbook, [str(adif)])
+
+    on_disk = []
+    rebase_import(on_disk, logbook[1:], preview)
+    assert apply_import(on_disk, preview, "overwrite") == (0, 0)
+    assert on_disk == []
+
+
+def test_reimport_of_export_is_exact_and_keeps_station_fields(tmp_path, capsys):
+    logbook = tmp_path / "log.mbk"
+    entry = qso("PA1AB", "10:00:00", Name="Piet", Frequency="14.074", Sent="-10", Received="-12",
+                Country="Netherlands", Continent="EU")
+    entry.update({"My Callsign": "PD5DJ", "My Locator": "JO22LB", "My Location": "Home"})
+    logbook.write_text(json.dumps({"Station": {"Callsign": "PD5DJ", "Locator": "JO22LB"}, "Logbook": [entry]}))
+    exported = tmp_path / "export.adi"
+
+    assert cli(["export", str(logbook), str(exported)]) == 0
+    assert cli(["import", str(logbook), str(exported), "--duplicates", "overwrite"]) == 0
+
+    assert "1 duplicate, 0 duplicate with changes" in capsys.readouterr().out
+    qsos = load_logbook(logbook)["Logbook"]
+    assert len(qsos) == 1
+    assert qsos[0]["My Locator"] == "JO22LB"
+    assert qsos[0]["My Location"] == "Home"
+
+
+def test_import_fills_missing_countries(tmp_path):
+    cty = tmp_path / "cty.dat"
+    cty.write_text(
+        "Netherlands:              14:  27:  EU:   52.28:    -5.47:    -1.0:  PA:\n    PA,PB,PD;\n"
+        "Fed. Rep. of Germany:     14:  28:  EU:   51.00:   -10.00:    -1.0:  DL:\n    DA,DL;\n"
+    )
+    adif = tmp_path / "import.adi"
+    write_adif(adif, [qso("DL1ABC", "11:00:00", Name="Hans"), qso("PA1AB", "10:00:00", Name="Piet")])
+
+    logbook = [qso("PA1AB", "10:00:00", Name="Old")]
+    preview, added = classify_import(logbook, [str(adif)], resolver=load_resolver(cty))
+    apply_import(logbook, preview, "add", load_resolver(cty))
+
+    assert [(e["Callsign"], e.get("Country")) for e in logbook] == [
+        ("PA1AB", None), ("DL1ABC", "Fed. Rep. of Germany"), ("PA1AB", "Netherlands")]
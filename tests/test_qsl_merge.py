@@ -0,0 +1,125 @@
+#**********************************************************************************************************************************
+# File          :   test_qsl_merge.py
+# Project       :   MiniBook tests
+# Description   :   QSL merge: report source detection, LoTW / eQSL confirmations in their own fields
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+from qsl_merge import detect_report_source, iter_qsl_reports, merge_qsl_reports
+
+# As downloaded from LoTW (lotwreport.adi, QSL ONLY: NO), comments after the values included
+LOTW_REPORT = """ARRL Logbook of the World Status Report
+Generated at 2026-10-19 08:12:45
+for pd5dj
+Query:
+    OWN CALLSIGN: PD5DJ
+     QSL ONLY: NO
+ QSO RX SINCE: 2026-10-01 00:00:00 (user supplied value)
+
+<PROGRAMID:4>LoTW
+<APP_LoTW_LASTQSORX:19>2026-10-18 21:40:02
+<APP_LoTW_NUMREC:1>2
+
+<eoh>
+
+<APP_LoTW_OWNCALL:5>PD5DJ
+<STATION_CALLSIGN:5>PD5DJ
+<MY_GRIDSQUARE:6>JO22LB
+<CALL:6>DL1ABC
+<BAND:3>20M
+<FREQ:8>14.07400
+<MODE:3>FT8
+<APP_LoTW_MODEGROUP:4>DATA
+<QSO_DATE:8>20261005
+<APP_LoTW_RXQSO:19>2026-10-05 19:02:11 // QSO record inserted/modified at LoTW
+<TIME_ON:6>183015
+<APP_LoTW_QSO_TIMESTAMP:20>2026-10-05T18:30:15Z // QSO Date & Time; ISO-8601
+<QSL_RCVD:1>Y
+<QSLRDATE:8>20261012
+<APP_LoTW_RXQSL:19>2026-10-12 07:44:03 // QSL record matched/modified at LoTW
+<eor>
+
+<APP_LoTW_OWNCALL:5>PD5DJ
+<STATION_CALLSIGN:5>PD5DJ
+<CALL:4>G4XY
+<BAND:3>40M
+<FREQ:8>7.07400
+<MODE:3>FT8
+<APP_LoTW_MODEGROUP:4>DATA
+<QSO_DATE:8>20261006
+<TIME_ON:6>201000
+<APP_LoTW_QSO_TIMESTAMP:20>2026-10-06T20:10:00Z // QSO Date & Time; ISO-8601
+<QSL_RCVD:1>N
+<eor>
+"""
+
+# eQSL inbox download: no QSL_RCVD, every record is a received eQSL
+EQSL_INBOX = """Received eQSLs for PD5DJ
+<PROGRAMID:21>eQSL.cc DownloadInBox
+<ADIF_Ver:1>1
+<EOH>
+<CALL:6>DL1ABC<QSO_DATE:8>20261005<TIME_ON:4>1830<BAND:3>20M<MODE:3>FT8<RST_SENT:3>-10<QSL_SENT:1>Y<QSL_SENT_VIA:1>E<APP_EQSL_AG:1>Y<GRIDSQUARE:6>JO62QM<EOR>
+"""
+
+
+def logbook():
+    return [
+        {"Callsign": "DL1ABC", "Date": "2026-10-05", "Time": "18:31:00", "Band": "20m", "Mode": "FT8", "My Callsign": "PD5DJ"},
+        {"Callsign": "G4XY", "Date": "2026-10-06", "Time": "20:10:00", "Band": "40m", "Mode": "FT8", "My Callsign": "PD5DJ"},
+    ]
+
+
+def test_detect_report_source(tmp_path):
+    lotw = tmp_path / "lotwreport.adi"
+    lotw.write_text(LOTW_REPORT)
+    eqsl = tmp_path / "inbox.adi"
+    eqsl.write_text(EQSL_INBOX)
+    paper = tmp_path / "cards.adi"
+    paper.write_text("<EOH>\n<CALL:4>G4XY<QSO_DATE:8>20261006<TIME_ON:4>2010<BAND:3>40M<MODE:3>FT8<QSL_RCVD:1>Y<EOR>\n")
+
+    assert detect_report_source(lotw) == "lotw"
+    assert detect_report_source(eqsl) == "eqsl"
+    assert detect_report_source(paper) == "qsl"
+
+
+def test_lotw_report_sets_lotw_fields(tmp_path):
+    report = tmp_path / "lotwreport.adi"
+    report.write_text(LOTW_REPORT)
+    qsos = logbook()
+
+    result = merge_qsl_reports(qsos, iter_qsl_reports([str(report)]))
+
+    assert result.matched == 2
+    assert result.updated == 2
+    assert qsos[0]["LoTW Rcvd"] == "Y"
+    assert qsos[0]["LoTW Rcvd Date"] == "2026-10-12"
+    assert qsos[1]["LoTW Rcvd"] == "N"
+    assert not any("QSL Rcvd" in qso for qso in qsos)
+
+
+def test_eqsl_inbox_sets_eqsl_fields(tmp_path):
+    report = tmp_path / "inbox.adi"
+    report.write_text(EQSL_INBOX)
+    qsos = logbook()
+
+    result = merge_qsl_reports(qsos, iter_qsl_reports([str(report)]))
+
+    assert result.updated == 1
+    assert qsos[0]["eQSL Rcvd"] == "Y"
+    assert "QSL Rcvd" not in qsos[0]
+
+
+def test_source_given_overrides_detection(tmp_path):
+    report = tmp_path / "lotwreport.adi"
+    report.write_text(LOTW_REPORT)
+    qsos = logbook()
+
+    merge_qsl_reports(qsos, iter_qsl_reports([str(report)], "qsl"))
+
+    assert qsos[0]["QSL Rcvd"] == "Y"
+    assert "LoTW Rcvd" not in qsos[0]
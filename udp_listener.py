@@ -0,0 +1,246 @@
+#**********************************************************************************************************************************
+# File          :   udp_listener.py
+# Project       :   MiniBook UDP listener
+# Description   :   One selector based thread that receives on several UDP endpoints (unicast, broadcast, multicast)
+#                   and hands every datagram to the handler of the endpoint's protocol, with counters per source
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import ipaddress
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# Largest UDP payload
+MAX_DATAGRAM = 65535
+
+# Datagrams read from one socket before the others get their turn
+MAX_READS_PER_WAKEUP = 64
+
+# Seconds the selector waits, also how fast stop() is noticed
+SELECT_TIMEOUT = 0.5
+
+# Receive buffer asked from the OS per socket, absorbs bursts while a handler is busy
+RECEIVE_BUFFER = 1024 * 1024
+
+# Remote addresses remembered per endpoint (counters) and for replies, the least recently heard is dropped first
+MAX_SOURCES = 256
+
+
+class UdpEndpoint:
+    """
+    One address to listen on.
+    host is the bind address, or a multicast group that is joined on interface.
+    protocol selects the handler, e.g. "wsjtx".
+    """
+    def __init__(self, host, port, protocol="wsjtx", interface="0.0.0.0", name=None):
+        self.host = host
+        self.port = int(port)
+        self.protocol = protocol
+        self.interface = interface
+        self.name = name or f"{host}:{port}"
+        self.sock = None
+        self.stats = Counter()
+        self.sources = OrderedDict()   # remote address -> Counter, most recently heard last
+        self.lock = threading.Lock()   # count() runs in the listener thread, stats are read from the Tk thread
+
+    @property
+    def is_multicast(self):
+        try:
+            return ipaddress.ip_address(self.host).is_multicast
+        except ValueError:
+            return False
+
+    def open(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER)
+            if self.is_multicast:
+                # Several programs may listen to the same group and port
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                sock.bind(("", self.port))
+                membership = struct.pack("4s4s", socket.inet_aton(self.host), socket.inet_aton(self.interface))
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            else:
+                sock.bind((self.host, self.port))
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        return sock
+
+    def close(self):
+        if self.sock:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def count(self, addr, size, error=False):
+        with self.lock:
+            self.stats["datagrams"] += 1
+            self.stats["bytes"] += size
+            source = self.sources.get(addr)
+            if source is None:
+                source = self.sources[addr] = Counter()
+                if len(self.sources) > MAX_SOURCES:
+                    self.sources.popitem(last=False)
+            else:
+                self.sources.move_to_end(addr)
+            source["datagrams"] += 1
+            source["bytes"] += size
+            source["last_seen"] = time.time()
+            if error:
+                self.stats["errors"] += 1
+                source["errors"] += 1
+
+    def add(self, name, value=1):
+        """
+        Count something else in the totals, for the protocol handlers.
+        """
+        with self.lock:
+            self.stats[name] += value
+
+    def snapshot(self):
+        """
+        (totals, {address: counters}) copied under the lock.
+        """
+        with self.lock:
+            return dict(self.stats), {addr: dict(c) for addr, c in self.sources.items()}
+
+
+def parse_endpoints(text, default_protocol="wsjtx"):
+    """
+    Endpoints from a config value: "127.0.0.1:2333; 0.0.0.0:2237; 224.0.0.73:2237@192.168.1.10; n1mm/0.0.0.0:12060"
+    An optional "<protocol>/" prefix selects the handler, "@interface" picks the interface of a multicast group.
+    Raises ValueError for entries that cannot be parsed.
+    """
+    endpoints = []
+    for item in text.replace(",", ";").split(";"):
+        item = item.strip()
+        if not item:
+            continue
+        protocol = default_protocol
+        if "/" in item:
+            protocol, item = item.split("/", 1)
+        interface = "0.0.0.0"
+        if "@" in item:
+            item, interface = item.split("@", 1)
+        host, sep, port = item.rpartition(":")
+        if not sep or not port.isdigit() or not 0 < int(port) <= 65535:
+            raise ValueError(f"Invalid UDP endpoint '{item}', use host:port")
+        endpoints.append(UdpEndpoint(host or "0.0.0.0", int(port), protocol.strip().lower(), interface.strip()))
+    return endpoints
+
+
+class UdpListener:
+    """
+    Receives on all endpoints in one thread with a selector. handlers maps protocol to
+    handler(data, addr, endpoint). Replies go out through send(data, addr), on the socket
+    that last received from addr, so WSJT-X sees them come from the port it talks to.
+    """
+    def __init__(self, endpoints, handlers):
+        self.endpoints = list(endpoints)
+        self.handlers = handlers
+        self.selector = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.reply_socket = OrderedDict()   # remote address -> socket, at most MAX_SOURCES
+        self.reply_lock = threading.Lock()
+
+    def start(self):
+        """
+        Open all endpoints and start the thread. Endpoints that fail to open are reported and skipped,
+        returns the list of (endpoint, error) for those.
+        """
+        self.selector = selectors.DefaultSelector()
+        failed = []
+        for endpoint in self.endpoints:
+            try:
+                self.selector.register(endpoint.open(), selectors.EVENT_READ, endpoint)
+                print(f"Listening for {endpoint.protocol} on {endpoint.name}")
+            except OSError as e:
+                print(f"Cannot listen on {endpoint.name}: {e}")
+                failed.append((endpoint, e))
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return failed
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                if not self.selector.get_map():
+                    self.stop_event.wait(SELECT_TIMEOUT)
+                    continue
+                for key, _ in self.selector.select(SELECT_TIMEOUT):
+                    self.read(key.data)
+        finally:
+            for endpoint in self.endpoints:
+                endpoint.close()
+            self.selector.close()
+            print("Listener terminated.")
+
+    def read(self, endpoint):
+        handler = self.handlers.get(endpoint.protocol)
+        for _ in range(MAX_READS_PER_WAKEUP):
+            try:
+                data, addr = endpoint.sock.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # E.g. ICMP port unreachable of an earlier reply on Windows
+                endpoint.add("socket_errors")
+                print(f"Socket-error on {endpoint.name}: {e}")
+                return
+
+            with self.reply_lock:
+                self.reply_socket[addr] = endpoint.sock
+                self.reply_socket.move_to_end(addr)
+                if len(self.reply_socket) > MAX_SOURCES:
+                    self.reply_socket.popitem(last=False)
+            error = False
+            if handler:
+                try:
+                    handler(data, addr, endpoint)
+                except Exception as e:
+                    error = True
+                    print(f"Error handling datagram from {addr} on {endpoint.name}: {e}")
+            endpoint.count(addr, len(data), error)
+
+    def send(self, data, addr):
+        with self.reply_lock:
+            sock = self.reply_socket.get(addr)
+        if sock is None:
+            sock = next((e.sock for e in self.endpoints if e.sock), None)
+        if sock is not None:
+            sock.sendto(data, addr)
+
+    def stats(self):
+        """
+        Counters per endpoint and per source address, for display.
+        """
+        result = {}
+        for endpoint in self.endpoints:
+            total, sources = endpoint.snapshot()
+            result[endpoint.name] = {
+                "protocol": endpoint.protocol,
+                "total": total,
+                "sources": {f"{a[0]}:{a[1]}": c for a, c in sources.items()},
+            }
+        return result
@@ -0,0 +1,115 @@
+#**********************************************************************************************************************************
+# File          :   udp_relay.py
+# Project       :   MiniBook UDP relay
+# Description   :   Forwards received datagrams unchanged to other programs (GridTracker, loggers, ...) without ever
+#                   blocking the listener, with counters per target
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import socket
+import threading
+import time
+from collections import Counter
+
+# Send buffer of the relay socket, a target that is slow to accept only fills this
+RELAY_SEND_BUFFER = 1024 * 1024
+
+# A target that fails this many times in a row is skipped for RELAY_BACKOFF_SECONDS
+RELAY_MAX_ERRORS = 5
+RELAY_BACKOFF_SECONDS = 10
+
+
+class RelayTarget:
+    def __init__(self, host, port):
+        self.name = f"{host}:{port}"
+        # Resolved once here, a DNS lookup never happens while relaying
+        self.addr = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+        self.stats = Counter()
+        self.lock = threading.Lock()   # forward() runs in the listener thread, stats are read from the Tk thread
+        self.errors_in_row = 0
+        self.suspended_until = 0
+
+    def add(self, name, value=1):
+        with self.lock:
+            self.stats[name] += value
+
+    def sent(self, size):
+        with self.lock:
+            self.stats["sent"] += 1
+            self.stats["bytes"] += size
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+def parse_targets(text):
+    """
+    Relay targets from a config value: "127.0.0.1:2238; 192.168.1.20:2237".
+    Raises ValueError for entries that cannot be parsed or resolved.
+    """
+    targets = []
+    for item in text.replace(",", ";").split(";"):
+        item = item.strip()
+        if not item:
+            continue
+        host, sep, port = item.rpartition(":")
+        if not sep or not host or not port.isdigit() or not 0 < int(port) <= 65535:
+            raise ValueError(f"Invalid relay target '{item}', use host:port")
+        try:
+            targets.append(RelayTarget(host, int(port)))
+        except OSError as e:
+            raise ValueError(f"Relay target '{item}': {e}") from None
+    return targets
+
+
+class UdpRelay:
+    """
+    Sends every datagram given to forward() as raw bytes to all targets, from one non-blocking socket.
+    A full send buffer or an error counts as a drop for that target only; a target that keeps
+    failing is skipped for a while, so a dead target costs nothing per datagram.
+    """
+    def __init__(self, targets):
+        self.targets = list(targets)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, RELAY_SEND_BUFFER)
+        self.sock.setblocking(False)
+
+    def forward(self, data):
+        now = None
+        for target in self.targets:
+            if target.suspended_until:
+                now = now or time.monotonic()
+                if now < target.suspended_until:
+                    target.add("dropped")
+                    continue
+                target.suspended_until = 0
+
+            try:
+                self.sock.sendto(data, target.addr)
+            except (BlockingIOError, InterruptedError):
+                target.add("dropped")
+                continue
+            except OSError as e:
+                target.add("dropped")
+                target.add("errors")
+                target.errors_in_row += 1
+                if target.errors_in_row >= RELAY_MAX_ERRORS:
+                    target.suspended_until = time.monotonic() + RELAY_BACKOFF_SECONDS
+                    target.errors_in_row = 0
+                    print(f"Relay to {target.name} failing ({e}), paused for {RELAY_BACKOFF_SECONDS}s")
+                continue
+
+            target.errors_in_row = 0
+            target.sent(len(data))
+
+    def stats(self):
+        return {target.name: target.snapshot() for target in self.targets}
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,328 @@
+#**********************************************************************************************************************************
+# File          :   udp_replay.py
+# Project       :   MiniBook UDP capture / replay
+# Description   :   Load test for the UDP listener, everything on localhost, no GUI.
+#                   python udp_replay.py record capture.mbcap [--listen 127.0.0.1:2237] [--forward 127.0.0.1:2333]
+#                   python udp_replay.py generate capture.mbcap --qsos 1000 [--rate 10]
+#                   python udp_replay.py replay capture.mbcap --logbook my.mbk [--to 127.0.0.1:2333] [--speed 1|10|max]
+#                   Replay reports accepted, dropped and duplicated QSOs and the latency from datagram to saved .mbk
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import argparse
+import json
+import os
+import socket
+import struct
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from adif_parser import iter_adif_records, import_format_date, import_format_time
+from logbook_index import qso_key
+from n1mm_contacts import parse_contact_packet
+from wsjtx_protocol import decode_message, encode_message, is_wsjtx_datagram, WsjtxProtocolError, LOGGED_ADIF
+
+# Capture file: this line, then per datagram a little endian (receive time, length) header and the raw bytes
+CAPTURE_MAGIC = b"MiniBook UDP capture 1\n"
+_RECORD = struct.Struct("<dI")
+
+# How often replay looks at the .mbk file for saved QSOs, also the resolution of the latency
+POLL_SECONDS = 0.02
+
+# Seconds replay keeps waiting for QSOs that are not saved yet after the last datagram
+SETTLE_SECONDS = 10
+
+
+def parse_address(value):
+    host, sep, port = value.rpartition(":")
+    if not sep or not port.isdigit():
+        raise argparse.ArgumentTypeError(f"'{value}' is not host:port")
+    return host or "127.0.0.1", int(port)
+
+
+def parse_speed(value):
+    # 1, 10, ... times real time, or "max" (0) to send as fast as the socket takes them
+    if value == "max":
+        return 0
+    try:
+        speed = float(value.rstrip("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a speed, use e.g. 1, 10 or max") from None
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be above 0")
+    return speed
+
+
+# ------------------------------------------------------------------ capture file
+
+def write_capture_record(file, received_at, data):
+    file.write(_RECORD.pack(received_at, len(data)))
+    file.write(data)
+
+
+def iter_capture(path):
+    """
+    (received_at, datagram) for every datagram in a capture file.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a MiniBook UDP capture")
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            received_at, size = _RECORD.unpack(header)
+            data = f.read(size)
+            if len(data) < size:
+                return  # Recording was cut off halfway a datagram
+            yield received_at, data
+
+
+def datagram_qso_key(data):
+    """
+    qso_key() of the QSO a datagram logs, None for datagrams that log nothing (Status, Decode, RadioInfo ...).
+    Time and date are taken the way MiniBook's listener takes them, so the key matches the saved QSO.
+    """
+    if is_wsjtx_datagram(data):
+        try:
+            message = decode_message(data)
+        except (WsjtxProtocolError, struct.error, UnicodeDecodeError):
+            return None
+        if message.type != LOGGED_ADIF:
+            return None
+        text = message.fields.get("adif", "")
+    elif b"<contact" in data[:200]:
+        try:
+            contact = parse_contact_packet(data, lambda frequency: "")
+        except ValueError:
+            return None
+        if contact is None or contact[0] == "delete":
+            return None
+        return qso_key(contact[1])
+    else:
+        text = data.decode("utf-8", "replace")
+
+    record = next(iter_adif_records(text), {})
+    if not record.get("call"):
+        return None
+    return qso_key({
+        "Callsign": record["call"].upper(),
+        "Date": import_format_date(record.get("qso_date", "")) or "",
+        "Time": import_format_time(record.get("time_off", "")) or import_format_time(record.get("time_on", "")) or "",
+    })
+
+
+# ------------------------------------------------------------------ record / generate
+
+def cmd_record(args):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024 * 1024)
+    sock.bind(args.listen)
+    sock.settimeout(0.5)
+    forward = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) if args.forward else None
+
+    print(f"Recording {args.listen[0]}:{args.listen[1]} to {args.capture}"
+          + (f", forwarding to {args.forward[0]}:{args.forward[1]}" if forward else "") + ", Ctrl+C stops")
+    count = qsos = 0
+    end = time.time() + args.duration if args.duration else None
+    with open(args.capture, "wb") as f:
+        f.write(CAPTURE_MAGIC)
+        try:
+            while end is None or time.time() < end:
+                try:
+                    data, _ = sock.recvfrom(65535)
+                except socket.timeout:
+                    continue
+                write_capture_record(f, time.time(), data)
+                if forward:
+                    forward.sendto(data, args.forward)
+                count += 1
+                qsos += datagram_qso_key(data) is not None
+        except KeyboardInterrupt:
+            pass
+    sock.close()
+    print(f"{count} datagrams recorded, {qsos} with a logged QSO")
+    return 0
+
+
+def cmd_generate(args):
+    """
+    Synthetic capture: Logged ADIF messages of unique calls, --rate per second, every --resend'th sent twice.
+    """
+    start = datetime.now(timezone.utc).replace(microsecond=0)
+    received_at = time.time()
+    with open(args.capture, "wb") as f:
+        f.write(CAPTURE_MAGIC)
+        for i in range(args.qsos):
+            when = start + timedelta(seconds=i)
+            fields = {
+                "call": f"PA{i // 26 // 26 % 10}{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}{chr(65 + i // 2600 % 26)}",
+                "qso_date": when.strftime("%Y%m%d"), "time_on": when.strftime("%H%M%S"),
+                "time_off": when.strftime("%H%M%S"), "band": "20m", "freq": "14.074", "mode": "FT8",
+                "rst_sent": "-10", "rst_rcvd": "-12", "station_callsign": args.my_call,
+            }
+            adif = "".join(f"<{tag}:{len(value)}>{value}" for tag, value in fields.items()) + "<eor>"
+            writer = encode_message(LOGGED_ADIF, "WSJT-X")
+            writer.utf8(adif)
+            data = writer.data()
+            write_capture_record(f, received_at, data)
+            if args.resend and i % args.resend == 0:
+                write_capture_record(f, received_at, data)
+            received_at += 1 / args.rate
+    print(f"{args.qsos} QSOs written to {args.capture}")
+    return 0
+
+
+# ------------------------------------------------------------------ replay
+
+def logbook_keys(path):
+    """
+    Counter of qso_key() over the saved logbook, None while MiniBook is halfway writing it.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return Counter(qso_key(entry) for entry in data.get("Logbook", []))
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+
+def cmd_replay(args):
+    capture = list(iter_capture(args.capture))
+    if not capture:
+        print("Capture holds no datagrams")
+        return 1
+
+    before = logbook_keys(args.logbook)
+    if before is None:
+        raise ValueError(f"Cannot read logbook {args.logbook}")
+    keys = [datagram_qso_key(data) for _, data in capture]
+    wanted = {key for key in keys if key}
+    already_logged = {key for key in wanted if before[key]}
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1024 * 1024)
+    speed = "max" if not args.speed else f"{args.speed:g}x"
+    print(f"Replaying {len(capture)} datagrams ({len(wanted)} QSOs) to {args.to[0]}:{args.to[1]} at {speed}")
+
+    sent_at = {}
+    saved_at = {}
+    pending = set(wanted) - already_logged
+    last_mtime = os.stat(args.logbook).st_mtime_ns
+    next_poll = 0
+
+    def poll():
+        # Note the time every pending QSO first shows up in the saved logbook
+        nonlocal last_mtime
+        mtime = os.stat(args.logbook).st_mtime_ns
+        if mtime == last_mtime:
+            return
+        after = logbook_keys(args.logbook)
+        if after is None:
+            return  # Read again on the next poll
+        last_mtime = mtime
+        now = time.time()
+        for key in [key for key in pending if after[key] > before[key]]:
+            saved_at[key] = now
+            pending.discard(key)
+
+    first_time = capture[0][0]
+    start = time.time()
+    for (received_at, data), key in zip(capture, keys):
+        if args.speed:
+            delay = start + (received_at - first_time) / args.speed - time.time()
+            while delay > 0:
+                time.sleep(min(delay, POLL_SECONDS))
+                poll()
+                delay = start + (received_at - first_time) / args.speed - time.time()
+        sock.sendto(data, args.to)
+        if key and key not in sent_at:
+            sent_at[key] = time.time()
+        if time.time() >= next_poll:
+            poll()
+            next_poll = time.time() + POLL_SECONDS
+    send_seconds = time.time() - start
+
+    # Wait until every QSO is saved, or nothing more arrives for --settle seconds
+    deadline = time.time() + args.settle
+    while pending and time.time() < deadline:
+        waiting = len(pending)
+        time.sleep(POLL_SECONDS)
+        poll()
+        if len(pending) < waiting:
+            deadline = time.time() + args.settle
+    sock.close()
+
+    after = logbook_keys(args.logbook) or Counter()
+    accepted = len(saved_at)
+    duplicated = sum(after[key] - max(before[key], 1) for key in wanted if after[key] > max(before[key], 1))
+    latencies = sorted(saved_at[key] - sent_at[key] for key in saved_at)
+
+    print(f"Sent        : {len(capture)} datagrams in {send_seconds:.2f}s ({len(capture) / max(send_seconds, 1e-6):.0f}/s), "
+          f"{sum(1 for key in keys if key) - len(wanted)} QSO datagram(s) sent more than once")
+    print(f"QSOs        : {len(wanted)} in capture, {len(already_logged)} already in logbook")
+    print(f"Accepted    : {accepted}")
+    print(f"Dropped     : {len(pending)}")
+    print(f"Duplicated  : {duplicated}")
+    if latencies:
+        print(f"Latency     : min {latencies[0] * 1000:.0f} ms, median {percentile(latencies, 0.5) * 1000:.0f} ms, "
+              f"p95 {percentile(latencies, 0.95) * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms "
+              f"(datagram sent to QSO in saved .mbk, +-{POLL_SECONDS * 1000:.0f} ms)")
+    if args.limit and pending:
+        print("Not saved   : " + ", ".join(sorted(pending)[:args.limit]))
+    return 0 if not pending and not duplicated else 2
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="udp_replay.py", description="Record and replay UDP datagrams against a local MiniBook.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("record", help="record datagrams with their receive time")
+    p.add_argument("capture", help="capture file to write")
+    p.add_argument("--listen", type=parse_address, default=("127.0.0.1", 2237), help="address to record on (default: 127.0.0.1:2237)")
+    p.add_argument("--forward", type=parse_address, help="also pass every datagram on to this address, e.g. MiniBook")
+    p.add_argument("--duration", type=float, help="stop after this many seconds (default: Ctrl+C)")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser("generate", help="write a synthetic capture of Logged ADIF messages")
+    p.add_argument("capture", help="capture file to write")
+    p.add_argument("--qsos", type=int, default=1000, help="number of QSOs (default: 1000)")
+    p.add_argument("--rate", type=float, default=10, help="QSOs per second at 1x (default: 10)")
+    p.add_argument("--resend", type=int, default=0, help="send every Nth QSO twice, as WSJT-X may (default: never)")
+    p.add_argument("--my-call", default="PD5DJ", help="station callsign (default: PD5DJ)")
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("replay", help="send a capture to MiniBook and check what ends up in the logbook")
+    p.add_argument("capture", help="capture file to replay")
+    p.add_argument("--logbook", required=True, help=".mbk logbook MiniBook has loaded")
+    p.add_argument("--to", type=parse_address, default=("127.0.0.1", 2333), help="MiniBook UDP endpoint (default: 127.0.0.1:2333)")
+    p.add_argument("--speed", type=parse_speed, default=1, help="1, 10, ... times the recorded rate, or max (default: 1)")
+    p.add_argument("--settle", type=float, default=SETTLE_SECONDS, help=f"seconds to wait for QSOs still to be saved (default: {SETTLE_SECONDS})")
+    p.add_argument("--limit", type=int, default=20, help="number of QSOs not saved that are listed (default: 20)")
+    p.set_defaults(func=cmd_replay)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
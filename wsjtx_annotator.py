@@ -0,0 +1,155 @@
+#**********************************************************************************************************************************
+# File          :   wsjtx_annotator.py
+# Project       :   MiniBook WSJT-X worked before
+# Description   :   Classifies the CQ calls in the WSJT-X decode stream against the logbook and highlights them in WSJT-X
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import threading
+from collections import Counter
+
+from wsjtx_protocol import encode_highlight_callsign
+
+# Categories, from most to least wanted
+NEW = "new"
+NEW_BAND = "new band"
+NEW_MODE = "new mode"
+DUPE = "dupe"
+
+# (background, foreground) per category, None clears the highlight
+HIGHLIGHT_COLORS = {
+    NEW:        ((255, 0, 255), (255, 255, 255)),
+    NEW_BAND:   ((255, 165, 0), (0, 0, 0)),
+    NEW_MODE:   ((0, 191, 255), (0, 0, 0)),
+    DUPE:       ((211, 211, 211), (128, 128, 128)),
+}
+
+# Decode message mode characters, used when no Status with the mode name was received yet
+DECODE_MODE_CHARS = {"~": "FT8", "+": "FT4", "#": "JT65", "@": "JT9", "&": "MSK144", "$": "JT4", "`": "FST4", ":": "Q65"}
+
+# Highlights remembered per client, the list is cleared when it grows past this
+MAX_HIGHLIGHTS = 5000
+
+
+def cq_callsign(message):
+    """
+    Callsign of a CQ / QRZ decode ("CQ DX PA1ABC JO22", "CQ POTA <PA1ABC>"), None for other messages.
+    """
+    tokens = message.split()
+    if len(tokens) < 2 or tokens[0] not in ("CQ", "QRZ"):
+        return None
+    call = tokens[1]
+    # CQ DX, CQ POTA, CQ NA, CQ 290 ...: the call follows the modifier
+    if len(tokens) > 2 and (call.isdigit() or (call.isalpha() and len(call) <= 4)):
+        call = tokens[2]
+    call = call.strip("<>")
+    if not call or call == "..." or not any(c.isdigit() for c in call):
+        return None
+    return call.upper()
+
+
+class WorkedIndex:
+    """
+    Sets of worked calls, call+band, call+mode and call+band+mode: every lookup is a set membership.
+    """
+    def __init__(self, logbook=()):
+        self.calls = set()
+        self.call_band = set()
+        self.call_band_mode = set()
+        for qso in logbook:
+            self.add(qso)
+
+    def add(self, qso):
+        call = qso.get("Callsign", "").upper()
+        band = qso.get("Band", "").lower()
+        mode = qso.get("Mode", "").upper()
+        self.calls.add(call)
+        self.call_band.add((call, band))
+        self.call_band_mode.add((call, band, mode))
+        submode = qso.get("Submode", "").upper()
+        if submode:
+            self.call_band_mode.add((call, band, submode))
+
+    def classify(self, call, band, mode):
+        if call not in self.calls:
+            return NEW
+        if (call, band) not in self.call_band:
+            return NEW_BAND
+        if (call, band, mode) not in self.call_band_mode:
+            return NEW_MODE
+        return DUPE
+
+
+class DecodeAnnotator:
+    """
+    Decode handler for WsjtxDispatcher: classifies every CQ call and sends a Highlight Callsign
+    message back to the program that decoded it. Runs in the listener thread, never touches Tk.
+
+    band_for_freq(mhz) maps the dial frequency of the last Status to a band name.
+    send(data, addr) sends a datagram back, e.g. the sendto of the listener socket.
+    A highlight is only sent when the category of a call changes, so a call CQing every
+    cycle costs one dictionary lookup.
+    """
+    def __init__(self, dispatcher, band_for_freq, send, enabled=True):
+        self.dispatcher = dispatcher
+        self.band_for_freq = band_for_freq
+        self.send = send
+        self.enabled = enabled
+        self.index = WorkedIndex()
+        self.lock = threading.Lock()
+        self.highlighted = {}   # client id -> {call: category}
+        self.counts = Counter()
+
+    def rebuild(self, logbook):
+        """
+        New index for a (re)loaded logbook, highlights are sent again where the category changed.
+        """
+        index = WorkedIndex(logbook)
+        with self.lock:
+            self.index = index
+
+    def add(self, qso):
+        with self.lock:
+            self.index.add(qso)
+
+    def on_clear(self, message, addr):
+        with self.lock:
+            self.highlighted.pop(message.id, None)
+
+    def on_decode(self, message, addr):
+        if not self.enabled:
+            return
+        fields = message.fields
+        call = cq_callsign(fields.get("message", ""))
+        if not call:
+            return
+
+        status = self.dispatcher.status.get(message.id, {})
+        dial = status.get("dial_frequency")
+        if not dial:
+            return  # No band known yet
+        band = self.band_for_freq(dial / 1e6)
+        mode = (status.get("mode") or DECODE_MODE_CHARS.get(fields.get("mode", ""), "")).upper()
+
+        with self.lock:
+            category = self.index.classify(call, band, mode)
+            seen = self.highlighted.setdefault(message.id, {})
+            if seen.get(call) == category:
+                return
+            if len(seen) >= MAX_HIGHLIGHTS:
+                seen.clear()
+            seen[call] = category
+            self.counts[category] += 1
+
+        client = self.dispatcher.clients.get(message.id, {})
+        background, foreground = HIGHLIGHT_COLORS[category]
+        data = encode_highlight_callsign(message.id, call, background, foreground, True, client.get("schema", 2))
+        try:
+            self.send(data, addr)
+        except OSError as e:
+            print(f"Highlight Callsign to {addr} failed: {e}")
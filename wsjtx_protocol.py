@@ -0,0 +1,415 @@
+#**********************************************************************************************************************************
+# File          :   wsjtx_protocol.py
+# Project       :   MiniBook WSJT-X protocol
+# Description   :   Decoder / encoder for the WSJT-X (and JTDX) binary UDP protocol, QDataStream framing, and a
+#                   dispatcher that hands every message type to its own handlers
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import struct
+import threading
+import time
+from collections import deque
+
+# Every binary datagram starts with this magic number, followed by the schema number
+WSJTX_MAGIC = 0xADBCCBDA
+WSJTX_SCHEMA = 2
+
+# Message types (NetworkMessage.hpp)
+HEARTBEAT = 0
+STATUS = 1
+DECODE = 2
+CLEAR = 3
+REPLY = 4
+QSO_LOGGED = 5
+CLOSE = 6
+REPLAY = 7
+HALT_TX = 8
+FREE_TEXT = 9
+WSPR_DECODE = 10
+LOCATION = 11
+LOGGED_ADIF = 12
+HIGHLIGHT_CALLSIGN = 13
+SWITCH_CONFIGURATION = 14
+CONFIGURE = 15
+
+MESSAGE_NAMES = {
+    HEARTBEAT: "Heartbeat", STATUS: "Status", DECODE: "Decode", CLEAR: "Clear", REPLY: "Reply",
+    QSO_LOGGED: "QSO Logged", CLOSE: "Close", REPLAY: "Replay", HALT_TX: "Halt Tx", FREE_TEXT: "Free Text",
+    WSPR_DECODE: "WSPR Decode", LOCATION: "Location", LOGGED_ADIF: "Logged ADIF",
+    HIGHLIGHT_CALLSIGN: "Highlight Callsign", SWITCH_CONFIGURATION: "Switch Configuration", CONFIGURE: "Configure",
+}
+
+# Decoded messages kept by the dispatcher, one busy FT8 cycle is a few hundred
+RECENT_DECODES = 2000
+
+# Julian day number of 1970-01-01, QDateTime counts days from the Julian epoch
+JULIAN_DAY_UNIX_EPOCH = 2440588
+
+_U8 = struct.Struct(">B")
+_U32 = struct.Struct(">I")
+_I32 = struct.Struct(">i")
+_U64 = struct.Struct(">Q")
+_I64 = struct.Struct(">q")
+_F64 = struct.Struct(">d")
+_HEADER = struct.Struct(">III")
+
+
+class WsjtxProtocolError(ValueError):
+    pass
+
+
+def is_wsjtx_datagram(data):
+    return len(data) >= 12 and _U32.unpack_from(data, 0)[0] == WSJTX_MAGIC
+
+
+class QDataStreamReader:
+    """
+    Reads QDataStream (Qt 5, big endian) values from a memoryview; numbers are unpacked in place,
+    only strings are copied out.
+    """
+    __slots__ = ("view", "pos")
+
+    def __init__(self, data, pos=0):
+        self.view = memoryview(data)
+        self.pos = pos
+
+    def _unpack(self, fmt):
+        try:
+            value = fmt.unpack_from(self.view, self.pos)[0]
+        except struct.error:
+            raise WsjtxProtocolError("message truncated") from None
+        self.pos += fmt.size
+        return value
+
+    def u8(self):
+        return self._unpack(_U8)
+
+    def bool(self):
+        return self._unpack(_U8) != 0
+
+    def u32(self):
+        return self._unpack(_U32)
+
+    def i32(self):
+        return self._unpack(_I32)
+
+    def u64(self):
+        return self._unpack(_U64)
+
+    def i64(self):
+        return self._unpack(_I64)
+
+    def double(self):
+        return self._unpack(_F64)
+
+    def utf8(self):
+        # QByteArray: quint32 length, 0xffffffff is a null string
+        length = self._unpack(_U32)
+        if length == 0xFFFFFFFF:
+            return ""
+        end = self.pos + length
+        if end > len(self.view):
+            raise WsjtxProtocolError("message truncated")
+        value = str(self.view[self.pos:end], "utf-8", "replace")
+        self.pos = end
+        return value
+
+    def qtime(self):
+        # Milliseconds since midnight, 0xffffffff is an invalid time
+        ms = self._unpack(_U32)
+        return None if ms == 0xFFFFFFFF else ms
+
+    def qdatetime(self):
+        # QDate (julian day), QTime, timespec (+ offset seconds for Qt::OffsetFromUTC); returned as unix seconds
+        julian_day = self._unpack(_I64)
+        ms = self.qtime()
+        timespec = self._unpack(_U8)
+        offset = self._unpack(_I32) if timespec == 2 else 0
+        if julian_day == 0 or ms is None:
+            return None
+        return (julian_day - JULIAN_DAY_UNIX_EPOCH) * 86400 + ms / 1000.0 - offset
+
+    def at_end(self):
+        return self.pos >= len(self.view)
+
+
+class QDataStreamWriter:
+    def __init__(self):
+        self.parts = []
+
+    def u8(self, value):
+        self.parts.append(_U8.pack(value))
+
+    def bool(self, value):
+        self.parts.append(_U8.pack(1 if value else 0))
+
+    def u32(self, value):
+        self.parts.append(_U32.pack(value))
+
+    def i32(self, value):
+        self.parts.append(_I32.pack(value))
+
+    def u64(self, value):
+        self.parts.append(_U64.pack(value))
+
+    def utf8(self, value):
+        if value is None:
+            self.parts.append(_U32.pack(0xFFFFFFFF))
+            return
+        raw = value.encode("utf-8")
+        self.parts.append(_U32.pack(len(raw)) + raw)
+
+    def qcolor(self, rgb):
+        # QColor: spec (1 = Rgb, 0 = invalid), alpha, r, g, b (16 bit each), padding
+        if rgb is None:
+            self.parts.append(struct.pack(">bHHHHH", 0, 0, 0, 0, 0, 0))
+            return
+        r, g, b = rgb
+        self.parts.append(struct.pack(">bHHHHH", 1, 0xFFFF, r * 0x101, g * 0x101, b * 0x101, 0))
+
+    def data(self):
+        return b"".join(self.parts)
+
+
+class WsjtxMessage:
+    """
+    One decoded datagram: type, client id (e.g. "WSJT-X"), schema and the message fields.
+    """
+    __slots__ = ("type", "id", "schema", "fields")
+
+    def __init__(self, msg_type, client_id, schema, fields):
+        self.type = msg_type
+        self.id = client_id
+        self.schema = schema
+        self.fields = fields
+
+    @property
+    def name(self):
+        return MESSAGE_NAMES.get(self.type, f"Type {self.type}")
+
+    def __repr__(self):
+        return f"WsjtxMessage({self.name}, {self.id!r}, {self.fields!r})"
+
+
+# ------------------------------------------------------------------ message bodies
+
+def _read_heartbeat(r):
+    fields = {"max_schema": r.u32()}
+    if not r.at_end():
+        fields["version"] = r.utf8()
+        fields["revision"] = r.utf8()
+    return fields
+
+
+def _read_status(r):
+    fields = {
+        "dial_frequency": r.u64(),
+        "mode": r.utf8(),
+        "dx_call": r.utf8(),
+        "report": r.utf8(),
+        "tx_mode": r.utf8(),
+        "tx_enabled": r.bool(),
+        "transmitting": r.bool(),
+        "decoding": r.bool(),
+    }
+    # Later fields were added over the versions, older programs stop early
+    optional = (
+        ("rx_df", r.u32), ("tx_df", r.u32), ("de_call", r.utf8), ("de_grid", r.utf8), ("dx_grid", r.utf8),
+        ("tx_watchdog", r.bool), ("submode", r.utf8), ("fast_mode", r.bool), ("special_operation_mode", r.u8),
+        ("frequency_tolerance", r.u32), ("tr_period", r.u32), ("configuration_name", r.utf8), ("tx_message", r.utf8),
+    )
+    for name, read in optional:
+        if r.at_end():
+            break
+        fields[name] = read()
+    return fields
+
+
+def _read_decode(r):
+    fields = {
+        "new": r.bool(),
+        "time": r.qtime(),
+        "snr": r.i32(),
+        "delta_time": r.double(),
+        "delta_frequency": r.u32(),
+        "mode": r.utf8(),
+        "message": r.utf8(),
+        "low_confidence": r.bool(),
+    }
+    if not r.at_end():
+        fields["off_air"] = r.bool()
+    return fields
+
+
+def _read_qso_logged(r):
+    fields = {
+        "time_off": r.qdatetime(),
+        "dx_call": r.utf8(),
+        "dx_grid": r.utf8(),
+        "tx_frequency": r.u64(),
+        "mode": r.utf8(),
+        "report_sent": r.utf8(),
+        "report_received": r.utf8(),
+        "tx_power": r.utf8(),
+        "comments": r.utf8(),
+        "name": r.utf8(),
+        "time_on": r.qdatetime(),
+    }
+    optional = (
+        ("operator_call", r.utf8), ("my_call", r.utf8), ("my_grid", r.utf8),
+        ("exchange_sent", r.utf8), ("exchange_received", r.utf8), ("adif_propagation_mode", r.utf8),
+    )
+    for name, read in optional:
+        if r.at_end():
+            break
+        fields[name] = read()
+    return fields
+
+
+def _read_wspr_decode(r):
+    fields = {
+        "new": r.bool(),
+        "time": r.qtime(),
+        "snr": r.i32(),
+        "delta_time": r.double(),
+        "frequency": r.u64(),
+        "drift": r.i32(),
+        "callsign": r.utf8(),
+        "grid": r.utf8(),
+        "power": r.i32(),
+    }
+    if not r.at_end():
+        fields["off_air"] = r.bool()
+    return fields
+
+
+def _read_clear(r):
+    return {"window": r.u8()} if not r.at_end() else {}
+
+
+MESSAGE_READERS = {
+    HEARTBEAT: _read_heartbeat,
+    STATUS: _read_status,
+    DECODE: _read_decode,
+    CLEAR: _read_clear,
+    QSO_LOGGED: _read_qso_logged,
+    CLOSE: lambda r: {},
+    WSPR_DECODE: _read_wspr_decode,
+    LOGGED_ADIF: lambda r: {"adif": r.utf8()},
+}
+
+
+def decode_message(data):
+    """
+    Decode one binary datagram into a WsjtxMessage. Unknown message types keep empty fields.
+    Raises WsjtxProtocolError for anything that is not a valid WSJT-X datagram.
+    """
+    if len(data) < 12:
+        raise WsjtxProtocolError("datagram too short")
+    magic, schema, msg_type = _HEADER.unpack_from(data, 0)
+    if magic != WSJTX_MAGIC:
+        raise WsjtxProtocolError("no WSJT-X magic number")
+
+    r = QDataStreamReader(data, 12)
+    client_id = r.utf8()
+    reader = MESSAGE_READERS.get(msg_type)
+    fields = reader(r) if reader else {}
+    return WsjtxMessage(msg_type, client_id, schema, fields)
+
+
+def encode_message(msg_type, client_id, schema=WSJTX_SCHEMA):
+    """
+    Writer with the header of a message to WSJT-X already in it, add the body and call data().
+    """
+    w = QDataStreamWriter()
+    w.u32(WSJTX_MAGIC)
+    w.u32(schema)
+    w.u32(msg_type)
+    w.utf8(client_id)
+    return w
+
+
+def encode_heartbeat(client_id, version="", revision=""):
+    w = encode_message(HEARTBEAT, client_id)
+    w.u32(WSJTX_SCHEMA)
+    w.utf8(version)
+    w.utf8(revision)
+    return w.data()
+
+
+def encode_highlight_callsign(client_id, callsign, background, foreground, highlight_last=True, schema=WSJTX_SCHEMA):
+    """
+    Highlight Callsign message: colors are (r, g, b) tuples, None for both clears the highlight.
+    """
+    w = encode_message(HIGHLIGHT_CALLSIGN, client_id, schema)
+    w.utf8(callsign)
+    w.qcolor(background)
+    w.qcolor(foreground)
+    w.bool(highlight_last)
+    return w.data()
+
+
+# ------------------------------------------------------------------ dispatch
+
+class WsjtxDispatcher:
+    """
+    Routes received datagrams by message type. Binary messages go to the handlers registered
+    with on(type, handler), handler(message, addr); plain text datagrams (ADIF from older
+    programs) go to the on_text handler. Last Status and Heartbeat per client and the recent
+    Decodes are kept, so other parts of MiniBook can use them.
+    """
+    def __init__(self):
+        self.handlers = {}
+        self.on_text = None
+        self.lock = threading.Lock()
+        self.clients = {}   # client id -> {"addr", "schema", "last_seen", "version"}
+        self.status = {}    # client id -> fields of the last Status
+        self.decodes = deque(maxlen=RECENT_DECODES)
+        self.errors = 0
+
+    def on(self, msg_type, handler):
+        self.handlers.setdefault(msg_type, []).append(handler)
+
+    def dispatch(self, data, addr):
+        """
+        Handle one datagram, returns the decoded WsjtxMessage or None for text / invalid datagrams.
+        """
+        if not is_wsjtx_datagram(data):
+            if self.on_text:
+                self.on_text(data, addr)
+            return None
+
+        try:
+            message = decode_message(data)
+        except WsjtxProtocolError as e:
+            self.errors += 1
+            print(f"Invalid WSJT-X datagram from {addr}: {e}")
+            return None
+
+        with self.lock:
+            client = self.clients.setdefault(message.id, {"schema": message.schema, "version": ""})
+            client["addr"] = addr
+            client["last_seen"] = time.time()
+            if message.type == HEARTBEAT:
+                client["schema"] = min(message.fields.get("max_schema", WSJTX_SCHEMA), message.schema)
+                client["version"] = message.fields.get("version", "")
+            elif message.type == STATUS:
+                self.status[message.id] = message.fields
+            elif message.type == DECODE:
+                self.decodes.append((message.id, message.fields))
+            elif message.type == CLOSE:
+                self.clients.pop(message.id, None)
+                self.status.pop(message.id, None)
+
+        for handler in self.handlers.get(message.type, ()):
+            try:
+                handler(message, addr)
+            except Exception as e:
+                print(f"Error handling WSJT-X {message.name}: {e}")
+        return message
@@ -0,0 +1,189 @@
+#**********************************************************************************************************************************
+# File          :   wsjtx_recovery.py
+# Project       :   MiniBook WSJT-X recovery
+# Description   :   Rebuilds completed QSOs from WSJT-X ALL.TXT and finds the ones missing in the logbook
+# Date          :   19-10-2026
+# Authors       :   Bjorn Pasteuning - PD5DJ
+# Website       :   https://wwww.pd5dj.nl
+#
+# Version history
+#   19-10-2026  :   1.0.0   - Initial basics running
+#**********************************************************************************************************************************
+
+import re
+from datetime import datetime
+
+from adif_parser import adif_to_qso
+from logbook_index import LogbookIndex, qso_key
+
+# Bytes read from ALL.TXT per step
+ALL_TXT_CHUNK_SIZE = 16 * 1024 * 1024
+
+# An exchange with no message for this long is abandoned, a new one starts from scratch
+QSO_TIMEOUT_SECONDS = 600
+
+# A recovered QSO within this many seconds of a logged QSO (same call, date, band, mode) is already logged
+RECOVERY_MATCH_SECONDS = 900
+
+# 240101_120015    14.074 Rx FT8    -12  0.2 1234 CQ PA1ABC JO22
+ALL_TXT_LINE_RE = re.compile(
+    r"^(\d{6}_\d{6})\s+(\d+(?:\.\d+)?)\s+(Rx|Tx)\s+(\S+)\s+(-?\d+)\s+(-?\d+(?:\.\d+)?)\s+(\d+)\s+(.*?)\s*$"
+)
+REPORT_RE = re.compile(r"^(R)?([+-]\d{2})$")
+GRID_RE = re.compile(r"^[A-R]{2}\d{2}$")
+
+
+def iter_lines_with(path, needle, chunk_size=ALL_TXT_CHUNK_SIZE):
+    """
+    Yield (line, bytes_read) for the lines of a file that contain needle (bytes).
+    The file is read in large chunks and searched with bytes.find(), lines without
+    needle - nearly all of ALL.TXT - are never split or decoded.
+    """
+    tail = b""
+    bytes_read = 0
+    with open(path, "rb") as f:
+        while True:
+            raw = f.read(chunk_size)
+            bytes_read += len(raw)
+            data = tail + raw
+            if raw:
+                cut = data.rfind(b"\n") + 1
+                data, tail = data[:cut], data[cut:]
+
+            pos = data.find(needle)
+            while pos >= 0:
+                start = data.rfind(b"\n", 0, pos) + 1
+                end = data.find(b"\n", pos)
+                if end < 0:
+                    end = len(data)
+                yield data[start:end], bytes_read
+                pos = data.find(needle, end)
+
+            if not raw:
+                return
+
+
+class QsoExchange:
+    """
+    State of the exchange with one station:
+    calling -> report (one report known) -> reports (both known) -> done (RRR / RR73 / 73 after both reports)
+    """
+    def __init__(self, call, timestamp, dial_freq, audio_freq, mode):
+        self.call = call
+        self.start = timestamp
+        self.last = timestamp
+        self.dial_freq = dial_freq
+        self.audio_freq = audio_freq
+        self.mode = mode
+        self.grid = ""
+        self.sent = ""
+        self.rcvd = ""
+        self.state = "calling"
+
+    def feed(self, transmitted, payload, timestamp):
+        """
+        Process one message between us and this station, returns True once the QSO is complete.
+        """
+        self.last = timestamp
+        report = REPORT_RE.match(payload)
+
+        if report:
+            if transmitted:
+                self.sent = report.group(2)
+            else:
+                self.rcvd = report.group(2)
+        elif GRID_RE.match(payload) and not transmitted and payload != "RR73":
+            self.grid = payload
+        elif payload in ("RRR", "RR73", "73"):
+            if self.sent and self.rcvd:
+                self.state = "done"
+                return True
+
+        if self.state != "done":
+            self.state = "reports" if self.sent and self.rcvd else "report" if self.sent or self.rcvd else "calling"
+        return False
+
+    def to_entry(self, my_call, band_for_freq):
+        freq = self.dial_freq + self.audio_freq / 1e6
+        record = {
+            "call": self.call,
+            "qso_date": self.start.strftime("%Y%m%d"),
+            "time_on": self.last.strftime("%H%M%S"),  # WSJT-X logs the time the QSO ended
+            "band": band_for_freq(freq),
+            "mode": self.mode,
+            "freq": f"{freq:.6f}",
+            "rst_sent": self.sent,
+            "rst_rcvd": self.rcvd,
+            "gridsquare": self.grid,
+            "station_callsign": my_call,
+        }
+        return adif_to_qso(record)
+
+
+def recover_qsos(path, my_call, band_for_freq, progress=None):
+    """
+    Stream ALL.TXT and rebuild every completed QSO of my_call, with one QsoExchange per call pair.
+    band_for_freq(freq_mhz) returns the band name for a frequency.
+    progress(bytes_read) is called per chunk and may raise to abort.
+    Returns a list of MiniBook entries in the order the QSOs completed.
+    """
+    my_call = my_call.strip().upper()
+    exchanges = {}
+    recovered = []
+    last_progress = 0
+
+    for raw_line, bytes_read in iter_lines_with(path, my_call.encode("ascii")):
+        if progress and bytes_read != last_progress:
+            progress(bytes_read)
+            last_progress = bytes_read
+
+        match = ALL_TXT_LINE_RE.match(raw_line.decode("utf-8", "replace"))
+        if not match:
+            continue
+        stamp, dial, direction, mode, _, _, audio, message = match.groups()
+
+        tokens = [t.strip("<>") for t in message.split()]
+        if len(tokens) < 2 or tokens[0] == "CQ":
+            continue
+
+        transmitted = direction == "Tx"
+        if transmitted:
+            if tokens[1] != my_call:
+                continue
+            other = tokens[0]
+        else:
+            if tokens[0] != my_call:
+                continue
+            other = tokens[1]
+        payload = tokens[2] if len(tokens) > 2 else ""
+
+        try:
+            timestamp = datetime.strptime(stamp, "%y%m%d_%H%M%S")
+        except ValueError:
+            continue
+
+        exchange = exchanges.get(other)
+        if exchange is None or (timestamp - exchange.last).total_seconds() > QSO_TIMEOUT_SECONDS:
+            exchange = exchanges[other] = QsoExchange(other, timestamp, float(dial), int(audio), mode.upper())
+
+        if exchange.feed(transmitted, payload, timestamp):
+            entry = exchange.to_entry(my_call, band_for_freq)
+            if entry:
+                recovered.append(entry)
+            del exchanges[other]
+
+    return recovered
+
+
+def find_missing(recovered, logbook, window=RECOVERY_MATCH_SECONDS):
+    """
+    The recovered QSOs that are not in the logbook, compared through a LogbookIndex.
+    """
+    index = LogbookIndex(logbook)
+    missing = []
+    for entry in recovered:
+        if qso_key(entry) in index or index.find_near(entry, window) is not None:
+            continue
+        index.add(entry)
+        missing.append(entry)
+    return missing